@@ -1,3 +1,4 @@
+import asyncio
 import os
 import tempfile
 
@@ -17,6 +18,7 @@ from app.models.schemas import (
     PaginatedResponse,
     YouTubeUploadRequest,
 )
+from app.services.call_config import invalidate_call
 from app.services.upload_pipeline import process_uploaded_call, process_youtube_call
 
 router = APIRouter()
@@ -145,6 +147,7 @@ async def update_call(
     result = (
         supabase.table("calls").update(update_data).eq("id", call_id).execute()
     )
+    invalidate_call(call_id)
     if not result.data:
         raise HTTPException(status_code=500, detail="Failed to update call")
     return result.data[0]
@@ -245,28 +248,31 @@ async def trigger_analysis(
     from app.services.upload_pipeline import _get_playbook_context, _store_results, _update_call, _set_step
     from app.services.llm.call_analyzer import analyze_call as run_analysis
 
-    def _run_analysis():
+    async def _run_analysis():
+        # Supabase calls are blocking; keep them off the event loop
         try:
-            _update_call(call_id, status="processing")
-            _set_step(call_id, "analyzing")
+            await asyncio.to_thread(_update_call, call_id, status="processing")
+            await asyncio.to_thread(_set_step, call_id, "analyzing")
 
-            guidelines, scoring, analysis_docs = _get_playbook_context(call_id)
+            guidelines, scoring, analysis_docs = await asyncio.to_thread(_get_playbook_context, call_id)
             enhanced_guidelines = guidelines or ""
             if analysis_docs:
                 enhanced_guidelines += f"\n\n--- Analysis Documents ---\n{analysis_docs}"
 
-            analysis = run_analysis(
+            analysis = await run_analysis(
                 transcript=transcript_text,
                 scoring_criteria=scoring,
                 playbook_guidelines=enhanced_guidelines if enhanced_guidelines else None,
             )
-            _set_step(call_id, "storing")
-            _store_results(call_id, user["id"], analysis)
-            _update_call(call_id, status="completed", processing_step="done")
+            await asyncio.to_thread(_set_step, call_id, "storing")
+            await asyncio.to_thread(_store_results, call_id, user["id"], analysis)
+            await asyncio.to_thread(_update_call, call_id, status="completed", processing_step="done")
         except Exception:
             import logging
             logging.getLogger(__name__).exception("Analysis failed for call %s", call_id)
-            _update_call(call_id, status="failed", processing_step="failed:analysis_error")
+            await asyncio.to_thread(
+                _update_call, call_id, status="failed", processing_step="failed:analysis_error",
+            )
 
     background_tasks.add_task(_run_analysis)
 
@@ -8,6 +8,7 @@ from app.models.schemas import (
     PlaybookVersionResponse,
     PlaybookVersionCreate,
 )
+from app.services.call_config import invalidate_version
 
 router = APIRouter()
 
@@ -206,6 +207,7 @@ async def publish_version(
         .eq("playbook_id", playbook_id)
         .execute()
     )
+    invalidate_version(version_id)
     if not result.data:
         raise HTTPException(status_code=404, detail="Version not found")
     return {"status": "published"}
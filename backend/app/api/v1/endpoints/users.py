@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
-from app.middleware.auth import get_current_user
+from app.middleware.auth import get_current_user, invalidate_profile
 from app.models.database import get_supabase_client
 from app.models.schemas import UserProfileResponse, UserProfileUpdate
 
@@ -29,6 +29,7 @@ async def update_current_profile(
         .eq("id", user["id"])
         .execute()
     )
+    invalidate_profile(user["id"])
 
     if not result.data:
         raise HTTPException(status_code=500, detail="Failed to update profile")
@@ -7,12 +7,20 @@ class Settings(BaseSettings):
     supabase_url: str
     supabase_service_role_key: str
     supabase_anon_key: str
-    supabase_jwt_secret: str = ""
+    supabase_jwt_secret: str = ""  # verifies HS256 access tokens locally
+    auth_jwks_cache_seconds: int = 600  # JWKS key cache for RS256/ES256 tokens
+    auth_profile_cache_ttl_seconds: float = 60.0  # cached user_profiles rows
+    auth_profile_cache_size: int = 4096
+    call_config_cache_size: int = 1024  # cached calls / playbook versions for WS setup
+    call_config_call_ttl_seconds: float = 60.0  # call rows (also invalidated on PUT /calls)
+    call_config_draft_ttl_seconds: float = 30.0  # unpublished versions; published never expire
 
     # OpenRouter
     openrouter_api_key: str
     llm_realtime_model: str = "google/gemini-2.5-flash-preview"
     llm_analysis_model: str = "anthropic/claude-sonnet-4-20250514"
+    llm_timeout_seconds: float = 300.0
+    llm_realtime_timeout_seconds: float = 30.0  # per request during live calls
 
     # Groq (for cloud transcription — optional)
     groq_api_key: str = ""
@@ -23,6 +31,46 @@ class Settings(BaseSettings):
 
     # Transcription backend override (gemini, groq, modal, local)
     transcription_backend: str = ""
+    transcription_breaker_failures: int = 3  # consecutive failures that open a provider's breaker
+    transcription_breaker_cooldown_seconds: float = 30.0  # before a half-open probe
+    transcription_slow_p95_seconds: float = 20.0  # providers slower than this are demoted
+    transcription_min_success_rate: float = 0.5  # providers below this are demoted
+    transcription_health_max_age_seconds: float = 300.0  # older outcomes stop counting, so demoted providers get retried
+    transcription_hedging: bool = False  # duplicate slow live requests to a second provider
+    transcription_hedge_percentile: float = 90.0  # primary latency percentile used as hedge deadline
+    transcription_hedge_default_delay_seconds: float = 8.0  # deadline until enough latency history
+    transcription_hedge_min_delay_seconds: float = 1.5
+    transcription_hedge_budget: float = 0.1  # max share of a call's requests that may be hedged
+    transcription_upload_codec: str = "auto"  # "auto" (provider's choice encodable in-process), "flac", "ogg" or "wav"
+    transcription_cache_mb: int = 512  # disk cache of upload transcripts (0 = off)
+    transcription_cache_dir: str = ""  # defaults to <tmp>/sbf_transcripts
+    local_whisper_workers: int = 1  # faster-whisper worker processes (0 = run in a thread)
+    local_whisper_queue: int = 4  # jobs waiting for a worker before the router fails over
+    local_whisper_timeout_seconds: float = 120.0  # per job; the caller fails over on timeout
+    local_whisper_kill_grace_seconds: float = 30.0  # a timed-out job still running after this gets its pool rebuilt
+    local_whisper_max_tasks_per_child: int = 200  # recycle workers after this many jobs
+    local_whisper_batch_window_ms: int = 0  # gather windows across calls for batched inference (0 = off)
+    local_whisper_batch_size: int = 8  # max windows per batched pass
+    local_whisper_batch_max_wait_ms: int = 2000  # a window waiting longer fails over instead
+    transcription_warmup: bool = True  # pre-open the provider connection at startup
+    transcription_chunk_concurrency: int = 4  # parallel chunk requests for long uploads
+    transcription_chunk_overlap_seconds: float = 1.0  # audio shared by adjacent chunks
+
+    # Live ingest pipeline
+    ingest_queue_size: int = 2  # pending audio windows per call before coalescing
+    audio_window_mode: str = "fixed"  # "fixed" (10s windows) or "vad" (flush on speech pauses)
+    live_decoder: str = "auto"  # per-call stream decoder: "auto", "pyav", "ffmpeg" or "off"
+    vad_min_window_seconds: float = 3.0  # shortest window flushed on a pause
+    vad_max_window_seconds: float = 15.0  # flush regardless of pauses after this
+    vad_pause_ms: int = 500  # silence that counts as a speech pause
+    checklist_call_concurrency: int = 5  # parallel item checks per call
+    checklist_process_concurrency: int = 20  # parallel item checks per worker process
+    checklist_batch_size: int = 8  # items per batched LLM check (1 disables batching)
+    checklist_recheck_seconds: float = 30.0  # re-check interval of an open item without new evidence
+    checklist_recheck_max_seconds: float = 480.0  # cap of the doubling re-check interval
+    checklist_recheck_min_seconds: float = 15.0  # floor between checks of an item, even with new evidence
+    coach_queue_size: int = 8  # queued updates per coach socket before coalescing
+    coach_max_lag_seconds: float = 10.0  # slower sends disconnect the coach
 
     # App
     cors_origins: str = "http://localhost:3000"
@@ -1,49 +1,163 @@
+"""
+REST authentication dependency.
+
+Supabase access tokens are verified locally: HS256 tokens against
+``supabase_jwt_secret`` and asymmetric ones (RS256/ES256, newer
+projects) against the project's JWKS, which is fetched once and cached.
+Only when neither is possible does the dependency fall back to
+``auth.get_user()`` on the Supabase auth server.
+
+Profiles are kept in a short TTL cache keyed by user id; the ``users``
+endpoints invalidate an entry when they change it. A hot user's
+request therefore needs no network round trip for auth.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.config import get_settings
 from app.models.database import get_supabase_client
+from app.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 
+JWT_AUDIENCE = "authenticated"
+ASYMMETRIC_ALGORITHMS = ["RS256", "ES256"]
+
+_jwks_client: Optional[jwt.PyJWKClient] = None
+_profiles: Optional[TTLCache] = None
+
+
+def _get_profile_cache() -> TTLCache:
+    global _profiles
+    if _profiles is None:
+        settings = get_settings()
+        _profiles = TTLCache(
+            maxsize=settings.auth_profile_cache_size,
+            ttl=settings.auth_profile_cache_ttl_seconds,
+        )
+    return _profiles
+
+
+def invalidate_profile(user_id: str):
+    """Drop a cached profile after it was changed."""
+    _get_profile_cache().pop(str(user_id))
+
+
+def _get_jwks_client() -> jwt.PyJWKClient:
+    global _jwks_client
+    if _jwks_client is None:
+        settings = get_settings()
+        _jwks_client = jwt.PyJWKClient(
+            f"{settings.supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json",
+            cache_keys=True,
+            lifespan=settings.auth_jwks_cache_seconds,
+        )
+    return _jwks_client
+
+
+def _decode_token(token: str) -> Optional[str]:
+    """
+    Verify signature, expiry and audience locally and return the user
+    id, or None if the token cannot be checked locally.
+
+    Raises ``jwt.InvalidTokenError`` for tokens that are definitely bad.
+    Blocking (first JWKS fetch); call via a thread.
+    """
+    settings = get_settings()
+    alg = jwt.get_unverified_header(token).get("alg")
+    options = {"require": ["exp", "sub"]}
+
+    if alg == "HS256":
+        if not settings.supabase_jwt_secret:
+            return None
+        key = settings.supabase_jwt_secret
+    elif alg in ASYMMETRIC_ALGORITHMS:
+        try:
+            key = _get_jwks_client().get_signing_key_from_jwt(token).key
+        except jwt.PyJWKClientError as e:
+            logger.warning("JWKS lookup failed, verifying remotely: %s", e)
+            return None
+    else:
+        raise jwt.InvalidAlgorithmError(f"Unsupported token algorithm: {alg}")
+
+    claims = jwt.decode(
+        token, key, algorithms=[alg], audience=JWT_AUDIENCE, options=options,
+    )
+    return claims["sub"]
+
+
+def _remote_user_id(token: str) -> Optional[str]:
+    """Validate the token against the Supabase auth server."""
+    user_response = get_supabase_client().auth.get_user(token)
+    if not user_response or not user_response.user:
+        return None
+    return str(user_response.user.id)
+
+
+def _fetch_profile(user_id: str) -> Optional[dict]:
+    profile_response = (
+        get_supabase_client().table("user_profiles")
+        .select("*")
+        .eq("id", user_id)
+        .single()
+        .execute()
+    )
+    return profile_response.data
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> dict:
     """Validate Supabase JWT and return user info.
 
-    Uses Supabase's auth.getUser() with the access token, which is the
-    most reliable method since it validates against Supabase directly.
+    Verifies the token locally (shared secret or JWKS) and serves the
+    profile from cache when possible; falls back to Supabase's
+    auth.getUser() when the token cannot be checked locally.
     """
     token = credentials.credentials
 
     try:
-        supabase = get_supabase_client()
-        user_response = supabase.auth.get_user(token)
-        if not user_response or not user_response.user:
+        try:
+            user_id = await asyncio.to_thread(_decode_token, token)
+        except jwt.ExpiredSignatureError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired token",
+                detail="Token expired",
             )
-
-        user = user_response.user
-
-        # Fetch profile from user_profiles table
-        profile_response = (
-            supabase.table("user_profiles")
-            .select("*")
-            .eq("id", str(user.id))
-            .single()
-            .execute()
-        )
-
-        if not profile_response.data:
+        except jwt.InvalidTokenError as e:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User profile not found",
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=f"Invalid token: {e}",
             )
 
-        return profile_response.data
+        if user_id is None:
+            user_id = await asyncio.to_thread(_remote_user_id, token)
+            if not user_id:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid or expired token",
+                )
+
+        profiles = _get_profile_cache()
+        profile = profiles.get(user_id)
+        if profile is None:
+            profile = await asyncio.to_thread(_fetch_profile, user_id)
+            if not profile:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="User profile not found",
+                )
+            profiles.set(user_id, profile)
+
+        # Callers may mutate the dict; keep the cached copy intact
+        return dict(profile)
 
     except HTTPException:
         raise
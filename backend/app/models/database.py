@@ -1,14 +1,90 @@
-from supabase import create_client, Client
+"""
+Process-wide Supabase clients.
+
+``create_client`` builds new PostgREST/auth/storage clients, each with
+its own HTTP session, so calling it per request paid client setup plus
+a fresh TCP+TLS handshake every time. The service-role and anon
+clients are now created once and share one pooled ``httpx.Client``;
+PostgREST sends each client's headers per request, so sharing the pool
+does not mix up keys.
+
+``init_supabase`` / ``close_supabase`` are called from the FastAPI
+lifespan. Callers keep using ``get_supabase_client()``.
+"""
+
+import threading
+from typing import Dict, Optional
+
+import httpx
+from supabase import Client, ClientOptions, create_client
+
 from app.config import get_settings
 
+_http: Optional[httpx.Client] = None
+_clients: Dict[str, Client] = {}
+_lock = threading.Lock()
+
+
+def _get_http() -> httpx.Client:
+    global _http
+    if _http is None or _http.is_closed:
+        _http = httpx.Client(
+            timeout=httpx.Timeout(120.0, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=50,
+                max_keepalive_connections=20,
+                keepalive_expiry=60.0,
+            ),
+        )
+    return _http
+
+
+def _get_client(role: str) -> Client:
+    client = _clients.get(role)
+    if client is not None:
+        return client
+    # Sync endpoints run in the threadpool; build each client only once
+    with _lock:
+        if role not in _clients:
+            settings = get_settings()
+            key = (
+                settings.supabase_service_role_key
+                if role == "service"
+                else settings.supabase_anon_key
+            )
+            _clients[role] = create_client(
+                settings.supabase_url,
+                key,
+                options=ClientOptions(
+                    httpx_client=_get_http(),
+                    # Server-side: never hold or refresh a user session
+                    auto_refresh_token=False,
+                    persist_session=False,
+                ),
+            )
+        return _clients[role]
+
 
 def get_supabase_client() -> Client:
     """Get Supabase client with service_role key (bypasses RLS)."""
-    settings = get_settings()
-    return create_client(settings.supabase_url, settings.supabase_service_role_key)
+    return _get_client("service")
 
 
 def get_supabase_anon_client() -> Client:
     """Get Supabase client with anon key (respects RLS)."""
-    settings = get_settings()
-    return create_client(settings.supabase_url, settings.supabase_anon_key)
+    return _get_client("anon")
+
+
+def init_supabase():
+    """Build the shared clients up front (app startup)."""
+    get_supabase_client()
+
+
+def close_supabase():
+    """Close the shared HTTP pool (app shutdown)."""
+    global _http
+    with _lock:
+        _clients.clear()
+        if _http is not None:
+            _http.close()
+            _http = None
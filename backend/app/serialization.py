@@ -0,0 +1,45 @@
+"""
+JSON encoding for WebSocket frames and REST responses.
+
+Uses ``orjson`` when installed (several times faster than ``json`` and
+returns bytes), otherwise falls back to the standard library. WebSocket
+updates are encoded once per tick with :func:`dumps` and the same frame
+is sent to every subscriber.
+"""
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any) -> str:
+    """Encode ``obj`` as a JSON text frame."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Encode ``obj`` as UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: str | bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """Default REST response class; encodes with :func:`dumps_bytes`."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
@@ -2,6 +2,21 @@
 Audio buffer for real-time transcription.
 Accumulates audio chunks and triggers transcription periodically.
 
+Incoming chunks are decoded to 16 kHz PCM by a persistent per-call
+decoder (see ``decoder.py``) and windows are handed out as WAV. Without
+a decoder the raw WebM bytes are buffered instead, and the stream's
+EBML header is re-attached to every window after the first.
+
+Two windowing modes:
+
+- ``fixed``: flush every ``interval_seconds`` once enough chunks and
+  bytes have arrived (the original behaviour).
+- ``vad``: run an energy VAD over the decoded PCM and flush on a speech pause once the window is at least
+  ``min_window_seconds`` long, or unconditionally at
+  ``max_window_seconds``. Silence before the first speech frame is
+  dropped, so silent stretches are never sent for transcription.
+  Requires a decoder; falls back to ``fixed`` without one.
+
 Ported from utils/audio_buffer.py.
 """
 
@@ -10,28 +25,99 @@ import time
 import tempfile
 import os
 import logging
+import wave
+
+from app.services.audio.decoder import create_decoder
+from app.services.audio.vad import SAMPLE_RATE, SAMPLE_WIDTH, EnergyVAD
 
 logger = logging.getLogger(__name__)
 
+BYTES_PER_SECOND = SAMPLE_RATE * SAMPLE_WIDTH
+PRE_ROLL_SECONDS = 0.3  # silence kept ahead of the first speech frame
+MIN_SPEECH_MS = 400  # speech incl. VAD hangover; less than this counts as silent
+EBML_MAGIC = b"\x1aE\xdf\xa3"
+CLUSTER_ID = b"\x1fC\xb6u"
+
+
+def pcm_to_wav(pcm: bytes) -> bytes:
+    """Wrap 16 kHz mono s16le PCM in a WAV container."""
+    out = io.BytesIO()
+    with wave.open(out, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(SAMPLE_WIDTH)
+        wf.setframerate(SAMPLE_RATE)
+        wf.writeframes(pcm)
+    return out.getvalue()
+
+
+def merge_windows(first: bytes, second: bytes) -> bytes:
+    """Join two consecutive audio windows of the same stream."""
+    if first[:4] == b"RIFF" and second[:4] == b"RIFF":
+        frames = []
+        for data in (first, second):
+            with wave.open(io.BytesIO(data), "rb") as wf:
+                frames.append(wf.readframes(wf.getnframes()))
+        return pcm_to_wav(b"".join(frames))
+    return first + second
+
 
 class AudioBuffer:
     """Manages audio chunks for periodic transcription."""
 
-    def __init__(self, interval_seconds: float = 10.0):
+    def __init__(
+        self,
+        interval_seconds: float = 10.0,
+        mode: str = "fixed",
+        min_window_seconds: float = 3.0,
+        max_window_seconds: float = 15.0,
+        pause_ms: int = 500,
+        decoder: str = "off",
+    ):
         self.interval_seconds = interval_seconds
         self.buffer = io.BytesIO()
         self.last_transcription_time = time.time()
         self.chunk_count = 0
         self.min_chunks = 8
         self.min_buffer_size = 60_000  # 60KB minimum
+        self.raw_bytes = 0
+        self.header = b""  # WebM header, re-attached to raw windows
+
+        self.mode = mode
+        self.min_window_seconds = min_window_seconds
+        self.max_window_seconds = max_window_seconds
+        self.pause_ms = pause_ms
+        self.windows_skipped = 0
+        self.vad = EnergyVAD()
+        self.pcm = bytearray()
+        self.speech_ms = 0
+        self.trailing_silence_ms = 0
+
+        if mode == "vad" and decoder == "off":
+            decoder = "auto"
+        self.decoder = create_decoder(decoder, SAMPLE_RATE) if decoder != "off" else None
+        if mode == "vad" and self.decoder is None:
+            logger.warning("VAD windowing needs a stream decoder, using fixed windows")
+            self.mode = "fixed"
 
     def add_chunk(self, chunk: bytes) -> bool:
         """Add audio chunk. Returns True if ready for transcription."""
-        self.buffer.write(chunk)
+        self._remember_header(chunk)
+        if self.decoder and not self._decode(chunk):
+            logger.warning("Stream decoder stopped, buffering raw audio")
+            self.decoder.close()
+            self.decoder = None
+            self.mode = "fixed"
+            self.pcm = bytearray()
+        if self.mode == "vad":
+            return self._vad_ready()
+
+        if not self.decoder:
+            self.buffer.write(chunk)
         self.chunk_count += 1
+        self.raw_bytes += len(chunk)
 
         elapsed = time.time() - self.last_transcription_time
-        buffer_size = self.buffer.tell()
+        buffer_size = self.raw_bytes
 
         if (
             elapsed >= self.interval_seconds
@@ -46,13 +132,71 @@ class AudioBuffer:
 
         return False
 
+    def _remember_header(self, chunk: bytes):
+        # Everything before the first Cluster of the stream's first chunk
+        if self.header or self.raw_bytes or self.chunk_count or chunk[:4] != EBML_MAGIC:
+            return
+        idx = chunk.find(CLUSTER_ID)
+        self.header = chunk[:idx] if idx > 0 else b""
+
+    def _decode(self, chunk: bytes) -> bool:
+        if not self.decoder.feed(chunk):
+            return False
+        pcm = self.decoder.read()
+        self.pcm += pcm
+        if self.mode == "vad":
+            for speech in self.vad.process(pcm):
+                if speech:
+                    self.speech_ms += self.vad.frame_ms
+                    self.trailing_silence_ms = 0
+                else:
+                    self.trailing_silence_ms += self.vad.frame_ms
+        return True
+
+    def _vad_ready(self) -> bool:
+        self.chunk_count += 1
+
+        if self.speech_ms == 0:
+            # Nothing said yet: keep only a short pre-roll of silence
+            keep = int(PRE_ROLL_SECONDS * BYTES_PER_SECOND) & ~1
+            if len(self.pcm) > keep:
+                del self.pcm[:len(self.pcm) - keep]
+            self.last_transcription_time = time.time() - len(self.pcm) / BYTES_PER_SECOND
+            return False
+
+        window = len(self.pcm) / BYTES_PER_SECOND
+        paused = self.trailing_silence_ms >= self.pause_ms
+        if paused and self.speech_ms < MIN_SPEECH_MS:
+            # A click or cough, not speech
+            self.windows_skipped += 1
+            self.clear()
+            return False
+
+        if window >= self.max_window_seconds or (paused and window >= self.min_window_seconds):
+            logger.info(
+                "Buffer ready: %.1fs window, %.1fs speech, %s",
+                window, self.speech_ms / 1000, "pause" if paused else "max window",
+            )
+            return True
+
+        return False
+
     def get_audio_data(self) -> bytes:
-        return self.buffer.getvalue()
+        if self.decoder:
+            return pcm_to_wav(bytes(self.pcm))
+        data = self.buffer.getvalue()
+        if self.header and data[:4] != EBML_MAGIC:
+            return self.header + data
+        return data
 
     def clear(self):
         self.buffer = io.BytesIO()
         self.last_transcription_time = time.time()
         self.chunk_count = 0
+        self.raw_bytes = 0
+        self.pcm = bytearray()
+        self.speech_ms = 0
+        self.trailing_silence_ms = 0
 
     def save_to_temp_file(self, suffix: str = ".webm") -> str:
         data = self.get_audio_data()
@@ -63,3 +207,8 @@ class AudioBuffer:
 
     def has_data(self) -> bool:
         return self.chunk_count > 0
+
+    def close(self):
+        if self.decoder:
+            self.decoder.close()
+            self.decoder = None
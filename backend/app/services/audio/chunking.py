@@ -0,0 +1,107 @@
+"""
+Split long 16 kHz PCM recordings into overlapping chunks for
+transcription, and stitch the per-chunk transcripts back together.
+
+Cuts land in the quietest frame near the size limit, always on a
+sample boundary, and each chunk after the first starts ``overlap``
+seconds before the previous cut so words at the edge are heard whole
+by at least one chunk. :func:`stitch_segments` removes the words the
+overlap transcribed twice.
+"""
+
+import re
+from typing import List, Tuple
+
+from app.services.audio.vad import SAMPLE_RATE, SAMPLE_WIDTH, frame_rms
+
+BYTES_PER_SECOND = SAMPLE_RATE * SAMPLE_WIDTH
+FRAME_BYTES = BYTES_PER_SECOND * 30 // 1000  # 30 ms
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_LEADING_PUNCT_RE = re.compile(r"^[^\w\s]*\s*", re.UNICODE)
+
+
+def _quietest_cut(pcm: memoryview, lo: int, hi: int) -> int:
+    """Byte offset of the lowest-energy frame start in ``[lo, hi)``."""
+    best, best_energy = hi, float("inf")
+    for pos in range(lo, hi - FRAME_BYTES + 1, FRAME_BYTES):
+        energy = frame_rms(pcm[pos:pos + FRAME_BYTES])
+        if energy < best_energy:
+            best, best_energy = pos, energy
+    return best
+
+
+def split_on_silence(
+    pcm: bytes,
+    max_chunk_bytes: int,
+    overlap_seconds: float = 1.0,
+    search_seconds: float = 10.0,
+) -> List[Tuple[float, memoryview]]:
+    """
+    Split PCM into chunks of at most ``max_chunk_bytes``.
+
+    Returns ``(offset_seconds, pcm_view)`` pairs in order; views share
+    memory with ``pcm``.
+    """
+    view = memoryview(pcm)
+    total = len(view) - len(view) % SAMPLE_WIDTH
+    max_chunk = max_chunk_bytes - max_chunk_bytes % SAMPLE_WIDTH
+    overlap = int(overlap_seconds * SAMPLE_RATE) * SAMPLE_WIDTH
+    search = min(int(search_seconds * SAMPLE_RATE) * SAMPLE_WIDTH, max_chunk // 2)
+
+    chunks: List[Tuple[float, memoryview]] = []
+    start = 0
+    while total - start > max_chunk:
+        limit = start + max_chunk
+        cut = _quietest_cut(view, limit - search, limit)
+        chunks.append((start / BYTES_PER_SECOND, view[start:cut]))
+        start = max(cut - overlap, start + SAMPLE_WIDTH)
+    chunks.append((start / BYTES_PER_SECOND, view[start:total]))
+    return chunks
+
+
+def _words(text: str) -> List[str]:
+    return [w.lower() for w in _WORD_RE.findall(text)]
+
+
+def _drop_leading_words(segments: List[dict], count: int) -> List[dict]:
+    # Same tokenizer as _words, so "anak-anak" is dropped as two words
+    out = []
+    for seg in segments:
+        if count > 0:
+            text = seg["text"]
+            end = 0
+            for match in _WORD_RE.finditer(text):
+                end = match.end()
+                count -= 1
+                if count == 0:
+                    break
+            # Punctuation attached to the last dropped word goes with it
+            text = _LEADING_PUNCT_RE.sub("", text[end:])
+            if not text:
+                continue
+            seg = {**seg, "text": text}
+        out.append(seg)
+    return out
+
+
+def stitch_segments(
+    chunks: List[List[dict]],
+    max_overlap_words: int = 40,
+    min_overlap_words: int = 2,
+) -> List[dict]:
+    """
+    Concatenate per-chunk segments, removing words repeated across the
+    chunk overlap (longest suffix/prefix match of normalized words).
+    """
+    result: List[dict] = []
+    for segments in chunks:
+        if result and segments:
+            tail = _words(" ".join(s["text"] for s in result[-8:]))[-max_overlap_words:]
+            head = _words(" ".join(s["text"] for s in segments[:8]))[:max_overlap_words]
+            for k in range(min(len(tail), len(head)), min_overlap_words - 1, -1):
+                if tail[-k:] == head[:k]:
+                    segments = _drop_leading_words(segments, k)
+                    break
+        result.extend(segments)
+    return result
@@ -0,0 +1,272 @@
+"""
+Incremental decoders for the live MediaRecorder stream.
+
+The browser sends one continuous WebM/Opus stream split into chunks.
+Each call gets one long-lived decoder that is fed those chunks as they
+arrive and emits 16 kHz mono s16le PCM into a bounded ring buffer, so
+analysis ticks never spawn a process or recover a headerless slice.
+
+``feed`` and ``close`` are called from the event loop and never block:
+chunks are queued for the decoder's own threads, which do the pipe
+writes and the shutdown (process wait / kill).
+
+Backends:
+
+- ``pyav``: in-process decoding with PyAV (optional dependency).
+- ``ffmpeg``: one persistent ``ffmpeg`` pipe per call.
+
+``create_decoder("auto")`` prefers PyAV and falls back to ffmpeg.
+"""
+
+import logging
+import subprocess
+import threading
+
+try:
+    import av
+except ImportError:  # optional
+    av = None
+
+logger = logging.getLogger(__name__)
+
+
+class PCMRingBuffer:
+    """
+    Fixed-capacity byte ring for decoded PCM.
+
+    The decoder thread writes, the ingest loop drains. If the reader
+    falls behind by more than ``capacity_seconds`` the oldest audio is
+    overwritten and counted in ``dropped_bytes``.
+    """
+
+    def __init__(self, capacity_seconds: float = 30.0, sample_rate: int = 16_000):
+        self.capacity = int(capacity_seconds * sample_rate) * 2
+        self._buf = bytearray(self.capacity)
+        self._start = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        self.dropped_bytes = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def write(self, data: bytes):
+        with self._lock:
+            if len(data) >= self.capacity:
+                self.dropped_bytes += self._size + len(data) - self.capacity
+                data = data[-self.capacity:]
+                self._start = 0
+                self._size = 0
+            overflow = self._size + len(data) - self.capacity
+            if overflow > 0:
+                self._start = (self._start + overflow) % self.capacity
+                self._size -= overflow
+                self.dropped_bytes += overflow
+
+            end = (self._start + self._size) % self.capacity
+            first = min(len(data), self.capacity - end)
+            self._buf[end:end + first] = data[:first]
+            self._buf[:len(data) - first] = data[first:]
+            self._size += len(data)
+
+    def read(self) -> bytes:
+        """Remove and return everything buffered."""
+        with self._lock:
+            end = self._start + self._size
+            if end <= self.capacity:
+                out = bytes(self._buf[self._start:end])
+            else:
+                out = bytes(self._buf[self._start:]) + bytes(self._buf[:end - self.capacity])
+            self._start = 0
+            self._size = 0
+        return out
+
+
+class StreamDecoder:
+    """
+    One long-lived ``ffmpeg`` pipe: container bytes in, PCM out.
+
+    A writer thread owns ffmpeg's stdin and a reader thread its stdout.
+    """
+
+    backend = "ffmpeg"
+
+    def __init__(self, sample_rate: int = 16_000):
+        self.sample_rate = sample_rate
+        self.ring = PCMRingBuffer(sample_rate=sample_rate)
+        self._proc = subprocess.Popen(
+            [
+                "ffmpeg",
+                "-loglevel", "error",
+                "-fflags", "+nobuffer+genpts+igndts",
+                "-err_detect", "ignore_err",
+                "-probesize", "32768",
+                "-analyzeduration", "0",
+                "-i", "pipe:0",
+                "-f", "s16le", "-ar", str(sample_rate), "-ac", "1",
+                "pipe:1",
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._input = _BlockingReader()
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def _read_loop(self):
+        stdout = self._proc.stdout
+        while True:
+            block = stdout.read1(65536) if hasattr(stdout, "read1") else stdout.read(4096)
+            if not block:
+                return
+            self.ring.write(block)
+
+    def _write_loop(self):
+        stdin = self._proc.stdin
+        try:
+            while True:
+                data = self._input.read()
+                if not data:  # closed
+                    break
+                stdin.write(data)
+                stdin.flush()
+        except (BrokenPipeError, ValueError, OSError):
+            logger.warning("Stream decoder pipe closed")
+        finally:
+            try:
+                stdin.close()
+            except Exception:
+                pass
+            try:
+                self._proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+
+    def feed(self, data: bytes) -> bool:
+        """Queue container bytes; ``False`` once ffmpeg has gone away."""
+        if not self.alive:
+            return False
+        self._input.push(data)
+        return True
+
+    def read(self) -> bytes:
+        """PCM decoded since the previous call."""
+        return self.ring.read()
+
+    @property
+    def alive(self) -> bool:
+        return self._writer.is_alive() and self._proc.poll() is None
+
+    def close(self):
+        """Stop input; the writer thread closes the pipe and reaps ffmpeg."""
+        self._input.close()
+
+
+class _BlockingReader:
+    """File-like object whose ``read`` waits for bytes pushed by ``push``."""
+
+    def __init__(self):
+        self._data = bytearray()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def push(self, data: bytes):
+        with self._cond:
+            self._data += data
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            self._cond.notify()
+
+    def read(self, n: int = -1) -> bytes:
+        with self._cond:
+            while not self._data and not self._closed:
+                self._cond.wait()
+            if n < 0:
+                n = len(self._data)
+            out = bytes(self._data[:n])
+            del self._data[:n]
+        return out
+
+
+class PyAVStreamDecoder:
+    """In-process decoder: PyAV demuxes and resamples on a worker thread."""
+
+    backend = "pyav"
+
+    def __init__(self, sample_rate: int = 16_000):
+        if av is None:
+            raise RuntimeError("PyAV is not installed")
+        self.sample_rate = sample_rate
+        self.ring = PCMRingBuffer(sample_rate=sample_rate)
+        self._input = _BlockingReader()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._decode_loop, daemon=True)
+        self._thread.start()
+
+    def _decode_loop(self):
+        try:
+            container = av.open(
+                self._input, mode="r",
+                options={"probesize": "32768", "analyzeduration": "0"},
+            )
+            resampler = av.AudioResampler(format="s16", layout="mono", rate=self.sample_rate)
+            for packet in container.demux(audio=0):
+                try:
+                    frames = packet.decode()
+                except av.error.FFmpegError:
+                    continue  # damaged packet, keep going
+                for frame in frames:
+                    for out in resampler.resample(frame):
+                        self.ring.write(bytes(out.planes[0])[: out.samples * 2])
+        except Exception as e:
+            logger.warning("PyAV stream decoder stopped: %s", e)
+        finally:
+            self._done.set()
+
+    def feed(self, data: bytes) -> bool:
+        if self._done.is_set():
+            return False
+        self._input.push(data)
+        return True
+
+    def read(self) -> bytes:
+        return self.ring.read()
+
+    @property
+    def alive(self) -> bool:
+        return not self._done.is_set()
+
+    def close(self):
+        """Stop input; the decode thread drains what is queued and exits."""
+        self._input.close()
+
+
+def create_decoder(backend: str = "auto", sample_rate: int = 16_000):
+    """
+    Start a live decoder (``"auto"``, ``"pyav"`` or ``"ffmpeg"``).
+
+    Returns None if no backend can be started.
+    """
+    candidates = {
+        "auto": ["pyav", "ffmpeg"],
+        "pyav": ["pyav"],
+        "ffmpeg": ["ffmpeg"],
+    }.get(backend, [])
+
+    for name in candidates:
+        if name == "pyav" and av is None:
+            continue
+        try:
+            if name == "pyav":
+                return PyAVStreamDecoder(sample_rate=sample_rate)
+            return StreamDecoder(sample_rate=sample_rate)
+        except (OSError, RuntimeError) as e:
+            logger.warning("Could not start %s stream decoder: %s", name, e)
+    return None
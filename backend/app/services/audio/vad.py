@@ -0,0 +1,79 @@
+"""
+Lightweight energy-based voice activity detection on 16-bit PCM.
+
+No model, no extra dependencies: frames are classified by RMS energy
+against an adaptive noise floor, with a short hangover so brief dips
+inside a word do not count as pauses.
+"""
+
+import math
+import sys
+from array import array
+from typing import List, Optional
+
+SAMPLE_RATE = 16_000
+SAMPLE_WIDTH = 2  # s16le
+
+
+def frame_rms(pcm: bytes) -> float:
+    """RMS energy of a block of s16le mono samples."""
+    samples = array("h")
+    samples.frombytes(pcm[: len(pcm) - len(pcm) % SAMPLE_WIDTH])
+    if sys.byteorder == "big":
+        samples.byteswap()
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+class EnergyVAD:
+    """
+    Streaming speech / non-speech classifier.
+
+    Feed arbitrary-length PCM with :meth:`process`; it returns one
+    boolean per complete ``frame_ms`` frame and carries partial frames
+    over to the next call.
+    """
+
+    def __init__(
+        self,
+        frame_ms: int = 30,
+        sample_rate: int = SAMPLE_RATE,
+        min_energy: float = 300.0,
+        noise_ratio: float = 3.0,
+        hangover_frames: int = 8,
+    ):
+        self.frame_ms = frame_ms
+        self.frame_bytes = sample_rate * frame_ms // 1000 * SAMPLE_WIDTH
+        self.min_energy = min_energy
+        self.noise_ratio = noise_ratio
+        self.hangover_frames = hangover_frames
+        self.noise_floor: Optional[float] = None
+        self._hangover = 0
+        self._pending = b""
+
+    def is_speech(self, frame: bytes) -> bool:
+        energy = frame_rms(frame)
+        if self.noise_floor is None:
+            self.noise_floor = energy
+        threshold = max(self.min_energy, self.noise_floor * self.noise_ratio)
+
+        if energy >= threshold:
+            self._hangover = self.hangover_frames
+            return True
+
+        # Track the background level only while nobody is talking
+        self.noise_floor = 0.95 * self.noise_floor + 0.05 * energy
+        if self._hangover > 0:
+            self._hangover -= 1
+            return True
+        return False
+
+    def process(self, pcm: bytes) -> List[bool]:
+        data = self._pending + pcm
+        usable = len(data) - len(data) % self.frame_bytes
+        self._pending = data[usable:]
+        return [
+            self.is_speech(data[i:i + self.frame_bytes])
+            for i in range(0, usable, self.frame_bytes)
+        ]
@@ -0,0 +1,141 @@
+"""
+Call configuration for WebSocket sessions.
+
+Every ``/ingest`` and ``/coach`` connection (and every reconnect) needs
+the call's playbook config: the ``calls`` row (playbook version,
+pre-call data) and the ``playbook_versions`` row. Both are cached:
+
+- Published versions never change, so they are kept until evicted by
+  the size bound. Drafts get a short TTL.
+- Call rows get a short TTL and are invalidated by ``PUT /calls/{id}``.
+
+Lookups are single-flighted: concurrent connections for the same call
+(e.g. a reconnect storm from its observers) share one query. Supabase
+calls are blocking and run in a worker thread.
+
+The returned config is shared between sessions; treat it as read-only.
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from app.config import get_settings
+from app.models.database import get_supabase_client
+from app.services.playbook_service import get_compiled_playbook
+from app.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_calls: Optional[TTLCache] = None
+_versions: Optional[TTLCache] = None
+_inflight: Dict[Hashable, asyncio.Task] = {}
+
+
+def _get_caches():
+    global _calls, _versions
+    if _calls is None:
+        settings = get_settings()
+        _calls = TTLCache(
+            maxsize=settings.call_config_cache_size,
+            ttl=settings.call_config_call_ttl_seconds,
+        )
+        _versions = TTLCache(maxsize=settings.call_config_cache_size, ttl=None)
+    return _calls, _versions
+
+
+async def _single_flight(key: Hashable, fn: Callable[..., Any], *args) -> Any:
+    """Run blocking ``fn(*args)`` once for all concurrent callers of ``key``."""
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(asyncio.to_thread(fn, *args))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # One caller disconnecting must not cancel the query for the others
+    return await asyncio.shield(task)
+
+
+def _fetch_call(call_id: str) -> Dict:
+    result = get_supabase_client().table("calls").select(
+        "playbook_version_id, pre_call_data"
+    ).eq("id", call_id).execute()
+    return result.data[0] if result.data else {}
+
+
+def _fetch_version(version_id: str) -> Dict:
+    result = get_supabase_client().table("playbook_versions").select(
+        "call_structure, client_card_fields, scoring_criteria, published_at"
+    ).eq("id", version_id).execute()
+    return result.data[0] if result.data else {}
+
+
+async def _get_call(call_id: str) -> Dict:
+    calls, _ = _get_caches()
+    row = calls.get(call_id)
+    if row is None:
+        row = await _single_flight(("call", call_id), _fetch_call, call_id)
+        if row:
+            calls.set(call_id, row)
+    return row
+
+
+async def _get_version(version_id: str) -> Dict:
+    _, versions = _get_caches()
+    row = versions.get(version_id)
+    if row is None:
+        row = await _single_flight(("version", version_id), _fetch_version, version_id)
+        if row.get("published_at"):
+            versions.set(version_id, row)
+        else:
+            versions.set(version_id, row, ttl=get_settings().call_config_draft_ttl_seconds)
+    return row
+
+
+async def get_call_config(call_id: str) -> dict:
+    """
+    Load call structure and client card fields for a call.
+    Falls back to defaults if no playbook is attached.
+    """
+    from call_structure_config import get_default_call_structure
+    from client_card_config import get_default_client_card_fields, LLM_EXTRACTION_HINTS
+
+    call_data = await _get_call(call_id)
+    version_id = call_data.get("playbook_version_id")
+    pre_call_data = call_data.get("pre_call_data")
+
+    if version_id:
+        v = await _get_version(version_id)
+        if v:
+            call_structure = v.get("call_structure") or get_default_call_structure()
+            return {
+                "call_structure": call_structure,
+                "playbook": get_compiled_playbook(
+                    call_structure, version_id if v.get("call_structure") else None,
+                ),
+                "client_card_fields": v.get("client_card_fields") or get_default_client_card_fields(),
+                "extraction_hints": LLM_EXTRACTION_HINTS,
+                "pre_call_data": pre_call_data,
+            }
+
+    # Defaults
+    call_structure = get_default_call_structure()
+    return {
+        "call_structure": call_structure,
+        "playbook": get_compiled_playbook(call_structure),
+        "client_card_fields": get_default_client_card_fields(),
+        "extraction_hints": LLM_EXTRACTION_HINTS,
+        "pre_call_data": pre_call_data,
+    }
+
+
+def invalidate_call(call_id: str):
+    _get_caches()[0].pop(call_id)
+
+
+def invalidate_version(version_id: str):
+    _get_caches()[1].pop(version_id)
+
+
+def cache_info() -> Dict:
+    calls, versions = _get_caches()
+    return {"calls": calls.info(), "versions": versions.info()}
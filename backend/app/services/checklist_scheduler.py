@@ -0,0 +1,103 @@
+"""
+Event-driven scheduling of checklist re-checks for a live call.
+
+Open items used to be re-checked by the LLM every 30 s whether or not
+anything relevant had been said. :class:`ChecklistScheduler` instead
+re-checks an item when there is a signal for it:
+
+- one of its required keywords was just said (looked up through the
+  playbook's keyword -> item index).
+- the call moved into the item's stage.
+
+A signalled item is checked once ``min_interval`` has passed since its
+previous check, so even a keyword repeated on every tick (everyday
+words like "saya" or "anak") costs at most one check per
+``min_interval``.
+
+Items without a signal are still re-checked, but with exponential
+backoff: ``base_interval`` after the first check, doubling with every
+re-check that had no signal behind it, up to ``max_interval``. The
+backoff never delays a signalled item, and the interval never shrinks.
+"""
+
+from typing import Dict, Iterable, List, Mapping, Set
+
+from app.services.playbook_service import CompiledItem, CompiledPlaybook
+
+
+class ChecklistScheduler:
+    """Decides which open checklist items one call re-checks per tick."""
+
+    def __init__(
+        self,
+        playbook: CompiledPlaybook,
+        base_interval: float = 30.0,
+        max_interval: float = 480.0,
+        min_interval: float = 15.0,
+    ):
+        self.playbook = playbook
+        self.base_interval = base_interval
+        self.max_interval = max(base_interval, max_interval)
+        self.min_interval = min_interval
+        self._last_check: Dict[str, float] = {}
+        self._next_due: Dict[str, float] = {}  # item id -> next unprompted re-check
+        self._interval: Dict[str, float] = {}
+        self._signalled: Set[str] = set()
+        self.stats: Dict[str, int] = {
+            "checks": 0,
+            "keyword_triggers": 0,
+            "stage_triggers": 0,
+            "deferred": 0,
+        }
+
+    def signal_keywords(self, pattern_ids: Iterable[int]):
+        """Mark items whose required keywords the latest transcript text contained."""
+        index = self.playbook.items_by_keyword
+        for pid in pattern_ids:
+            for item in index[pid]:
+                if item.id not in self._signalled:
+                    self._signalled.add(item.id)
+                    self.stats["keyword_triggers"] += 1
+
+    def signal_stage(self, stage_id: str):
+        """Mark the items of a stage the call just entered."""
+        stage = self.playbook.stage_by_id.get(stage_id)
+        if stage is None:
+            return
+        for item in stage.items:
+            if item.id not in self._signalled:
+                self._signalled.add(item.id)
+                self.stats["stage_triggers"] += 1
+
+    def due(self, progress: Mapping[str, bool], now: float) -> List[CompiledItem]:
+        """
+        Open items to check this tick, in playbook order, and mark them
+        checked at ``now``. Items never checked before are always due.
+        """
+        pending = []
+        for item in self.playbook.items:
+            if progress.get(item.id, False):
+                continue
+            signalled = item.id in self._signalled
+            if signalled:
+                due = self._last_check.get(item.id, float("-inf")) + self.min_interval
+            else:
+                due = self._next_due.get(item.id, 0.0)
+            if now < due:
+                self.stats["deferred"] += 1
+                continue
+
+            interval = self._interval.get(item.id)
+            if interval is None:
+                interval = self.base_interval
+            elif not signalled:
+                # Nothing new was said about this item; back off
+                interval = min(interval * 2, self.max_interval)
+            self._interval[item.id] = interval
+            self._next_due[item.id] = now + interval
+            self._last_check[item.id] = now
+            self._signalled.discard(item.id)
+            pending.append(item)
+
+        self.stats["checks"] += len(pending)
+        return pending
@@ -0,0 +1,141 @@
+"""
+Multi-pattern keyword matching for the checklist pre-filter.
+
+The pre-filter asks, per item, "is at least one required keyword and
+no forbidden keyword in the recent conversation?". Answering that with
+a substring scan per keyword per item per tick costs
+O(items x keywords x window). Instead:
+
+- :class:`KeywordAutomaton` is an Aho-Corasick automaton over every
+  keyword of a playbook version (built once, with the compiled
+  playbook). One pass over a text reports all occurrences.
+- :class:`KeywordTracker` (one per live call) feeds only transcript
+  text added since the previous tick through the automaton and keeps
+  the absolute offset where each keyword was last seen. Whether a
+  keyword occurs in the last ``n`` characters is then a comparison.
+
+Matching is case-insensitive substring matching, like the pre-filter
+it replaces.
+"""
+
+from collections import deque
+from typing import Dict, List, Sequence, Set, Tuple
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over lowercased keywords."""
+
+    def __init__(self, keywords: Sequence[str]):
+        self.patterns: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for kw in keywords:
+            kw = kw.lower()
+            if kw and kw not in self.ids:
+                self.ids[kw] = len(self.patterns)
+                self.patterns.append(kw)
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        for pid, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] += (pid,)
+
+        # Breadth-first failure links; outputs include those of the fail state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def step(self, state: int, ch: str) -> int:
+        goto, fail = self._goto, self._fail
+        while state and ch not in goto[state]:
+            state = fail[state]
+        return goto[state].get(ch, 0)
+
+    def scan(self, text: str, state: int = 0) -> Tuple[List[Tuple[int, int]], int]:
+        """
+        All occurrences in ``text`` as ``(pattern_id, start)`` pairs
+        (``start`` relative to ``text``), plus the final state. Passing
+        that state back in continues a scan across chunk boundaries.
+        """
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            chars = enumerate(lowered)
+        else:
+            # A few characters lowercase to two; keep offsets on the original text
+            chars = ((i, c) for i, ch in enumerate(text) for c in ch.lower())
+        out, patterns = self._out, self.patterns
+        hits: List[Tuple[int, int]] = []
+        for i, ch in chars:
+            state = self.step(state, ch)
+            for pid in out[state]:
+                hits.append((pid, i - len(patterns[pid]) + 1))
+        return hits, state
+
+
+class KeywordTracker:
+    """
+    Running keyword hits of one call's transcript.
+
+    Call :meth:`feed` after new transcript text arrives; then
+    :meth:`seen_within` tells whether a keyword occurred in the last
+    ``window`` characters fed.
+    """
+
+    def __init__(self, automaton: KeywordAutomaton):
+        self.automaton = automaton
+        self.offset = 0  # absolute offset of the end of the text fed so far
+        self._state = 0
+        self._last_seen: List[int] = [-1] * len(automaton)
+        self.new_hits: Set[int] = set()  # patterns found by the latest feed()
+        self.chars_scanned = 0
+
+    def feed(self, transcript) -> int:
+        """
+        Scan the text ``transcript`` (a :class:`TranscriptStore`) gained
+        since the previous call. Returns the number of characters scanned;
+        the patterns it contained are in :attr:`new_hits`.
+        """
+        self.new_hits = set()
+        if transcript.end_offset < self.offset:
+            # Transcript was reset; start over
+            self.offset = 0
+            self._state = 0
+            self._last_seen = [-1] * len(self.automaton)
+        new_text = transcript.text_since(self.offset)
+        if not new_text:
+            return 0
+        base = transcript.end_offset - len(new_text)
+        if base != self.offset:
+            # Part of the gap was trimmed before we saw it; don't match across it
+            self._state = 0
+        hits, self._state = self.automaton.scan(new_text, self._state)
+        for pid, start in hits:
+            self._last_seen[pid] = base + start
+            self.new_hits.add(pid)
+        self.offset = transcript.end_offset
+        self.chars_scanned += len(new_text)
+        return len(new_text)
+
+    def seen_within(self, pattern_id: int, window: int) -> bool:
+        """True if the pattern occurs entirely in the last ``window`` characters."""
+        return self._last_seen[pattern_id] >= self.offset - window
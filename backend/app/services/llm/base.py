@@ -1,6 +1,10 @@
 """
 OpenRouter LLM client.
 Ported from trial_class_analyzer._call_llm.
+
+All requests go through one long-lived ``httpx.AsyncClient`` so live
+calls reuse pooled keep-alive (HTTP/2 when ``h2`` is installed)
+connections instead of blocking the event loop per request.
 """
 
 import json
@@ -11,35 +15,61 @@ import httpx
 
 from app.config import get_settings
 
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
 logger = logging.getLogger(__name__)
 
 
 class LLMClient:
-    """Wrapper around the OpenRouter chat-completions API."""
+    """Async wrapper around the OpenRouter chat-completions API."""
 
     def __init__(self, model: Optional[str] = None):
         settings = get_settings()
         self.api_key = settings.openrouter_api_key
         self.api_url = "https://openrouter.ai/api/v1/chat/completions"
         self.model = model or settings.llm_realtime_model
+        self.timeout = settings.llm_timeout_seconds
+        self.realtime_timeout = settings.llm_realtime_timeout_seconds
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def _get_http(self) -> httpx.AsyncClient:
+        """Create the pooled HTTP client lazily (inside the running loop)."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                http2=_HTTP2,
+                timeout=httpx.Timeout(self.timeout, connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=60.0,
+                ),
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                },
+            )
+        return self._http
 
-    def call(
+    async def call(
         self,
         prompt: str,
         *,
         temperature: float = 0.5,
         max_tokens: int = 500,
         model: Optional[str] = None,
+        timeout: Optional[float] = None,
     ) -> str:
         """
         Send a single-user-message prompt. Returns assistant content.
 
+        ``timeout`` overrides the client default for this request.
+        Cancelling the awaiting task aborts the HTTP request.
         On errors returns a JSON string with an ``error`` key.
         """
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
         payload = {
             "model": model or self.model,
             "messages": [{"role": "user", "content": prompt}],
@@ -48,11 +78,10 @@ class LLMClient:
         }
 
         try:
-            resp = httpx.post(
+            resp = await self._get_http().post(
                 self.api_url,
-                headers=headers,
                 json=payload,
-                timeout=300.0,
+                timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
             )
             if resp.status_code != 200:
                 error_body = resp.text[:500]
@@ -73,6 +102,11 @@ class LLMClient:
 
         return content.strip()
 
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
 
 # Singleton -----------------------------------------------------------------
 
@@ -84,3 +118,9 @@ def get_llm_client(model: Optional[str] = None) -> LLMClient:
     if _client is None:
         _client = LLMClient(model=model)
     return _client
+
+
+async def close_llm_client():
+    """Close pooled connections (called on app shutdown)."""
+    if _client is not None:
+        await _client.aclose()
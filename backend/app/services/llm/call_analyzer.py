@@ -23,7 +23,7 @@ MAX_TRANSCRIPT_CHARS = 40_000
 MAX_DOCS_CHARS = 40_000
 
 
-def analyze_call(
+async def analyze_call(
     transcript: str,
     scoring_criteria: Optional[List[Dict]] = None,
     playbook_guidelines: Optional[str] = None,
@@ -56,12 +56,12 @@ def analyze_call(
     )
 
     if has_analysis_docs:
-        return _analyze_tcm_qc(transcript, scoring_criteria, playbook_guidelines)
+        return await _analyze_tcm_qc(transcript, scoring_criteria, playbook_guidelines)
     else:
-        return _analyze_simple(transcript, scoring_criteria, playbook_guidelines)
+        return await _analyze_simple(transcript, scoring_criteria, playbook_guidelines)
 
 
-def _analyze_simple(
+async def _analyze_simple(
     transcript: str,
     scoring_criteria: Optional[List[Dict]] = None,
     playbook_guidelines: Optional[str] = None,
@@ -127,7 +127,7 @@ Return ONLY valid JSON:
 """
 
     try:
-        raw = llm.call(prompt, temperature=0.3, max_tokens=4000, model=model)
+        raw = await llm.call(prompt, temperature=0.3, max_tokens=4000, model=model)
         result = json.loads(raw)
         if "error" in result:
             raise RuntimeError(result.get("details", "API error"))
@@ -137,7 +137,7 @@ Return ONLY valid JSON:
         return _empty_result()
 
 
-def _analyze_tcm_qc(
+async def _analyze_tcm_qc(
     transcript: str,
     scoring_criteria: Optional[List[Dict]] = None,
     playbook_guidelines: Optional[str] = None,
@@ -212,7 +212,7 @@ Return ONLY valid JSON with this structure:
 Make sure criteria_scores includes ALL criteria (1-49). Return ONLY valid JSON, no other text."""
 
     try:
-        raw = llm.call(prompt, temperature=0.2, max_tokens=16000, model=model)
+        raw = await llm.call(prompt, temperature=0.2, max_tokens=16000, model=model)
         result = json.loads(raw)
         if "error" in result:
             raise RuntimeError(result.get("details", "API error"))
@@ -1,65 +1,210 @@
 """
 Checklist item completion detection via LLM.
 Ported from trial_class_analyzer.check_checklist_item + guards.
+
+Items are :class:`~app.services.playbook_service.CompiledItem` objects:
+keyword matchers and the prompt fragments built by the helpers at the
+bottom of this module are prepared once per playbook version.
 """
 
+import asyncio
 import json
 import logging
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
+from app.config import get_settings
 from app.services.llm.base import get_llm_client
 
+if TYPE_CHECKING:
+    from app.services.keyword_automaton import KeywordTracker
+    from app.services.playbook_service import CompiledItem
+
 logger = logging.getLogger(__name__)
 
+# Shared by every call handled by this process; created on first use.
+_process_limiter: Optional[asyncio.Semaphore] = None
+
+
+def _get_process_limiter() -> asyncio.Semaphore:
+    global _process_limiter
+    if _process_limiter is None:
+        _process_limiter = asyncio.Semaphore(
+            get_settings().checklist_process_concurrency
+        )
+    return _process_limiter
+
 
-def check_checklist_item(
-    item: Dict,
+async def check_checklist_items(
+    items: List["CompiledItem"],
     conversation_text: str,
+    max_concurrency: Optional[int] = None,
+    keywords: Optional["KeywordTracker"] = None,
+) -> List[Tuple[bool, float, str, Dict]]:
+    """
+    Check several checklist items.
+
+    Items passing the keyword pre-filter are sent in batches of
+    ``checklist_batch_size`` (one prompt per batch, transcript included
+    once). Items the batch marks uncertain or leaves out get an
+    individual :func:`check_checklist_item` call.
+
+    At most ``max_concurrency`` (default ``checklist_call_concurrency``)
+    LLM checks run at once for this caller, and at most
+    ``checklist_process_concurrency`` across the whole process.
+
+    With ``keywords`` (the call's running keyword hits, already fed up
+    to the end of ``conversation_text``) the keyword pre-filter is
+    answered without rescanning the text.
+
+    Returns results in the same order as ``items``.
+    """
+    settings = get_settings()
+    call_limiter = asyncio.Semaphore(
+        max_concurrency or settings.checklist_call_concurrency
+    )
+    process_limiter = _get_process_limiter()
+
+    results: List[Optional[Tuple[bool, float, str, Dict]]] = [None] * len(items)
+    candidates: List[int] = []
+    for idx, item in enumerate(items):
+        early = _precheck(item, conversation_text, keywords)
+        if early is not None:
+            results[idx] = early
+        else:
+            candidates.append(idx)
+
+    batch_size = settings.checklist_batch_size
+    if batch_size > 1 and len(candidates) > 1:
+        batches = [
+            candidates[i:i + batch_size]
+            for i in range(0, len(candidates), batch_size)
+        ]
+
+        async def _batch(indexes: List[int]):
+            async with call_limiter:
+                async with process_limiter:
+                    return await _batch_check(
+                        [items[i] for i in indexes], conversation_text,
+                    )
+
+        async def _guard(i: int, verdict: Tuple[bool, float, str, str, Dict]):
+            async with call_limiter:
+                async with process_limiter:
+                    return await _apply_guards(items[i], *verdict)
+
+        # Guards (incl. the validation LLM call) run after the batch slot
+        # is released, concurrently rather than item after item
+        verdicts = await asyncio.gather(*(_batch(b) for b in batches))
+        judged = [
+            (i, verdict)
+            for indexes, batch_verdicts in zip(batches, verdicts)
+            for i, verdict in zip(indexes, batch_verdicts)
+            if verdict is not None
+        ]
+        guarded = await asyncio.gather(*(_guard(i, v) for i, v in judged))
+        for (i, _), result in zip(judged, guarded):
+            results[i] = result
+        uncertain = [i for i in candidates if results[i] is None]
+        if uncertain:
+            logger.info(
+                "Batch check: %d/%d items uncertain, re-checking individually",
+                len(uncertain), len(candidates),
+            )
+    else:
+        uncertain = candidates
+
+    async def _check(item: "CompiledItem") -> Tuple[bool, float, str, Dict]:
+        async with call_limiter:
+            async with process_limiter:
+                return await check_checklist_item(item, conversation_text, keywords)
+
+    singles = await asyncio.gather(*(_check(items[i]) for i in uncertain))
+    for i, result in zip(uncertain, singles):
+        results[i] = result
+
+    return results
+
+
+async def check_checklist_item(
+    item: "CompiledItem",
+    conversation_text: str,
+    keywords: Optional["KeywordTracker"] = None,
 ) -> Tuple[bool, float, str, Dict]:
     """
     Check if a checklist item has been completed.
 
     Args:
-        item: ``{id, content, type, extended_description, semantic_keywords}``
+        item: Compiled checklist item of the call's playbook.
         conversation_text: Recent conversation (Indonesian).
+        keywords: Running keyword hits (see :func:`check_checklist_items`).
 
     Returns:
         ``(completed, confidence, evidence, debug_info)``
     """
-    if len(conversation_text.strip()) < 30:
-        return False, 0.0, "Insufficient context", {
-            "stage": "guard_context_too_short",
+    early = _precheck(item, conversation_text, keywords)
+    if early is not None:
+        return early
+
+    prompt = item.check_prompt_head + conversation_text + item.check_prompt_tail
+
+    llm = get_llm_client()
+
+    try:
+        raw = await llm.call(
+            prompt, temperature=0.2, max_tokens=200, timeout=llm.realtime_timeout,
+        )
+        result = json.loads(raw)
+        if "error" in result:
+            raise RuntimeError(result.get("details", "API error"))
+
+        parsed = _parse_verdict(result)
+        if parsed is None:
+            raise ValueError(f"malformed verdict: {raw[:200]}")
+        completed, confidence, evidence, reasoning = parsed
+
+        debug_info: Dict = {
+            "stage": "initial_check",
+            "first_completed": completed,
+            "first_confidence": confidence,
+            "first_evidence": evidence,
+            "first_reasoning": reasoning,
         }
+        return await _apply_guards(
+            item, completed, confidence, evidence, reasoning, debug_info,
+        )
 
-    item_id = item["id"]
-    item_content = item["content"]
-    item_type = item.get("type", "discuss")
-    extended_description = item.get("extended_description", "")
-    semantic_keywords = item.get("semantic_keywords", {})
+    except Exception as exc:
+        logger.warning("Checklist check failed for %s: %s", item.id, exc)
+        return False, 0.0, str(exc), {"stage": "error", "error": str(exc)}
 
-    # Guard 0: pre-filter with keywords
-    if semantic_keywords:
-        ok, kw_debug = _prefilter_keywords(conversation_text, semantic_keywords)
-        if not ok:
-            return False, 0.0, "Pre-filter failed", {
-                "stage": "guard_0_prefilter_failed",
-                "keywords_debug": kw_debug,
-            }
 
-    # Build LLM prompt
-    type_block = _type_specific_prompt(item_type)
+async def _batch_check(
+    items: List["CompiledItem"],
+    conversation_text: str,
+) -> List[Optional[Tuple[bool, float, str, str, Dict]]]:
+    """
+    Check several items with a single LLM request.
 
-    prompt = f"""You are a STRICT quality checker analyzing a sales call in Bahasa Indonesia.
+    Returns one ``(completed, confidence, evidence, reasoning,
+    debug_info)`` verdict per item, before guards 1-3; ``None`` means the
+    batch verdict was uncertain, malformed or missing and the item needs
+    an individual check.
+    """
+    item_lines = [f"{n}. {item.batch_line}" for n, item in enumerate(items, 1)]
 
-TASK: Check if this action was completed:
-Action: "{item_content}"
+    prompt = f"""You are a STRICT quality checker analyzing a sales call in Bahasa Indonesia.
 
-ADDITIONAL CONTEXT: {extended_description}
+TASK: For EACH action below, check if it was completed in the conversation.
 
 Recent conversation (Bahasa Indonesia):
 {conversation_text}
 
-{type_block}
+Actions:
+{chr(10).join(item_lines)}
+
+TYPES:
+- DISCUSS/ASK: find a QUESTION or an ANSWER proving the question was asked.
+- SAY/EXPLAIN: find the manager STATING or EXPLAINING something (asking is not enough).
 
 CRITICAL VALIDATION RULES:
 1. Evidence must be a DIRECT QUOTE from conversation
@@ -67,90 +212,231 @@ CRITICAL VALIDATION RULES:
 3. Generic phrases like "oke", "baik", "ya" are NEVER valid
 4. Promises ("nanti", "akan") are NOT completion
 5. If even 20% unsure -> completed=false
+6. If you cannot decide without looking more closely, set "uncertain": true
 
 CONFIDENCE: 90-100% perfect, 70-89% good, 50-69% weak, <50% not done.
 
-Return ONLY valid JSON:
+Return ONLY valid JSON with one entry per action id:
 {{
-  "completed": true/false,
-  "confidence": 0.0-1.0,
-  "evidence": "exact quote (empty if not completed)",
-  "reasoning": "why"
+  "results": [
+    {{
+      "id": "action id",
+      "completed": true/false,
+      "confidence": 0.0-1.0,
+      "evidence": "exact quote (empty if not completed)",
+      "reasoning": "why",
+      "uncertain": true/false
+    }}
+  ]
 }}
 """
 
     llm = get_llm_client()
-
     try:
-        raw = llm.call(prompt, temperature=0.2, max_tokens=200)
+        raw = await llm.call(
+            prompt,
+            temperature=0.2,
+            max_tokens=150 * len(items) + 100,
+            timeout=llm.realtime_timeout,
+        )
         result = json.loads(raw)
         if "error" in result:
             raise RuntimeError(result.get("details", "API error"))
-
-        completed = result.get("completed", False)
-        confidence = result.get("confidence", 0.0)
-        evidence = result.get("evidence", "")
-        reasoning = result.get("reasoning", "")
+        verdicts = {
+            str(v.get("id")): v
+            for v in result.get("results", [])
+            if isinstance(v, dict)
+        }
+    except Exception as exc:
+        logger.warning("Batch checklist check failed (%d items): %s", len(items), exc)
+        return [None] * len(items)
+
+    out: List[Optional[Tuple[bool, float, str, str, Dict]]] = []
+    for item in items:
+        verdict = verdicts.get(item.id)
+        parsed = None
+        if verdict is not None and not _as_bool(verdict.get("uncertain")):
+            parsed = _parse_verdict(verdict)
+        if parsed is None:
+            out.append(None)
+            continue
+        completed, confidence, evidence, reasoning = parsed
+
+        # Weak positives are exactly what the focused prompt is for
+        if completed and 0.5 <= confidence < 0.7:
+            out.append(None)
+            continue
 
         debug_info: Dict = {
-            "stage": "initial_check",
+            "stage": "batch_check",
+            "batch_size": len(items),
             "first_completed": completed,
             "first_confidence": confidence,
             "first_evidence": evidence,
             "first_reasoning": reasoning,
         }
+        out.append((completed, confidence, evidence, reasoning, debug_info))
+    return out
 
-        # Guard 1: confidence threshold
-        if completed and confidence < 0.7:
-            debug_info["stage"] = "guard_1_low_confidence"
-            return False, confidence, "Confidence too low", debug_info
 
-        # Guard 2: evidence length
-        if completed and len(evidence.strip()) < 10:
-            debug_info["stage"] = "guard_2_evidence_too_short"
-            return False, confidence, "Evidence too short", debug_info
+def _as_bool(value) -> bool:
+    """JSON boolean from an LLM answer; only ``true`` / ``"true"`` count."""
+    if isinstance(value, str):
+        return value.strip().lower() == "true"
+    return value is True
 
-        # Guard 3: second-pass validation
-        if completed and confidence >= 0.7:
-            valid = _validate_evidence(item_content, evidence, reasoning, item_type)
-            debug_info["validation_passed"] = valid
-            if not valid:
-                debug_info["stage"] = "guard_3_validation_failed"
-                return False, confidence, f"Evidence not relevant: {evidence[:100]}", debug_info
 
-        debug_info["stage"] = "accepted"
-        return completed, confidence, evidence, debug_info
+def _parse_verdict(verdict: Dict) -> Optional[Tuple[bool, float, str, str]]:
+    """
+    ``(completed, confidence, evidence, reasoning)`` from an LLM verdict,
+    or ``None`` if a field has an unusable type or value.
+    """
+    try:
+        completed = verdict.get("completed", False)
+        if isinstance(completed, str):
+            if completed.strip().lower() not in ("true", "false"):
+                return None
+        elif not isinstance(completed, bool):
+            return None
+        confidence = verdict.get("confidence", 0.0)
+        if isinstance(confidence, bool):
+            return None
+        confidence = float(confidence)
+        if not 0.0 <= confidence <= 1.0:  # also rejects NaN
+            return None
+        evidence = verdict.get("evidence") or ""
+        reasoning = verdict.get("reasoning") or ""
+        if not isinstance(evidence, str) or not isinstance(reasoning, str):
+            return None
+    except (TypeError, ValueError):
+        return None
+    return _as_bool(completed), confidence, evidence, reasoning
+
+
+def _precheck(
+    item: "CompiledItem",
+    conversation_text: str,
+    keywords: Optional["KeywordTracker"] = None,
+) -> Optional[Tuple[bool, float, str, Dict]]:
+    """Cheap guards run before any LLM call. ``None`` means "ask the LLM"."""
+    if len(conversation_text.strip()) < 30:
+        return False, 0.0, "Insufficient context", {
+            "stage": "guard_context_too_short",
+        }
 
-    except Exception as exc:
-        logger.warning("Checklist check failed for %s: %s", item_id, exc)
-        return False, 0.0, str(exc), {"stage": "error", "error": str(exc)}
+    # Guard 0: pre-filter with keywords
+    if item.has_keywords:
+        if keywords is not None:
+            ok, kw_debug = item.prefilter_tracked(keywords, len(conversation_text))
+        else:
+            ok, kw_debug = item.prefilter(conversation_text)
+        if not ok:
+            return False, 0.0, "Pre-filter failed", {
+                "stage": "guard_0_prefilter_failed",
+                "keywords_debug": kw_debug,
+            }
+    return None
+
+
+async def _apply_guards(
+    item: "CompiledItem",
+    completed: bool,
+    confidence: float,
+    evidence: str,
+    reasoning: str,
+    debug_info: Dict,
+) -> Tuple[bool, float, str, Dict]:
+    """Guards 1-3 applied to an LLM verdict (single or batched)."""
+    # Guard 1: confidence threshold
+    if completed and confidence < 0.7:
+        debug_info["stage"] = "guard_1_low_confidence"
+        return False, confidence, "Confidence too low", debug_info
+
+    # Guard 2: evidence length
+    if completed and len(evidence.strip()) < 10:
+        debug_info["stage"] = "guard_2_evidence_too_short"
+        return False, confidence, "Evidence too short", debug_info
+
+    # Guard 3: second-pass validation
+    if completed and confidence >= 0.7:
+        valid = await _validate_evidence(item, evidence, reasoning)
+        debug_info["validation_passed"] = valid
+        if not valid:
+            debug_info["stage"] = "guard_3_validation_failed"
+            return False, confidence, f"Evidence not relevant: {evidence[:100]}", debug_info
+
+    debug_info["stage"] = "accepted"
+    return completed, confidence, evidence, debug_info
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _prefilter_keywords(
-    text: str, keywords: Dict[str, List[str]],
-) -> Tuple[bool, Dict]:
-    text_lower = text.lower()
-    required = keywords.get("required", [])
-    forbidden = keywords.get("forbidden", [])
-    debug: Dict = {"required": required, "forbidden": forbidden, "found_required": [], "found_forbidden": []}
+def compile_item_prompts(item: Dict) -> Dict:
+    """
+    Prompt fragments of one raw checklist item, built once per playbook
+    version by :func:`app.services.playbook_service.compile_playbook`.
+
+    The single-item prompt is split around the conversation text:
+    ``check_prompt_head + conversation + check_prompt_tail``.
+    """
+    item_type = item.get("type", "discuss")
+    content = item["content"]
+    extended_description = item.get("extended_description", "")
+
+    head = f"""You are a STRICT quality checker analyzing a sales call in Bahasa Indonesia.
+
+TASK: Check if this action was completed:
+Action: "{content}"
+
+ADDITIONAL CONTEXT: {extended_description}
+
+Recent conversation (Bahasa Indonesia):
+"""
+    tail = f"""
+
+{_type_specific_prompt(item_type)}
+
+CRITICAL VALIDATION RULES:
+1. Evidence must be a DIRECT QUOTE from conversation
+2. Evidence must CLEARLY show the action was done
+3. Generic phrases like "oke", "baik", "ya" are NEVER valid
+4. Promises ("nanti", "akan") are NOT completion
+5. If even 20% unsure -> completed=false
+
+CONFIDENCE: 90-100% perfect, 70-89% good, 50-69% weak, <50% not done.
+
+Return ONLY valid JSON:
+{{
+  "completed": true/false,
+  "confidence": 0.0-1.0,
+  "evidence": "exact quote (empty if not completed)",
+  "reasoning": "why"
+}}
+"""
 
-    if required:
-        found = [kw for kw in required if kw.lower() in text_lower]
-        debug["found_required"] = found
-        if not found:
-            return False, debug
+    kind = "DISCUSS/ASK" if item_type == "discuss" else "SAY/EXPLAIN"
+    batch_line = f'id="{item["id"]}" [{kind}] "{content}"'
+    if extended_description:
+        batch_line += f"\n   Context: {extended_description}"
 
-    if forbidden:
-        found = [kw for kw in forbidden if kw.lower() in text_lower]
-        debug["found_forbidden"] = found
-        if found:
-            return False, debug
+    type_check = (
+        "DISCUSS/ASK: evidence must show a QUESTION or an ANSWER implying the question."
+        if item_type == "discuss"
+        else "SAY/EXPLAIN: evidence must show the manager STATING or EXPLAINING."
+    )
 
-    return True, debug
+    action_lower = content.lower()
+    return {
+        "check_prompt_head": head,
+        "check_prompt_tail": tail,
+        "batch_line": batch_line,
+        "validation_type_check": type_check,
+        "allows_introduction": any(
+            w in action_lower for w in ["greet", "introduce", "perkenalkan", "salam"]
+        ),
+    }
 
 
 def _type_specific_prompt(item_type: str) -> str:
@@ -175,11 +461,10 @@ INTRODUCTION_PATTERNS = [
 ]
 
 
-def _validate_evidence(
-    item_content: str,
+async def _validate_evidence(
+    item: "CompiledItem",
     evidence: str,
     reasoning: str,
-    item_type: str,
 ) -> bool:
     if not evidence or len(evidence.strip()) < 5:
         return False
@@ -187,10 +472,8 @@ def _validate_evidence(
     ev_lower = evidence.lower().strip()
 
     # Reject introductions (unless action is about introductions)
-    if any(p in ev_lower for p in INTRODUCTION_PATTERNS):
-        action_lower = item_content.lower()
-        if not any(w in action_lower for w in ["greet", "introduce", "perkenalkan", "salam"]):
-            return False
+    if not item.allows_introduction and any(p in ev_lower for p in INTRODUCTION_PATTERNS):
+        return False
 
     # Reject if evidence is only a generic phrase
     for phrase in INVALID_PHRASES:
@@ -201,19 +484,13 @@ def _validate_evidence(
         return False
 
     # Second LLM validation
-    type_check = (
-        "DISCUSS/ASK: evidence must show a QUESTION or an ANSWER implying the question."
-        if item_type == "discuss"
-        else "SAY/EXPLAIN: evidence must show the manager STATING or EXPLAINING."
-    )
-
     validation_prompt = f"""STRICT evidence validator for a sales call checklist.
 
-ACTION: "{item_content}"
+ACTION: "{item.content}"
 EVIDENCE: "{evidence}"
 REASONING: "{reasoning}"
 
-{type_check}
+{item.validation_type_check}
 
 Checks: 1) actual content, 2) semantic match, 3) specific enough, 4) matches type.
 BE EXTREMELY STRICT. Return ONLY JSON: {{"is_valid": true/false, "explanation": "..."}}
@@ -221,10 +498,13 @@ BE EXTREMELY STRICT. Return ONLY JSON: {{"is_valid": true/false, "explanation":
 
     llm = get_llm_client()
     try:
-        raw = llm.call(validation_prompt, temperature=0.05, max_tokens=150)
+        raw = await llm.call(
+            validation_prompt, temperature=0.05, max_tokens=150,
+            timeout=llm.realtime_timeout,
+        )
         result = json.loads(raw)
         if "error" in result:
             return False
-        return bool(result.get("is_valid", False))
+        return _as_bool(result.get("is_valid", False))
     except Exception:
         return False
@@ -24,7 +24,7 @@ INVALID_EVIDENCE_STARTS = [
 ]
 
 
-def extract_client_card_fields(
+async def extract_client_card_fields(
     conversation_text: str,
     current_values: Dict[str, str],
     fields: List[Dict],
@@ -85,7 +85,9 @@ If nothing found, return: {{}}
 
     llm = get_llm_client()
     try:
-        raw = llm.call(prompt, temperature=0.3, max_tokens=800)
+        raw = await llm.call(
+            prompt, temperature=0.3, max_tokens=800, timeout=llm.realtime_timeout,
+        )
         result = json.loads(raw)
         if "error" in result:
             raise RuntimeError(result.get("details", "API error"))
@@ -124,7 +126,7 @@ If nothing found, return: {{}}
 
         # Validate evidence
         field_label = label_map.get(field_id, field_id)
-        if not _validate_field_evidence(field_label, value, evidence):
+        if not await _validate_field_evidence(field_label, value, evidence):
             continue
 
         updates[field_id] = {
@@ -137,7 +139,7 @@ If nothing found, return: {{}}
     return updates
 
 
-def _validate_field_evidence(
+async def _validate_field_evidence(
     field_label: str,
     value: str,
     evidence: str,
@@ -172,7 +174,9 @@ BE STRICT. Return JSON: {{"is_valid": true/false, "explanation": "..."}}
 """
     llm = get_llm_client()
     try:
-        raw = llm.call(prompt, temperature=0.05, max_tokens=150)
+        raw = await llm.call(
+            prompt, temperature=0.05, max_tokens=150, timeout=llm.realtime_timeout,
+        )
         r = json.loads(raw)
         return bool(r.get("is_valid", False))
     except Exception:
@@ -6,16 +6,19 @@ playbook, pre-call data, and current conversation.
 
 import json
 import logging
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, Optional
 
 from app.services.llm.base import get_llm_client
 
+if TYPE_CHECKING:
+    from app.services.playbook_service import CompiledStage
+
 logger = logging.getLogger(__name__)
 
 
-def generate_coaching_tip(
+async def generate_coaching_tip(
     conversation_text: str,
-    current_stage: Dict,
+    current_stage: Optional["CompiledStage"],
     pre_call_data: Optional[Dict] = None,
     checklist_progress: Optional[Dict[str, bool]] = None,
     client_card_data: Optional[Dict] = None,
@@ -32,9 +35,9 @@ def generate_coaching_tip(
     # Build context
     pending_items = []
     if current_stage and checklist_progress is not None:
-        for item in current_stage.get("items", []):
-            if not checklist_progress.get(item["id"], False):
-                pending_items.append(item["content"])
+        for item in current_stage.items:
+            if not checklist_progress.get(item.id, False):
+                pending_items.append(item.content)
 
     pre_call_summary = ""
     if pre_call_data:
@@ -57,7 +60,7 @@ def generate_coaching_tip(
 
     prompt = f"""You are a real-time sales coach for a trial class call in Bahasa Indonesia.
 
-Current stage: {current_stage.get('name', 'Unknown') if current_stage else 'Unknown'}
+Current stage: {current_stage.name if current_stage else 'Unknown'}
 
 Pending checklist items:
 {chr(10).join(f'- {p}' for p in pending_items) if pending_items else '(all done)'}
@@ -79,7 +82,9 @@ Return JSON: {{"tip": "...", "category": "suggestion|warning|transition|info"}}
 
     llm = get_llm_client()
     try:
-        raw = llm.call(prompt, temperature=0.4, max_tokens=150)
+        raw = await llm.call(
+            prompt, temperature=0.4, max_tokens=150, timeout=llm.realtime_timeout,
+        )
         result = json.loads(raw)
         if "error" in result:
             return None
@@ -2,20 +2,27 @@
 AI-based call stage detection.
 Ported from call_structure_config.detect_stage_by_context
 and trial_class_analyzer.detect_current_stage.
+
+Works on a :class:`~app.services.playbook_service.CompiledPlaybook`;
+the stage list of the prompt is built once per playbook version by
+:func:`compile_stage_prompt`.
 """
 
 import json
 import logging
-from typing import List, Dict, Tuple, Optional
+from typing import TYPE_CHECKING, Dict, Tuple, Optional
 
 from app.services.llm.base import get_llm_client
 
+if TYPE_CHECKING:
+    from app.services.playbook_service import CompiledPlaybook, CompiledStage
+
 logger = logging.getLogger(__name__)
 
 
-def detect_stage(
+async def detect_stage(
     conversation_text: str,
-    stages: List[Dict],
+    playbook: "CompiledPlaybook",
     elapsed_seconds: int,
     previous_stage_id: Optional[str] = None,
     min_confidence: float = 0.6,
@@ -25,15 +32,15 @@ def detect_stage(
 
     Falls back to time-based detection on low confidence or error.
     """
-    if not stages:
+    if not playbook.stages:
         return ""
 
     if len(conversation_text.strip()) < 100:
-        return stages[0]["id"]
+        return playbook.first_stage_id
 
     try:
-        stage_id, confidence = _ai_detect(
-            conversation_text, stages, elapsed_seconds,
+        stage_id, confidence = await _ai_detect(
+            conversation_text, playbook, elapsed_seconds,
         )
 
         if confidence >= min_confidence:
@@ -42,33 +49,31 @@ def detect_stage(
         if previous_stage_id and confidence < min_confidence:
             return previous_stage_id
 
-        return _time_based_fallback(stages, elapsed_seconds)
+        return _time_based_fallback(playbook, elapsed_seconds)
 
     except Exception as exc:
         logger.warning("Stage detection error: %s, using fallback", exc)
-        return _time_based_fallback(stages, elapsed_seconds)
+        return _time_based_fallback(playbook, elapsed_seconds)
+
+
+def compile_stage_prompt(index: int, stage: Dict) -> str:
+    """A raw stage's entry in the stage list of the detection prompt."""
+    items = stage.get("items", [])
+    items_text = "\n".join(f"- {it['content']}" for it in items[:3])
+    extra = len(items) - 3
+    if extra > 0:
+        items_text += f"\n- ...and {extra} more"
+    t0 = stage["startOffsetSeconds"] // 60
+    t1 = (stage["startOffsetSeconds"] + stage["durationSeconds"]) // 60
+    return f"{index + 1}. **{stage['name']}** (recommended: {t0}-{t1} min)\n   {items_text}"
 
 
-def _ai_detect(
+async def _ai_detect(
     conversation_text: str,
-    stages: List[Dict],
+    playbook: "CompiledPlaybook",
     elapsed_seconds: int,
 ) -> Tuple[str, float]:
     """Use LLM to detect stage. Returns ``(stage_id, confidence)``."""
-    stage_descs = []
-    for i, s in enumerate(stages):
-        items_text = "\n".join(
-            f"- {it['content']}" for it in s.get("items", [])[:3]
-        )
-        extra = len(s.get("items", [])) - 3
-        if extra > 0:
-            items_text += f"\n- ...and {extra} more"
-        t0 = s["startOffsetSeconds"] // 60
-        t1 = (s["startOffsetSeconds"] + s["durationSeconds"]) // 60
-        stage_descs.append(
-            f"{i + 1}. **{s['name']}** (recommended: {t0}-{t1} min)\n   {items_text}"
-        )
-
     prompt = f"""Analyzing a sales call in Bahasa Indonesia to determine current stage.
 
 Elapsed: {elapsed_seconds // 60}m {elapsed_seconds % 60}s (reference only)
@@ -77,7 +82,7 @@ Recent conversation:
 {conversation_text}
 
 Stages:
-{chr(10).join(stage_descs)}
+{playbook.stages_prompt}
 
 Based on CONTENT (not just time), which stage? Be confident, avoid jitter.
 
@@ -85,7 +90,9 @@ Return JSON: {{"stage_id": "...", "confidence": 0.0-1.0, "reasoning": "..."}}
 """
 
     llm = get_llm_client()
-    raw = llm.call(prompt, temperature=0.2, max_tokens=200)
+    raw = await llm.call(
+        prompt, temperature=0.2, max_tokens=200, timeout=llm.realtime_timeout,
+    )
     result = json.loads(raw)
     if "error" in result:
         raise RuntimeError(result.get("details", "API error"))
@@ -93,32 +100,29 @@ Return JSON: {{"stage_id": "...", "confidence": 0.0-1.0, "reasoning": "..."}}
     stage_id = result.get("stage_id", "")
     confidence = result.get("confidence", 0.0)
 
-    valid_ids = {s["id"] for s in stages}
-    if stage_id not in valid_ids:
-        return stages[0]["id"], 0.5
+    if stage_id not in playbook.stage_by_id:
+        return playbook.first_stage_id, 0.5
 
     return stage_id, confidence
 
 
-def _time_based_fallback(stages: List[Dict], elapsed_seconds: int) -> str:
-    for stage in reversed(stages):
-        if elapsed_seconds >= stage["startOffsetSeconds"]:
-            return stage["id"]
-    return stages[0]["id"] if stages else ""
+def _time_based_fallback(playbook: "CompiledPlaybook", elapsed_seconds: int) -> str:
+    for stage in reversed(playbook.stages):
+        if elapsed_seconds >= stage.start:
+            return stage.id
+    return playbook.first_stage_id
 
 
 def get_stage_timing_status(
-    stage_id: str,
+    stage: Optional["CompiledStage"],
     elapsed_seconds: int,
-    stages: List[Dict],
 ) -> Dict[str, str]:
     """Return ``{"status": ..., "message": ...}`` for timing display."""
-    stage = next((s for s in stages if s["id"] == stage_id), None)
     if not stage:
         return {"status": "unknown", "message": "Stage not found"}
 
-    start = stage["startOffsetSeconds"]
-    end = start + stage["durationSeconds"]
+    start = stage.start
+    end = stage.end
 
     if elapsed_seconds < start:
         return {"status": "not_started", "message": f"Starts in {(start - elapsed_seconds) // 60} min"}
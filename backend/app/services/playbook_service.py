@@ -0,0 +1,199 @@
+"""
+Compiled playbooks for live calls.
+
+Every analysis tick used to re-derive the same data from the raw
+``call_structure`` dicts: lowercased keyword lists, stage description
+blocks for the stage prompt, type-specific prompt sections, and item /
+stage lookups through linear scans. :func:`compile_playbook` does that
+work once and returns a :class:`CompiledPlaybook` with id indexes,
+precompiled keyword matchers (per-item regexes plus one Aho-Corasick
+automaton over all keywords, see ``keyword_automaton.py``) and prompt
+fragments.
+
+Compiled playbooks are cached per playbook version (and once for the
+default structure) and shared by every session on that version, so
+they must be treated as read-only.
+"""
+
+import logging
+import re
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Pattern, Sequence, Tuple
+
+from app.services.keyword_automaton import KeywordAutomaton, KeywordTracker
+from app.services.llm.checklist_analyzer import compile_item_prompts
+from app.services.llm.stage_detector import compile_stage_prompt
+from app.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEY = "default"
+
+
+def _keyword_pattern(keywords: Sequence[str]) -> Optional[Pattern]:
+    """Case-insensitive substring matcher for any of ``keywords``."""
+    if not keywords:
+        return None
+    # Longest first so the alternation reports the longest keyword at a position
+    ordered = sorted(keywords, key=len, reverse=True)
+    return re.compile("|".join(re.escape(k) for k in ordered), re.IGNORECASE)
+
+
+class CompiledItem:
+    """Checklist item with its keyword matchers and prompt fragments."""
+
+    def __init__(self, item: Dict, stage_id: str):
+        self.id: str = str(item["id"])
+        self.stage_id = stage_id
+        self.type: str = item.get("type", "discuss")
+        self.content: str = item["content"]
+        self.extended_description: str = item.get("extended_description", "")
+
+        keywords = item.get("semantic_keywords") or {}
+        self.required: Tuple[str, ...] = tuple(k for k in keywords.get("required", []) if k)
+        self.forbidden: Tuple[str, ...] = tuple(k for k in keywords.get("forbidden", []) if k)
+        self.has_keywords = bool(keywords)
+        self._required_re = _keyword_pattern(self.required)
+        self._forbidden_re = _keyword_pattern(self.forbidden)
+        # Pattern ids in the playbook's automaton, set by CompiledPlaybook
+        self.required_ids: Tuple[int, ...] = ()
+        self.forbidden_ids: Tuple[int, ...] = ()
+
+        prompts = compile_item_prompts(item)
+        self.check_prompt_head: str = prompts["check_prompt_head"]
+        self.check_prompt_tail: str = prompts["check_prompt_tail"]
+        self.batch_line: str = prompts["batch_line"]
+        self.validation_type_check: str = prompts["validation_type_check"]
+        self.allows_introduction: bool = prompts["allows_introduction"]
+
+    def prefilter(self, text: str) -> Tuple[bool, Dict]:
+        """
+        Keyword pre-filter: at least one required keyword present and no
+        forbidden one (case-insensitive substring match).
+        """
+        debug: Dict = {
+            "required": list(self.required),
+            "forbidden": list(self.forbidden),
+            "found_required": [],
+            "found_forbidden": [],
+        }
+        if self._required_re is not None and not self._required_re.search(text):
+            return False, debug
+        if self._forbidden_re is not None and self._forbidden_re.search(text):
+            # Rejection path only: list what matched for the debug info
+            text_lower = text.lower()
+            debug["found_required"] = [kw for kw in self.required if kw.lower() in text_lower]
+            debug["found_forbidden"] = [kw for kw in self.forbidden if kw.lower() in text_lower]
+            return False, debug
+        return True, debug
+
+    def prefilter_tracked(self, tracker: KeywordTracker, window: int) -> Tuple[bool, Dict]:
+        """
+        :meth:`prefilter` over the last ``window`` characters fed to
+        ``tracker``, answered from its running hits without rescanning.
+        """
+        debug: Dict = {
+            "required": list(self.required),
+            "forbidden": list(self.forbidden),
+            "found_required": [],
+            "found_forbidden": [],
+        }
+        if self.required_ids and not any(
+            tracker.seen_within(pid, window) for pid in self.required_ids
+        ):
+            return False, debug
+        if any(tracker.seen_within(pid, window) for pid in self.forbidden_ids):
+            debug["found_required"] = [
+                kw for kw, pid in zip(self.required, self.required_ids)
+                if tracker.seen_within(pid, window)
+            ]
+            debug["found_forbidden"] = [
+                kw for kw, pid in zip(self.forbidden, self.forbidden_ids)
+                if tracker.seen_within(pid, window)
+            ]
+            return False, debug
+        return True, debug
+
+
+class CompiledStage:
+    """Stage timing, items and its block of the stage-detection prompt."""
+
+    def __init__(self, index: int, stage: Dict):
+        self.index = index
+        self.id: str = stage["id"]
+        self.name: str = stage["name"]
+        self.start: int = stage["startOffsetSeconds"]
+        self.duration: int = stage["durationSeconds"]
+        self.end = self.start + self.duration
+        self.items: Tuple[CompiledItem, ...] = tuple(
+            CompiledItem(item, self.id) for item in stage.get("items", [])
+        )
+        self.prompt: str = compile_stage_prompt(index, stage)
+
+
+class CompiledPlaybook:
+    """Immutable, indexed form of a ``call_structure``."""
+
+    def __init__(self, call_structure: List[Dict]):
+        self.source = call_structure
+        self.stages: Tuple[CompiledStage, ...] = tuple(
+            CompiledStage(i, stage) for i, stage in enumerate(call_structure)
+        )
+        self.items: Tuple[CompiledItem, ...] = tuple(
+            item for stage in self.stages for item in stage.items
+        )
+        self.stage_by_id: Mapping[str, CompiledStage] = MappingProxyType(
+            {stage.id: stage for stage in self.stages}
+        )
+        self.item_by_id: Mapping[str, CompiledItem] = MappingProxyType(
+            {item.id: item for item in self.items}
+        )
+        self.keywords = KeywordAutomaton([
+            kw for item in self.items for kw in item.required + item.forbidden
+        ])
+        for item in self.items:
+            item.required_ids = tuple(self.keywords.ids[kw.lower()] for kw in item.required)
+            item.forbidden_ids = tuple(self.keywords.ids[kw.lower()] for kw in item.forbidden)
+        # Inverted index: keyword id -> items it is a required keyword of
+        by_keyword: List[List[CompiledItem]] = [[] for _ in range(len(self.keywords))]
+        for item in self.items:
+            for pid in set(item.required_ids):
+                by_keyword[pid].append(item)
+        self.items_by_keyword: Tuple[Tuple[CompiledItem, ...], ...] = tuple(
+            tuple(items) for items in by_keyword
+        )
+        self.first_stage_id: str = self.stages[0].id if self.stages else ""
+        self.stages_prompt: str = "\n".join(stage.prompt for stage in self.stages)
+
+    def __len__(self) -> int:
+        return len(self.stages)
+
+
+def compile_playbook(call_structure: List[Dict]) -> CompiledPlaybook:
+    return CompiledPlaybook(call_structure or [])
+
+
+_compiled = TTLCache(maxsize=256, ttl=None)
+
+
+def get_compiled_playbook(
+    call_structure: List[Dict],
+    version_id: Optional[str] = None,
+) -> CompiledPlaybook:
+    """
+    Compiled form of ``call_structure`` for playbook ``version_id``
+    (``None`` = the default structure), compiled once and reused.
+
+    A cached entry is only reused for the same ``call_structure``
+    object, so a draft re-fetched with new content is recompiled.
+    """
+    key = version_id or DEFAULT_KEY
+    compiled = _compiled.get(key)
+    if compiled is None or compiled.source is not call_structure:
+        compiled = compile_playbook(call_structure)
+        _compiled.set(key, compiled)
+        logger.info(
+            "Compiled playbook %s (%d stages, %d items, %d keywords)",
+            key, len(compiled.stages), len(compiled.items), len(compiled.keywords),
+        )
+    return compiled
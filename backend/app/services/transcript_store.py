@@ -0,0 +1,134 @@
+"""
+Live transcript store.
+
+Keeps the rolling transcript of a call as timestamped segments with
+running character and word offsets, so tail windows, word-count
+trimming and "text since offset" lookups only touch the segments they
+return instead of re-tokenizing the whole transcript every tick.
+
+The logical text is every segment prefixed by a single space
+(``" seg1 seg2 ..."``), matching the string the ingest loop used to
+build by concatenation. Offsets are absolute: they keep counting from
+the start of the call even after old segments are trimmed.
+"""
+
+from collections import deque
+from typing import Deque, List, TypedDict
+
+
+class StoredSegment(TypedDict):
+    """Transcript segment with call-relative timing and running offsets."""
+    text: str
+    start: float
+    end: float
+    speaker: str
+    char_offset: int  # absolute offset of the leading separator
+    word_offset: int  # absolute index of the segment's first word
+    word_count: int
+
+
+class TranscriptStore:
+    """Rolling transcript of timestamped segments."""
+
+    def __init__(self, max_words: int = 1000):
+        self.max_words = max_words
+        self._segments: Deque[StoredSegment] = deque()
+        self._start_char = 0
+        self._end_char = 0
+        self._start_word = 0
+        self._end_word = 0
+
+    # -- writing -------------------------------------------------------------
+
+    def append(
+        self,
+        text: str,
+        start: float = 0.0,
+        end: float = 0.0,
+        speaker: str = "",
+    ) -> StoredSegment:
+        """Append one segment and trim to ``max_words``."""
+        text = text.strip()
+        word_count = len(text.split())
+        segment = StoredSegment(
+            text=text,
+            start=start,
+            end=end,
+            speaker=speaker,
+            char_offset=self._end_char,
+            word_offset=self._end_word,
+            word_count=word_count,
+        )
+        self._segments.append(segment)
+        self._end_char += len(text) + 1
+        self._end_word += word_count
+        self._trim()
+        return segment
+
+    def extend(self, segments: List[dict], offset_seconds: float = 0.0):
+        """Append transcription segments, shifting their timing by ``offset_seconds``."""
+        for s in segments:
+            if not s.get("text", "").strip():
+                continue
+            self.append(
+                s["text"],
+                start=offset_seconds + s.get("start", 0.0),
+                end=offset_seconds + s.get("end", 0.0),
+                speaker=s.get("speaker", ""),
+            )
+
+    def _trim(self):
+        # Whole segments only: keeps at most one segment beyond max_words.
+        while (
+            len(self._segments) > 1
+            and self.word_count - self._segments[0]["word_count"] >= self.max_words
+        ):
+            dropped = self._segments.popleft()
+            self._start_char += len(dropped["text"]) + 1
+            self._start_word += dropped["word_count"]
+
+    # -- reading -------------------------------------------------------------
+
+    @property
+    def end_offset(self) -> int:
+        """Absolute character offset just past the newest text."""
+        return self._end_char
+
+    @property
+    def word_count(self) -> int:
+        return self._end_word - self._start_word
+
+    def __len__(self) -> int:
+        return self._end_char - self._start_char
+
+    @property
+    def text(self) -> str:
+        """Full retained transcript (O(n); prefer :meth:`tail`)."""
+        return "".join(" " + s["text"] for s in self._segments)
+
+    def tail(self, chars: int) -> str:
+        """Last ``chars`` characters of the transcript."""
+        pieces: List[str] = []
+        size = 0
+        for s in reversed(self._segments):
+            pieces.append(" " + s["text"])
+            size += len(s["text"]) + 1
+            if size >= chars:
+                break
+        return "".join(reversed(pieces))[-chars:] if chars > 0 else ""
+
+    def text_since(self, offset: int) -> str:
+        """Text appended after absolute character ``offset``."""
+        if offset >= self._end_char:
+            return ""
+        return self.tail(self._end_char - max(offset, self._start_char))
+
+    def segments_since(self, offset: int) -> List[StoredSegment]:
+        """Segments that start at or after absolute character ``offset``."""
+        out: List[StoredSegment] = []
+        for s in reversed(self._segments):
+            if s["char_offset"] < offset:
+                break
+            out.append(s)
+        out.reverse()
+        return out
@@ -17,11 +17,15 @@ Usage:
 from app.services.transcription.router import (
     transcribe_audio_buffer,
     get_provider_info,
+    warm_up_providers,
+    close_providers,
     TranscriptionProvider,
 )
 
 __all__ = [
     "transcribe_audio_buffer",
     "get_provider_info",
+    "warm_up_providers",
+    "close_providers",
     "TranscriptionProvider",
 ]
@@ -2,16 +2,55 @@
 Base class and shared types for transcription providers.
 """
 
+import asyncio
+import io
 import logging
 import os
 import subprocess
 import tempfile
 import wave
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, TypedDict
+from typing import Dict, List, Optional, Tuple, TypedDict
+
+import httpx
+
+from app.services.audio.buffer import pcm_to_wav
+
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+try:
+    import av
+except ImportError:  # optional; without it FLAC / Opus need ffmpeg
+    av = None
 
 logger = logging.getLogger(__name__)
 
+# Upload codecs: name -> (MIME type, ffmpeg encoder args; None = in-process WAV)
+UPLOAD_CODECS: Dict[str, Tuple[str, Optional[List[str]]]] = {
+    "wav": ("audio/wav", None),
+    "flac": ("audio/flac", ["-c:a", "flac", "-compression_level", "5", "-f", "flac"]),
+    "ogg": ("audio/ogg", ["-c:a", "libopus", "-b:a", "24k", "-application", "voip", "-f", "ogg"]),
+}
+
+# Same encoders in process via PyAV: name -> (container, encoder, options, bit rate)
+_PYAV_ENCODERS: Dict[str, Tuple[str, str, Dict[str, str], Optional[int]]] = {
+    "flac": ("flac", "flac", {"compression_level": "5"}, None),
+    "ogg": ("ogg", "libopus", {"application": "voip"}, 24_000),
+}
+
+
+class TranscriptionError(Exception):
+    """
+    Provider request failed (transport error, non-2xx, malformed response).
+
+    Raised instead of returning ``[]`` so the router can tell a failing
+    provider from silence and fail over.
+    """
+
 
 class TranscriptSegment(TypedDict):
     """Single transcription segment with timing."""
@@ -35,6 +74,74 @@ class TranscriptionProvider(ABC):
 
     name: str = "base"
     supports_diarization: bool = False
+    http_timeout: float = 60.0
+    # Upload codecs the provider's API accepts, most preferred first
+    upload_formats: Tuple[str, ...] = ("wav",)
+    upload_codec: Optional[str] = None  # per-instance override of the setting
+    _http: Optional[httpx.AsyncClient] = None
+
+    def _get_http(self) -> httpx.AsyncClient:
+        """
+        Provider-owned pooled HTTP client, created lazily inside the loop.
+
+        Keep-alive connections are reused across ticks, so a live call
+        pays the TCP+TLS handshake once rather than every window.
+        """
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                http2=_HTTP2,
+                timeout=httpx.Timeout(self.http_timeout, connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=50,
+                    max_keepalive_connections=10,
+                    keepalive_expiry=60.0,
+                ),
+            )
+        return self._http
+
+    def negotiate_codec(self) -> str:
+        """
+        Upload codec for this provider.
+
+        ``transcription_upload_codec`` is used if the provider accepts
+        it, otherwise WAV. "auto" picks the provider's first choice that
+        can be encoded in process, so live ticks never spawn ffmpeg.
+        """
+        preferred = self.upload_codec
+        if not preferred:
+            from app.config import get_settings
+            preferred = get_settings().transcription_upload_codec
+        preferred = preferred.lower()
+        if preferred == "auto":
+            return next(
+                (c for c in self.upload_formats if encodes_in_process(c)), "wav",
+            )
+        return preferred if preferred in self.upload_formats else "wav"
+
+    async def encode_upload(self, pcm: bytes) -> Tuple[bytes, str, str]:
+        """``(payload, codec, mime)`` for 16 kHz PCM, in the negotiated codec."""
+        codec = self.negotiate_codec()
+        data, codec = await asyncio.to_thread(encode_pcm, pcm, codec)
+        return data, codec, UPLOAD_CODECS[codec][0]
+
+    def warmup_url(self) -> Optional[str]:
+        """URL to touch at startup to pre-open a pooled connection."""
+        return None
+
+    async def warm_up(self):
+        url = self.warmup_url()
+        if not url:
+            return
+        try:
+            await self._get_http().head(url, timeout=5.0)
+            logger.info("Transcription provider '%s' warmed up", self.name)
+        except Exception as e:
+            logger.warning("Warm-up of '%s' failed: %s", self.name, e)
+
+    async def aclose(self):
+        if self._http is not None and not self._http.is_closed:
+            await self._http.aclose()
+        self._http = None
 
     @abstractmethod
     async def transcribe(
@@ -51,6 +158,9 @@ class TranscriptionProvider(ABC):
 
         Returns:
             List of transcript segments with timing
+
+        Raises:
+            TranscriptionError: if the provider request failed
         """
         ...
 
@@ -80,6 +190,10 @@ class TranscriptionProvider(ABC):
         """Check if this provider has required credentials/dependencies."""
         return True
 
+    def model_id(self) -> str:
+        """Model/deployment identity; part of the transcript cache key."""
+        return ""
+
     def get_info(self) -> dict:
         """Return provider metadata for debugging."""
         return {
@@ -94,6 +208,116 @@ class TranscriptionProvider(ABC):
 # ---------------------------------------------------------------------------
 
 
+def _is_target_wav(audio_bytes: bytes) -> bool:
+    if audio_bytes[:4] != b"RIFF":
+        return False
+    try:
+        with wave.open(io.BytesIO(audio_bytes), "rb") as wf:
+            return (wf.getframerate(), wf.getnchannels(), wf.getsampwidth()) == (16000, 1, 2)
+    except (wave.Error, EOFError):
+        return False
+
+
+def decode_to_pcm(audio_bytes: bytes) -> bytes:
+    """
+    Decode audio bytes to 16 kHz mono s16le PCM without temp files.
+
+    16 kHz mono 16-bit WAV is unpacked in process; anything else is piped
+    through ffmpeg stdin/stdout. Inputs ffmpeg cannot read from a pipe
+    (e.g. MP4 with the index at the end) fall back to the file-based
+    :func:`ensure_wav`. Blocking — call via ``asyncio.to_thread``.
+    """
+    if _is_target_wav(audio_bytes):
+        with wave.open(io.BytesIO(audio_bytes), "rb") as wf:
+            return wf.readframes(wf.getnframes())
+
+    cmd = [
+        "ffmpeg",
+        "-loglevel", "error",
+        "-err_detect", "ignore_err",
+        "-fflags", "+genpts+igndts",
+        "-i", "pipe:0",
+        "-f", "s16le", "-ar", "16000", "-ac", "1",
+        "pipe:1",
+    ]
+    try:
+        proc = subprocess.run(cmd, input=audio_bytes, capture_output=True, check=True)
+        if proc.stdout:
+            return proc.stdout
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.debug("In-memory decode failed (%s), using temp file", e)
+
+    wav_path = ensure_wav(audio_bytes)
+    try:
+        with wave.open(wav_path, "rb") as wf:
+            return wf.readframes(wf.getnframes())
+    finally:
+        safe_remove(wav_path)
+
+
+def encodes_in_process(codec: str) -> bool:
+    """True if :func:`encode_pcm` can produce ``codec`` without ffmpeg."""
+    return codec == "wav" or (av is not None and codec in _PYAV_ENCODERS)
+
+
+def _encode_pyav(pcm: bytes, codec: str) -> bytes:
+    container_format, encoder, options, bit_rate = _PYAV_ENCODERS[codec]
+    out = io.BytesIO()
+    with av.open(out, mode="w", format=container_format) as container:
+        stream = container.add_stream(encoder, rate=16000, layout="mono")
+        stream.options = options
+        if bit_rate:
+            stream.bit_rate = bit_rate
+        frame = av.AudioFrame(format="s16", layout="mono", samples=len(pcm) // 2)
+        frame.sample_rate = 16000
+        frame.planes[0].update(pcm[: len(pcm) // 2 * 2])
+        for packet in stream.encode(frame):
+            container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+    return out.getvalue()
+
+
+def encode_pcm(pcm: bytes, codec: str = "wav") -> Tuple[bytes, str]:
+    """
+    Encode 16 kHz mono PCM for upload. Returns ``(data, codec)``.
+
+    Uses PyAV when installed and pipes through ffmpeg otherwise; falls
+    back to WAV if the codec is unknown or encoding fails.
+    """
+    if codec in _PYAV_ENCODERS and av is not None and pcm:
+        try:
+            return _encode_pyav(pcm, codec), codec
+        except Exception as e:
+            logger.warning("Encoding upload as %s failed (%s), sending WAV", codec, e)
+            return pcm_to_wav(pcm), "wav"
+
+    args = UPLOAD_CODECS.get(codec, ("", None))[1]
+    if args:
+        cmd = [
+            "ffmpeg",
+            "-loglevel", "error",
+            "-f", "s16le", "-ar", "16000", "-ac", "1",
+            "-i", "pipe:0",
+            *args,
+            "pipe:1",
+        ]
+        try:
+            proc = subprocess.run(cmd, input=pcm, capture_output=True, check=True)
+            if proc.stdout:
+                return proc.stdout, codec
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.warning("Encoding upload as %s failed (%s), sending WAV", codec, e)
+    return pcm_to_wav(pcm), "wav"
+
+
+def ensure_wav_bytes(audio_bytes: bytes) -> bytes:
+    """In-memory counterpart of :func:`ensure_wav`: 16 kHz mono WAV bytes."""
+    if _is_target_wav(audio_bytes):
+        return audio_bytes
+    return pcm_to_wav(decode_to_pcm(audio_bytes))
+
+
 def ensure_wav(audio_bytes: bytes) -> Optional[str]:
     """Convert audio bytes to a WAV file, handling various input formats."""
     if audio_bytes[:4] == b"\x1aE\xdf\xa3":  # WebM
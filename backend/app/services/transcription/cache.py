@@ -0,0 +1,164 @@
+"""
+Content-addressed cache of transcription results.
+
+Re-running an upload, re-processing the same YouTube video or retrying
+after a failed analysis sends byte-identical audio through transcription
+again. Results are stored on local disk under
+``sha256(audio) + language + provider + model``, so a new model or a
+different provider never serves a stale transcript.
+
+The cache is size-bounded: entries are evicted least-recently-used
+(file mtime, refreshed on every hit) once the directory exceeds
+``max_bytes``. Writes go to a temp file and are renamed into place, so
+concurrent processes sharing the directory never read a partial entry.
+
+The directory is the source of truth, not per-process state: lookups
+read the entry file directly, so an entry written by another worker is
+a hit, and every store re-scans the directory before evicting, so the
+bound holds for everything the workers wrote together.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def audio_digest(audio_bytes: bytes) -> str:
+    return hashlib.sha256(audio_bytes).hexdigest()
+
+
+class TranscriptCache:
+    """Disk-backed LRU of transcription segment lists."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: Optional[int] = None  # as of the last scan
+        self._size = 0
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "errors": 0,
+        }
+
+    @staticmethod
+    def make_key(digest: str, language: str, provider: str, model: str) -> str:
+        identity = f"{digest}|{language}|{provider}|{model}"
+        return hashlib.sha256(identity.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _scan(self) -> List[Tuple[float, str, int]]:
+        """``(mtime, path, size)`` of every entry on disk, oldest first."""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for fname in files:
+                if not fname.endswith(".json"):
+                    continue
+                path = os.path.join(root, fname)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue  # evicted by another process meanwhile
+                entries.append((st.st_mtime, path, st.st_size))
+        entries.sort()
+        return entries
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Cached segments for ``key`` or None. Blocking; call via a thread."""
+        path = self._path(key)
+        with self._lock:
+            try:
+                with open(path, "rb") as f:
+                    segments = json.loads(f.read())
+                os.utime(path)
+            except FileNotFoundError:
+                self.stats["misses"] += 1
+                return None
+            except (OSError, ValueError) as e:
+                logger.warning("Dropping unreadable transcript cache entry %s: %s", key[:12], e)
+                self.stats["errors"] += 1
+                self.stats["misses"] += 1
+                self._remove(path)
+                return None
+            self.stats["hits"] += 1
+            return segments
+
+    def put(self, key: str, segments: List[Dict]):
+        """Store ``segments`` and evict old entries. Blocking; call via a thread."""
+        data = json.dumps(segments, ensure_ascii=False).encode()
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            path = self._path(key)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except OSError as e:
+                logger.warning("Could not write transcript cache entry: %s", e)
+                self.stats["errors"] += 1
+                return
+            self.stats["stores"] += 1
+
+            entries = self._scan()
+            size = sum(entry_size for _, _, entry_size in entries)
+            evict = 0
+            # The new entry has the newest mtime and fits, so it is never evicted
+            while size > self.max_bytes and evict < len(entries):
+                _, old_path, old_size = entries[evict]
+                self._remove(old_path)
+                size -= old_size
+                evict += 1
+            self.stats["evictions"] += evict
+            self._entries = len(entries) - evict
+            self._size = size
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def info(self) -> Dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "directory": self.directory,
+            "entries": self._entries,
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+        }
+
+
+_cache: Optional[TranscriptCache] = None
+
+
+def get_transcript_cache() -> Optional[TranscriptCache]:
+    """Process-wide cache, or None when ``transcription_cache_mb`` is 0."""
+    global _cache
+    if _cache is None:
+        from app.config import get_settings
+
+        settings = get_settings()
+        if settings.transcription_cache_mb <= 0:
+            return None
+        directory = settings.transcription_cache_dir or os.path.join(
+            tempfile.gettempdir(), "sbf_transcripts",
+        )
+        _cache = TranscriptCache(directory, settings.transcription_cache_mb * 1024 * 1024)
+    return _cache
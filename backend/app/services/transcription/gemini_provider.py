@@ -5,12 +5,9 @@ Primary provider — always available if OPENROUTER_API_KEY is set.
 Cheap and fast, but no native diarization.
 """
 
+import asyncio
 import base64
 import logging
-import math
-import os
-import wave
-import tempfile
 from typing import List
 
 import httpx
@@ -18,16 +15,18 @@ import httpx
 from app.config import get_settings
 from app.services.transcription.base import (
     TranscriptionProvider,
+    TranscriptionError,
     TranscriptSegment,
-    ensure_wav,
-    safe_remove,
+    decode_to_pcm,
 )
+from app.services.audio.chunking import split_on_silence, stitch_segments
 
 logger = logging.getLogger(__name__)
 
 OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
 GEMINI_TRANSCRIPTION_MODEL = "google/gemini-2.5-flash-lite"
-MAX_CHUNK_BYTES = 15 * 1024 * 1024  # ~15MB raw → ~20MB base64
+MAX_CHUNK_BYTES = 15 * 1024 * 1024  # PCM per request (~8 min); keeps each transcript under max_tokens
+CHUNK_ATTEMPTS = 3  # tries per chunk of a long upload before the whole file fails
 
 
 class GeminiTranscriptionProvider(TranscriptionProvider):
@@ -35,6 +34,8 @@ class GeminiTranscriptionProvider(TranscriptionProvider):
 
     name = "gemini"
     supports_diarization = False
+    http_timeout = 300.0
+    upload_formats = ("flac", "ogg", "wav")
 
     def is_available(self) -> bool:
         try:
@@ -43,14 +44,21 @@ class GeminiTranscriptionProvider(TranscriptionProvider):
         except Exception:
             return False
 
+    def model_id(self) -> str:
+        return GEMINI_TRANSCRIPTION_MODEL
+
     def get_info(self) -> dict:
         return {
             **super().get_info(),
             "model": GEMINI_TRANSCRIPTION_MODEL,
             "endpoint": OPENROUTER_URL,
             "max_chunk_bytes": MAX_CHUNK_BYTES,
+            "upload_codec": self.negotiate_codec(),
         }
 
+    def warmup_url(self):
+        return OPENROUTER_URL
+
     async def transcribe(
         self,
         audio_bytes: bytes,
@@ -58,33 +66,28 @@ class GeminiTranscriptionProvider(TranscriptionProvider):
     ) -> List[TranscriptSegment]:
         settings = get_settings()
         api_key = settings.openrouter_api_key
-        wav_path = None
 
         try:
-            wav_path = ensure_wav(audio_bytes)
-            if not wav_path or not os.path.exists(wav_path):
+            pcm = await asyncio.to_thread(decode_to_pcm, audio_bytes)
+            if len(pcm) < 4000:
                 return []
-            if os.path.getsize(wav_path) < 4000:
-                return []
-
-            file_size = os.path.getsize(wav_path)
-            logger.info("Gemini transcription: file size %.1f MB", file_size / 1024 / 1024)
 
-            if file_size > MAX_CHUNK_BYTES:
-                return await self._transcribe_chunked(wav_path, language, api_key)
+            logger.info("Gemini transcription: audio size %.1f MB", len(pcm) / 1024 / 1024)
 
-            with open(wav_path, "rb") as f:
-                audio_data = f.read()
-            audio_b64 = base64.b64encode(audio_data).decode("utf-8")
+            if len(pcm) > MAX_CHUNK_BYTES:
+                return await self._transcribe_chunked(pcm, language, api_key)
 
-            return await self._call_gemini(audio_b64, language, api_key)
+            data, codec, _ = await self.encode_upload(pcm)
+            audio_b64 = base64.b64encode(data).decode("utf-8")
+            return await self._call_gemini(audio_b64, language, api_key, audio_format=codec)
 
+        except TranscriptionError:
+            raise
+        except httpx.HTTPError as e:
+            raise TranscriptionError(f"Gemini request failed: {e!r}") from e
         except Exception:
             logger.exception("Gemini transcription error")
             return []
-        finally:
-            if wav_path:
-                safe_remove(wav_path)
 
     async def _call_gemini(
         self,
@@ -92,6 +95,8 @@ class GeminiTranscriptionProvider(TranscriptionProvider):
         language: str,
         api_key: str,
         chunk_index: int = 0,
+        offset_seconds: float = 0.0,
+        audio_format: str = "wav",
     ) -> List[TranscriptSegment]:
         lang_names = {
             "id": "Bahasa Indonesia",
@@ -124,7 +129,7 @@ class GeminiTranscriptionProvider(TranscriptionProvider):
                             "type": "input_audio",
                             "input_audio": {
                                 "data": audio_b64,
-                                "format": "wav",
+                                "format": audio_format,
                             },
                         },
                     ],
@@ -139,20 +144,20 @@ class GeminiTranscriptionProvider(TranscriptionProvider):
             "Content-Type": "application/json",
         }
 
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            resp = await client.post(OPENROUTER_URL, headers=headers, json=payload)
-
-            if resp.status_code != 200:
-                logger.error(
-                    "Gemini transcription error %s: %s",
-                    resp.status_code,
-                    resp.text[:300],
-                )
-                return []
+        resp = await self._get_http().post(OPENROUTER_URL, headers=headers, json=payload)
 
-            data = resp.json()
+        if resp.status_code != 200:
+            logger.error(
+                "Gemini transcription error %s: %s",
+                resp.status_code,
+                resp.text[:300],
+            )
+            raise TranscriptionError(f"Gemini returned HTTP {resp.status_code}")
 
-        text = data["choices"][0]["message"]["content"].strip()
+        try:
+            text = resp.json()["choices"][0]["message"]["content"].strip()
+        except (KeyError, IndexError, TypeError, ValueError, AttributeError) as e:
+            raise TranscriptionError("Malformed Gemini response") from e
 
         segments = []
         for i, line in enumerate(text.split("\n")):
@@ -160,8 +165,8 @@ class GeminiTranscriptionProvider(TranscriptionProvider):
             if line:
                 segments.append(
                     TranscriptSegment(
-                        start=float(i * 5 + chunk_index * 300),
-                        end=float(i * 5 + 5 + chunk_index * 300),
+                        start=float(i * 5 + offset_seconds),
+                        end=float(i * 5 + 5 + offset_seconds),
                         text=line,
                         speaker="",
                     )
@@ -177,44 +182,51 @@ class GeminiTranscriptionProvider(TranscriptionProvider):
 
     async def _transcribe_chunked(
         self,
-        wav_path: str,
+        pcm: bytes,
         language: str,
         api_key: str,
     ) -> List[TranscriptSegment]:
-        file_size = os.path.getsize(wav_path)
-        num_chunks = math.ceil(file_size / MAX_CHUNK_BYTES)
-        logger.info("Splitting audio into %d chunks for Gemini", num_chunks)
-
-        all_segments: List[TranscriptSegment] = []
-
-        with open(wav_path, "rb") as f:
-            header = f.read(44)
-            remaining = file_size - 44
-            chunk_size = remaining // num_chunks
+        settings = get_settings()
+        chunks = await asyncio.to_thread(
+            split_on_silence,
+            pcm,
+            MAX_CHUNK_BYTES,
+            settings.transcription_chunk_overlap_seconds,
+        )
+        logger.info("Splitting audio into %d chunks for Gemini", len(chunks))
 
-            for i in range(num_chunks):
-                if i == num_chunks - 1:
-                    chunk_data = f.read()
-                else:
-                    chunk_data = f.read(chunk_size)
+        limiter = asyncio.Semaphore(max(1, settings.transcription_chunk_concurrency))
 
-                chunk_wav_path = tempfile.mktemp(suffix=".wav")
+        async def _one(i: int, offset: float, chunk: memoryview) -> List[TranscriptSegment]:
+            # A failed chunk is retried on its own; the chunks that already
+            # succeeded are kept
+            chunk_b64 = None
+            for attempt in range(1, CHUNK_ATTEMPTS + 1):
                 try:
-                    with wave.open(chunk_wav_path, "wb") as wf:
-                        wf.setnchannels(1)
-                        wf.setsampwidth(2)
-                        wf.setframerate(16000)
-                        wf.writeframes(chunk_data)
-
-                    with open(chunk_wav_path, "rb") as cf:
-                        chunk_audio = cf.read()
-
-                    chunk_b64 = base64.b64encode(chunk_audio).decode("utf-8")
-                    segments = await self._call_gemini(
-                        chunk_b64, language, api_key, chunk_index=i
+                    async with limiter:
+                        if chunk_b64 is None:
+                            data, codec, _ = await self.encode_upload(bytes(chunk))
+                            chunk_b64 = base64.b64encode(data).decode("utf-8")
+                        return await self._call_gemini(
+                            chunk_b64, language, api_key,
+                            chunk_index=i, offset_seconds=offset, audio_format=codec,
+                        )
+                except (TranscriptionError, httpx.HTTPError) as e:
+                    if attempt == CHUNK_ATTEMPTS:
+                        raise
+                    logger.warning(
+                        "Gemini chunk %d failed (attempt %d/%d): %r",
+                        i, attempt, CHUNK_ATTEMPTS, e,
                     )
-                    all_segments.extend(segments)
-                finally:
-                    safe_remove(chunk_wav_path)
+                await asyncio.sleep(attempt)
 
-        return all_segments
+        # Giving up on one chunk cancels the others still in flight
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [
+                    group.create_task(_one(i, offset, chunk))
+                    for i, (offset, chunk) in enumerate(chunks)
+                ]
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0]
+        return stitch_segments([task.result() for task in tasks])
@@ -5,6 +5,7 @@ Uses Whisper Large V3 via Groq's fast inference.
 Good quality, returns timestamps, but no native diarization.
 """
 
+import asyncio
 import logging
 import os
 from typing import List
@@ -12,15 +13,16 @@ from typing import List
 import httpx
 
 from app.services.transcription.base import (
+    TranscriptionError,
     TranscriptionProvider,
     TranscriptSegment,
-    ensure_wav,
-    safe_remove,
+    decode_to_pcm,
 )
 
 logger = logging.getLogger(__name__)
 
 GROQ_WHISPER_URL = "https://api.groq.com/openai/v1/audio/transcriptions"
+GROQ_WHISPER_MODEL = "whisper-large-v3"
 
 
 class GroqTranscriptionProvider(TranscriptionProvider):
@@ -28,47 +30,52 @@ class GroqTranscriptionProvider(TranscriptionProvider):
 
     name = "groq"
     supports_diarization = False
+    http_timeout = 30.0
+    upload_formats = ("flac", "ogg", "wav")
 
     def is_available(self) -> bool:
         return bool(os.environ.get("GROQ_API_KEY"))
 
+    def model_id(self) -> str:
+        return GROQ_WHISPER_MODEL
+
     def get_info(self) -> dict:
         return {
             **super().get_info(),
-            "model": "whisper-large-v3",
+            "model": GROQ_WHISPER_MODEL,
             "endpoint": GROQ_WHISPER_URL,
+            "upload_codec": self.negotiate_codec(),
         }
 
+    def warmup_url(self):
+        return GROQ_WHISPER_URL if self.is_available() else None
+
     async def transcribe(
         self,
         audio_bytes: bytes,
         language: str = "id",
     ) -> List[TranscriptSegment]:
         api_key = os.environ.get("GROQ_API_KEY", "")
-        wav_path = None
 
         try:
-            wav_path = ensure_wav(audio_bytes)
-            if not wav_path or not os.path.exists(wav_path):
+            pcm = await asyncio.to_thread(decode_to_pcm, audio_bytes)
+            if len(pcm) < 4000:
                 return []
-            if os.path.getsize(wav_path) < 4000:
-                return []
-
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                with open(wav_path, "rb") as audio_file:
-                    resp = await client.post(
-                        GROQ_WHISPER_URL,
-                        headers={"Authorization": f"Bearer {api_key}"},
-                        files={"file": ("audio.wav", audio_file, "audio/wav")},
-                        data={
-                            "model": "whisper-large-v3",
-                            "language": language,
-                            "response_format": "verbose_json",
-                            "timestamp_granularities[]": "segment",
-                        },
-                    )
-                    resp.raise_for_status()
-                    data = resp.json()
+            data, codec, mime = await self.encode_upload(pcm)
+
+            resp = await self._get_http().post(
+                GROQ_WHISPER_URL,
+                headers={"Authorization": f"Bearer {api_key}"},
+                files={"file": (f"audio.{codec}", data, mime)},
+                data={
+                    "model": GROQ_WHISPER_MODEL,
+                    "language": language,
+                    "response_format": "verbose_json",
+                    "timestamp_granularities[]": "segment",
+                },
+            )
+            resp.raise_for_status()
+            data = resp.json()
 
             segments = data.get("segments", [])
             return [
@@ -82,9 +89,9 @@ class GroqTranscriptionProvider(TranscriptionProvider):
                 if s.get("text", "").strip()
             ]
 
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            logger.error("Groq transcription error: %r", e)
+            raise TranscriptionError(f"Groq request failed: {e!r}") from e
         except Exception:
             logger.exception("Groq transcription error")
             return []
-        finally:
-            if wav_path:
-                safe_remove(wav_path)
@@ -0,0 +1,131 @@
+"""
+Per-provider health tracking for the transcription router.
+
+Each provider keeps a rolling window of request outcomes (success and
+latency) and a circuit breaker. Outcomes older than ``max_age_seconds``
+drop out of the window, so a provider that was demoted and stopped
+receiving traffic is tried again once its bad results have aged out.
+
+
+- ``closed``: requests flow normally.
+- ``open``: after ``failure_threshold`` consecutive failures the
+  provider is skipped for ``cooldown_seconds``.
+- ``half_open``: after the cooldown one probe request is let through;
+  success closes the breaker, failure re-opens it.
+"""
+
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ProviderHealth:
+    """Rolling success rate / latency stats plus a circuit breaker."""
+
+    def __init__(
+        self,
+        window: int = 50,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0,
+        max_age_seconds: float = 300.0,
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.max_age_seconds = max_age_seconds
+        # (ok, latency, recorded at)
+        self._results: Deque[Tuple[bool, float, float]] = deque(maxlen=window)
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self.total_requests = 0
+        self.total_failures = 0
+
+    # -- breaker -------------------------------------------------------------
+
+    def is_open(self) -> bool:
+        """True while requests should skip this provider (no side effects)."""
+        if self.state == OPEN:
+            return time.monotonic() - self.opened_at < self.cooldown_seconds
+        if self.state == HALF_OPEN:
+            return self._probe_in_flight
+        return False
+
+    def allow(self) -> bool:
+        """Claim permission to send a request (may start a half-open probe)."""
+        if self.state == CLOSED:
+            return True
+        if self.is_open():
+            return False
+        self.state = HALF_OPEN
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self, latency: float):
+        self._results.append((True, latency, time.monotonic()))
+        self.total_requests += 1
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self._probe_in_flight = False
+
+    def record_failure(self, latency: float):
+        self._results.append((False, latency, time.monotonic()))
+        self.total_requests += 1
+        self.total_failures += 1
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def release(self):
+        """Give back a claimed probe without an outcome (e.g. cancelled)."""
+        self._probe_in_flight = False
+
+    # -- stats ---------------------------------------------------------------
+
+    def _recent(self) -> Deque[Tuple[bool, float, float]]:
+        """The window with outcomes older than ``max_age_seconds`` dropped."""
+        cutoff = time.monotonic() - self.max_age_seconds
+        while self._results and self._results[0][2] < cutoff:
+            self._results.popleft()
+        return self._results
+
+    @property
+    def samples(self) -> int:
+        return len(self._recent())
+
+    @property
+    def success_rate(self) -> float:
+        results = self._recent()
+        if not results:
+            return 1.0
+        return sum(1 for ok, _, _ in results if ok) / len(results)
+
+    def latency_percentile(self, pct: float) -> Optional[float]:
+        """Latency percentile of successful requests in the window."""
+        latencies = sorted(lat for ok, lat, _ in self._recent() if ok)
+        if not latencies:
+            return None
+        idx = min(len(latencies) - 1, int(round(pct / 100 * (len(latencies) - 1))))
+        return latencies[idx]
+
+    @property
+    def p95_latency(self) -> Optional[float]:
+        return self.latency_percentile(95)
+
+    def stats(self) -> Dict:
+        p95 = self.p95_latency
+        return {
+            "state": self.state,
+            "success_rate": round(self.success_rate, 3),
+            "p95_latency_seconds": round(p95, 3) if p95 is not None else None,
+            "samples": self.samples,
+            "consecutive_failures": self.consecutive_failures,
+            "total_requests": self.total_requests,
+            "total_failures": self.total_failures,
+        }
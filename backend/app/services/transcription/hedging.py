@@ -0,0 +1,43 @@
+"""
+Request hedging for live transcription.
+
+If the primary provider has not answered by its latency-percentile
+deadline, the router sends the same window to a second provider and
+keeps whichever good result arrives first. Every hedge is a duplicate
+paid request, so each live call carries a :class:`HedgeBudget`.
+"""
+
+from typing import Dict
+
+
+class HedgeBudget:
+    """
+    Caps hedged requests of one call to ``fraction`` of its requests.
+
+    ``burst`` hedges are always allowed so the first slow ticks of a
+    call can be hedged before any history exists.
+    """
+
+    def __init__(self, fraction: float = 0.1, burst: int = 1):
+        self.fraction = fraction
+        self.burst = burst
+        self.requests = 0
+        self.hedges = 0
+        self.denied = 0
+
+    def record_request(self):
+        self.requests += 1
+
+    def try_spend(self) -> bool:
+        if self.hedges < self.burst + self.fraction * self.requests:
+            self.hedges += 1
+            return True
+        self.denied += 1
+        return False
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "denied": self.denied,
+        }
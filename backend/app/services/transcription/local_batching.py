@@ -0,0 +1,117 @@
+"""
+Cross-call batching for local Whisper inference.
+
+Live calls on the local provider each submit a window every few
+seconds. Instead of decoding them one by one, :class:`BatchScheduler`
+holds requests for ``window_ms`` (or until ``max_batch`` are waiting),
+then runs them as one batched pass. Requests are grouped by language
+because a batched pass decodes in a single language.
+
+A request that cannot be dispatched within ``max_wait_ms`` (all batch
+slots busy) fails with :class:`TranscriptionError` as soon as that
+deadline passes, so the router can fail over instead of letting the
+call fall further behind.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.services.transcription.base import TranscriptionError
+
+logger = logging.getLogger(__name__)
+
+RunBatch = Callable[[List[bytes], str], Awaitable[List[List[Dict]]]]
+
+
+class BatchScheduler:
+    """Gathers windows from concurrent calls into batched inference runs."""
+
+    def __init__(
+        self,
+        run_batch: RunBatch,
+        window_ms: int = 300,
+        max_batch: int = 8,
+        max_wait_ms: int = 2000,
+        concurrency: int = 1,
+    ):
+        self.run_batch = run_batch
+        self.window = window_ms / 1000
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000
+        self.concurrency = max(1, concurrency)
+        # language -> [(pcm, future, expiry timer)]
+        self._pending: Dict[str, List[Tuple[bytes, asyncio.Future, asyncio.TimerHandle]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.stats: Dict[str, float] = {
+            "requests": 0,
+            "batches": 0,
+            "expired": 0,
+            "largest_batch": 0,
+        }
+
+    async def submit(self, pcm: bytes, language: str) -> List[Dict]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        queue = self._pending.setdefault(language, [])
+        expiry = loop.call_later(self.max_wait, self._expire, future)
+        queue.append((pcm, future, expiry))
+        self.stats["requests"] += 1
+
+        if len(queue) >= self.max_batch:
+            self._flush(language)
+        elif language not in self._timers:
+            self._timers[language] = loop.call_later(self.window, self._flush, language)
+        return await future
+
+    def _expire(self, future: asyncio.Future):
+        """Fail a request still waiting for dispatch at its deadline."""
+        if not future.done():
+            self.stats["expired"] += 1
+            future.set_exception(TranscriptionError("Local batch queue wait exceeded"))
+
+    def _flush(self, language: str):
+        timer = self._timers.pop(language, None)
+        if timer:
+            timer.cancel()
+        batch = self._pending.pop(language, [])
+        if batch:
+            task = asyncio.create_task(self._run(language, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(
+        self,
+        language: str,
+        batch: List[Tuple[bytes, asyncio.Future, asyncio.TimerHandle]],
+    ):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+        if all(future.done() for _, future, _ in batch):
+            return
+
+        async with self._slots:
+            live = []
+            for pcm, future, expiry in batch:
+                if future.done():  # expired while waiting, or caller gave up
+                    continue
+                expiry.cancel()
+                live.append((pcm, future))
+            if not live:
+                return
+
+            self.stats["batches"] += 1
+            self.stats["largest_batch"] = max(self.stats["largest_batch"], len(live))
+            try:
+                results = await self.run_batch([pcm for pcm, _ in live], language)
+            except Exception as e:
+                for _, future in live:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            for (_, future), segments in zip(live, results):
+                if not future.done():
+                    future.set_result(segments)
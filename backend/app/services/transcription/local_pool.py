@@ -0,0 +1,314 @@
+"""
+Process pool for local faster-whisper inference.
+
+Whisper decoding is CPU-bound and holds the GIL for long stretches, so
+it runs in dedicated worker processes instead of the API server's
+event loop. Each worker loads the model once (pool initializer) and is
+recycled after ``max_tasks_per_child`` jobs to cap memory growth.
+
+PCM is handed to workers through ``multiprocessing.shared_memory``
+rather than pickled with the job. The parent owns and unlinks every
+block; workers only attach and read.
+
+Jobs beyond ``workers + max_queue`` are rejected so a backlog turns into
+router failover instead of unbounded latency. Queued jobs wait in front
+of the executor and are only submitted when a worker is free, so
+``job_timeout`` measures running time. A job that exceeds it fails its
+caller at once but keeps its worker for ``kill_grace`` more seconds; if
+it is still running then, new jobs go to a fresh pool and the old pool's
+processes are terminated once the other jobs running on it have ended.
+(A ``ProcessPoolExecutor`` breaks as a whole when one of its processes
+is killed, so the stuck worker cannot be recycled on its own.)
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.services.transcription.base import TranscriptionError
+
+logger = logging.getLogger(__name__)
+
+# -- worker side -------------------------------------------------------------
+
+_worker_model = None
+_worker_pipeline = None
+
+SAMPLE_RATE = 16_000
+MAX_CLIP_SAMPLES = 30 * SAMPLE_RATE  # Whisper's context window
+
+
+def _init_worker(model_size: str, device: str, compute_type: str):
+    global _worker_model
+    from faster_whisper import WhisperModel
+
+    _worker_model = WhisperModel(model_size, device=device, compute_type=compute_type)
+
+
+def _transcribe_job(shm_name: str, nbytes: int, language: str, beam_size: int) -> List[Dict]:
+    import numpy as np
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        audio = np.frombuffer(shm.buf[:nbytes], dtype=np.int16).astype(np.float32) / 32768.0
+    finally:
+        shm.close()
+
+    segments, _ = _worker_model.transcribe(
+        audio,
+        language=language,
+        vad_filter=True,
+        beam_size=beam_size,
+    )
+    return [
+        {"start": seg.start, "end": seg.end, "text": seg.text.strip()}
+        for seg in segments
+        if seg.text.strip()
+    ]
+
+
+def _transcribe_batch_job(
+    shm_name: str,
+    layout: List[Tuple[int, int]],
+    language: str,
+    batch_size: int,
+) -> List[List[Dict]]:
+    """
+    Transcribe several windows (``(byte_offset, nbytes)`` slices of one
+    shared block) in a single batched pass. Returns one segment list per
+    window, with timing relative to that window.
+    """
+    global _worker_pipeline
+    import numpy as np
+    from faster_whisper import BatchedInferencePipeline
+
+    if _worker_pipeline is None:
+        _worker_pipeline = BatchedInferencePipeline(model=_worker_model)
+
+    total = sum(n for _, n in layout)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        audio = np.frombuffer(shm.buf[:total], dtype=np.int16).astype(np.float32) / 32768.0
+    finally:
+        shm.close()
+
+    # Windows sit back to back; each becomes one or more <=30 s clips,
+    # which the pipeline decodes as independent batch items.
+    clips: List[Dict[str, int]] = []
+    bounds: List[Tuple[float, float]] = []
+    for idx, (offset, nbytes) in enumerate(layout):
+        start, end = offset // 2, (offset + nbytes) // 2
+        bounds.append((start / SAMPLE_RATE, end / SAMPLE_RATE))
+        for clip_start in range(start, end, MAX_CLIP_SAMPLES):
+            clips.append({"start": clip_start, "end": min(end, clip_start + MAX_CLIP_SAMPLES)})
+
+    results: List[List[Dict]] = [[] for _ in layout]
+    if not clips:
+        return results
+
+    segments, _ = _worker_pipeline.transcribe(
+        audio,
+        language=language,
+        clip_timestamps=clips,
+        vad_filter=False,
+        batch_size=batch_size,
+    )
+    for seg in segments:
+        text = seg.text.strip()
+        if not text:
+            continue
+        idx = next(
+            (i for i, (lo, hi) in enumerate(bounds) if lo <= seg.start < hi),
+            len(bounds) - 1,
+        )
+        lo, hi = bounds[idx]
+        results[idx].append({
+            "start": seg.start - lo,
+            "end": min(seg.end, hi) - lo,
+            "text": text,
+        })
+    return results
+
+
+# -- parent side -------------------------------------------------------------
+
+
+def _watch(future: Future) -> asyncio.Future:
+    """Awaitable that only tracks when ``future`` ends; its outcome is the caller's."""
+    waiter = asyncio.wrap_future(future)
+    waiter.add_done_callback(lambda f: f.cancelled() or f.exception())
+    return waiter
+
+class LocalWhisperPool:
+    """Bounded, recycling pool of model-holding worker processes."""
+
+    def __init__(
+        self,
+        workers: int = 1,
+        model_size: str = "base",
+        device: str = "cpu",
+        compute_type: str = "int8",
+        max_queue: int = 4,
+        job_timeout: float = 120.0,
+        max_tasks_per_child: int = 200,
+        beam_size: int = 5,
+        kill_grace: float = 30.0,
+    ):
+        self.workers = max(1, workers)
+        self.model_args = (model_size, device, compute_type)
+        self.max_queue = max_queue
+        self.job_timeout = job_timeout
+        self.max_tasks_per_child = max_tasks_per_child or None
+        self.beam_size = beam_size
+        self.kill_grace = kill_grace
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._running: Dict[ProcessPoolExecutor, Set[Future]] = {}
+        self._stuck: Set[Future] = set()  # timed out and past their grace period
+        self._reapers: Set[asyncio.Task] = set()
+        self._slots: Optional[asyncio.Semaphore] = None  # running + queued jobs
+        self._dispatch: Optional[asyncio.Semaphore] = None  # jobs handed to workers
+        self.stats: Dict[str, int] = {
+            "jobs": 0,
+            "rejected": 0,
+            "timeouts": 0,
+            "pool_restarts": 0,
+            "in_flight": 0,
+        }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=self.model_args,
+                max_tasks_per_child=self.max_tasks_per_child,
+            )
+        return self._executor
+
+    def _detach(self, executor: ProcessPoolExecutor):
+        """Send new jobs to a fresh pool from now on."""
+        if self._executor is executor:
+            self._executor = None
+            self.stats["pool_restarts"] += 1
+
+    def _restart(self, executor: ProcessPoolExecutor, kill: bool = False):
+        self._detach(executor)
+        if kill:
+            # A running job cannot be cancelled; stop its process instead.
+            for proc in list(getattr(executor, "_processes", {}).values()):
+                proc.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _reap(self, executor: ProcessPoolExecutor, future: Future):
+        """Retire the pool of a timed-out job that outlives its grace period."""
+        done, _ = await asyncio.wait([_watch(future)], timeout=self.kill_grace)
+        if done:
+            return  # the job finished late; its worker is free again
+        logger.error("Local whisper job still running after grace period, replacing pool")
+        self._stuck.add(future)
+        self._detach(executor)
+        others = [
+            _watch(f)
+            for f in self._running.get(executor, ())
+            if f not in self._stuck
+        ]
+        if others:
+            await asyncio.wait(others)
+        self._restart(executor, kill=True)
+
+    def _job_done(self, executor: ProcessPoolExecutor, future: Future):
+        self._dispatch.release()
+        self._stuck.discard(future)
+        running = self._running.get(executor)
+        if running is not None:
+            running.discard(future)
+            if not running:
+                del self._running[executor]
+
+    async def transcribe(self, pcm: bytes, language: str) -> List[Dict]:
+        return await self._submit([pcm], _transcribe_job, len(pcm), language, self.beam_size)
+
+    async def transcribe_batch(
+        self,
+        windows: List[bytes],
+        language: str,
+        batch_size: int = 8,
+    ) -> List[List[Dict]]:
+        """One batched pass over several windows; one result per window."""
+        layout, offset = [], 0
+        for pcm in windows:
+            layout.append((offset, len(pcm)))
+            offset += len(pcm)
+        return await self._submit(windows, _transcribe_batch_job, layout, language, batch_size)
+
+    async def _submit(self, blocks: List[bytes], job, *args):
+        """Copy ``blocks`` into one shared-memory segment and run ``job(shm_name, *args)``."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers + self.max_queue)
+            self._dispatch = asyncio.Semaphore(self.workers)
+        if self._slots.locked():
+            self.stats["rejected"] += 1
+            raise TranscriptionError("Local whisper pool queue is full")
+
+        async with self._slots:
+            self.stats["jobs"] += 1
+            self.stats["in_flight"] += 1
+            size = sum(len(b) for b in blocks)
+            shm = shared_memory.SharedMemory(create=True, size=max(1, size))
+            try:
+                offset = 0
+                for block in blocks:
+                    shm.buf[offset:offset + len(block)] = block
+                    offset += len(block)
+                # Submit only when a worker is free, so the timeout below
+                # covers running time rather than time queued behind others
+                await self._dispatch.acquire()
+                try:
+                    executor = self._get_executor()
+                    future = executor.submit(job, shm.name, *args)
+                except BaseException:
+                    self._dispatch.release()
+                    raise
+                self._running.setdefault(executor, set()).add(future)
+                # The worker stays busy until the job really ends, even if
+                # this caller stops waiting for it
+                loop = asyncio.get_running_loop()
+                future.add_done_callback(
+                    lambda f: loop.call_soon_threadsafe(self._job_done, executor, f)
+                )
+                return await asyncio.wait_for(
+                    asyncio.wrap_future(future), timeout=self.job_timeout,
+                )
+            except asyncio.TimeoutError as e:
+                self.stats["timeouts"] += 1
+                logger.error(
+                    "Local whisper job exceeded %.0fs, giving it %.0fs more",
+                    self.job_timeout, self.kill_grace,
+                )
+                reaper = asyncio.create_task(self._reap(executor, future))
+                self._reapers.add(reaper)
+                reaper.add_done_callback(self._reapers.discard)
+                raise TranscriptionError("Local whisper job timed out") from e
+            except BrokenProcessPool as e:
+                logger.error("Local whisper pool broke, restarting")
+                self._restart(executor)
+                raise TranscriptionError("Local whisper worker died") from e
+            finally:
+                self.stats["in_flight"] -= 1
+                shm.close()
+                shm.unlink()
+
+    def shutdown(self):
+        for reaper in list(self._reapers):
+            reaper.cancel()
+        for executor in list(self._running):
+            if executor is not self._executor:
+                self._restart(executor, kill=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -3,18 +3,26 @@ Local faster-whisper transcription provider.
 
 Dev/fallback provider using local Whisper model.
 Requires `faster-whisper` package.
+
+With ``local_whisper_workers > 0`` inference runs in a process pool
+(see ``local_pool.py``); otherwise in a thread of this process. With
+``local_whisper_batch_window_ms > 0`` windows from concurrent calls are
+additionally batched into one inference pass (see ``local_batching.py``).
 """
 
+import asyncio
 import logging
-import os
-from typing import List
+from typing import Dict, List, Optional
 
+from app.config import get_settings
 from app.services.transcription.base import (
+    TranscriptionError,
     TranscriptionProvider,
     TranscriptSegment,
-    ensure_wav,
-    safe_remove,
+    decode_to_pcm,
 )
+from app.services.transcription.local_batching import BatchScheduler
+from app.services.transcription.local_pool import LocalWhisperPool
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +43,33 @@ class LocalTranscriptionProvider(TranscriptionProvider):
         self.device = device
         self.compute_type = compute_type
         self._model = None
+        self._available = None
+        self._pool: Optional[LocalWhisperPool] = None
+        self._batcher: Optional[BatchScheduler] = None
+
+        settings = get_settings()
+        if settings.local_whisper_workers > 0:
+            self._pool = LocalWhisperPool(
+                workers=settings.local_whisper_workers,
+                model_size=model_size,
+                device=device,
+                compute_type=compute_type,
+                max_queue=settings.local_whisper_queue,
+                job_timeout=settings.local_whisper_timeout_seconds,
+                kill_grace=settings.local_whisper_kill_grace_seconds,
+                max_tasks_per_child=settings.local_whisper_max_tasks_per_child,
+            )
+            if settings.local_whisper_batch_window_ms > 0:
+                batch_size = settings.local_whisper_batch_size
+                self._batcher = BatchScheduler(
+                    lambda windows, language: self._pool.transcribe_batch(
+                        windows, language, batch_size=batch_size,
+                    ),
+                    window_ms=settings.local_whisper_batch_window_ms,
+                    max_batch=batch_size,
+                    max_wait_ms=settings.local_whisper_batch_max_wait_ms,
+                    concurrency=settings.local_whisper_workers,
+                )
 
     @property
     def model(self):
@@ -51,51 +86,79 @@ class LocalTranscriptionProvider(TranscriptionProvider):
         return self._model
 
     def is_available(self) -> bool:
-        try:
-            import faster_whisper  # noqa: F401
-            return True
-        except ImportError:
-            return False
+        # Checked on every routing decision; cache the import probe
+        if self._available is None:
+            try:
+                import faster_whisper  # noqa: F401
+                self._available = True
+            except ImportError:
+                self._available = False
+        return self._available
+
+    def model_id(self) -> str:
+        return f"{self.model_size}/{self.compute_type}"
 
     def get_info(self) -> dict:
         return {
             **super().get_info(),
             "model_size": self.model_size,
             "device": self.device,
+            "pool": self._pool.stats if self._pool else None,
+            "batching": self._batcher.stats if self._batcher else None,
         }
 
+    async def aclose(self):
+        await super().aclose()
+        if self._pool:
+            self._pool.shutdown()
+
+    def _transcribe_in_process(self, pcm: bytes, language: str) -> List[Dict]:
+        import numpy as np  # ships with faster-whisper
+
+        audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        segments, _ = self.model.transcribe(
+            audio,
+            language=language,
+            vad_filter=True,
+            beam_size=5,
+        )
+        return [
+            {"start": seg.start, "end": seg.end, "text": seg.text.strip()}
+            for seg in segments
+            if seg.text.strip()
+        ]
+
     async def transcribe(
         self,
         audio_bytes: bytes,
         language: str = "id",
     ) -> List[TranscriptSegment]:
-        wav_path = None
         try:
-            wav_path = ensure_wav(audio_bytes)
-            if not wav_path or not os.path.exists(wav_path):
-                return []
-            if os.path.getsize(wav_path) < 4000:
-                return []
-
-            segments, _ = self.model.transcribe(
-                wav_path,
-                language=language,
-                vad_filter=True,
-                beam_size=5,
-            )
+            pcm = await asyncio.to_thread(decode_to_pcm, audio_bytes)
+        except Exception:
+            logger.exception("Local transcription: audio conversion failed")
+            return []
+        if len(pcm) < 4000:
+            return []
+
+        try:
+            if self._batcher:
+                segments = await self._batcher.submit(pcm, language)
+            elif self._pool:
+                segments = await self._pool.transcribe(pcm, language)
+            else:
+                segments = await asyncio.to_thread(self._transcribe_in_process, pcm, language)
             return [
                 TranscriptSegment(
-                    start=seg.start,
-                    end=seg.end,
-                    text=seg.text.strip(),
+                    start=s["start"],
+                    end=s["end"],
+                    text=s["text"],
                     speaker="",
                 )
-                for seg in segments
-                if seg.text.strip()
+                for s in segments
             ]
-        except Exception:
+        except TranscriptionError:
+            raise
+        except Exception as e:
             logger.exception("Local transcription error")
-            return []
-        finally:
-            if wav_path:
-                safe_remove(wav_path)
+            raise TranscriptionError(f"Local model failed: {e!r}") from e
@@ -34,6 +34,7 @@ Expected Modal API contract:
     }
 """
 
+import asyncio
 import logging
 import os
 from typing import List, Optional
@@ -41,11 +42,11 @@ from typing import List, Optional
 import httpx
 
 from app.services.transcription.base import (
+    TranscriptionError,
     TranscriptionProvider,
     TranscriptSegment,
     DiarizationSegment,
-    ensure_wav,
-    safe_remove,
+    ensure_wav_bytes,
 )
 
 logger = logging.getLogger(__name__)
@@ -56,6 +57,7 @@ class ModalTranscriptionProvider(TranscriptionProvider):
 
     name = "modal"
     supports_diarization = True
+    http_timeout = 600.0
 
     def __init__(self):
         # Try config first, then env vars
@@ -71,6 +73,10 @@ class ModalTranscriptionProvider(TranscriptionProvider):
     def is_available(self) -> bool:
         return bool(self.endpoint)
 
+    def model_id(self) -> str:
+        # The endpoint identifies the deployed model
+        return self.endpoint
+
     def get_info(self) -> dict:
         return {
             **super().get_info(),
@@ -78,6 +84,9 @@ class ModalTranscriptionProvider(TranscriptionProvider):
             "has_token": bool(self.api_token),
         }
 
+    def warmup_url(self):
+        return self.endpoint.rstrip("/") + "/" if self.endpoint else None
+
     async def transcribe(
         self,
         audio_bytes: bytes,
@@ -111,11 +120,8 @@ class ModalTranscriptionProvider(TranscriptionProvider):
             logger.error("Modal endpoint not configured")
             return []
 
-        wav_path = None
         try:
-            wav_path = ensure_wav(audio_bytes)
-            if not wav_path or not os.path.exists(wav_path):
-                return []
+            wav_bytes = await asyncio.to_thread(ensure_wav_bytes, audio_bytes)
 
             headers = {}
             if self.api_token:
@@ -125,16 +131,14 @@ class ModalTranscriptionProvider(TranscriptionProvider):
             if num_speakers is not None:
                 form_data["num_speakers"] = str(num_speakers)
 
-            async with httpx.AsyncClient(timeout=600.0) as client:
-                with open(wav_path, "rb") as audio_file:
-                    resp = await client.post(
-                        f"{self.endpoint.rstrip('/')}/transcribe",
-                        headers=headers,
-                        files={"file": ("audio.wav", audio_file, "audio/wav")},
-                        data=form_data,
-                    )
-                    resp.raise_for_status()
-                    data = resp.json()
+            resp = await self._get_http().post(
+                f"{self.endpoint.rstrip('/')}/transcribe",
+                headers=headers,
+                files={"file": ("audio.wav", wav_bytes, "audio/wav")},
+                data=form_data,
+            )
+            resp.raise_for_status()
+            data = resp.json()
 
             segments = data.get("segments", [])
             logger.info(
@@ -156,15 +160,15 @@ class ModalTranscriptionProvider(TranscriptionProvider):
                 if s.get("text", "").strip()
             ]
 
-        except httpx.ConnectError:
+        except httpx.ConnectError as e:
             logger.error("Cannot connect to Modal endpoint: %s", self.endpoint)
-            return []
+            raise TranscriptionError("Cannot connect to Modal endpoint") from e
         except httpx.HTTPStatusError as e:
             logger.error("Modal API error %s: %s", e.response.status_code, e.response.text[:300])
-            return []
+            raise TranscriptionError(f"Modal returned HTTP {e.response.status_code}") from e
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error("Modal transcription error: %r", e)
+            raise TranscriptionError(f"Modal request failed: {e!r}") from e
         except Exception:
             logger.exception("Modal transcription error")
             return []
-        finally:
-            if wav_path:
-                safe_remove(wav_path)
@@ -8,20 +8,49 @@ Provider selection priority:
 4. Groq (if GROQ_API_KEY is set)
 5. Local (dev fallback, if faster-whisper installed)
 
+The priority is adjusted by observed health: each provider has a
+rolling success rate / p95 latency and a circuit breaker (see
+``health.py``). Degraded providers move to the back, providers with an
+open breaker are skipped, and a failed request fails over to the next
+provider within the same call. Health outcomes age out, so a demoted
+provider gets traffic again once its bad results are old enough; if it
+is still unhealthy the first fresh failures demote it again.
+
+Live ingest can additionally hedge slow requests (opt-in, see
+``hedging.py``). Uploads opt into the content-addressed result cache
+(see ``cache.py``).
+
 Usage:
     segments = await transcribe_audio_buffer(audio_bytes, language="id")
 """
 
+import asyncio
 import logging
 import os
+import time
 from typing import Dict, List, Optional
 
+from app.config import get_settings
 from app.services.transcription.base import TranscriptionProvider, TranscriptSegment
+from app.services.transcription.cache import audio_digest, get_transcript_cache
+from app.services.transcription.health import ProviderHealth
+from app.services.transcription.hedging import HedgeBudget
 
 logger = logging.getLogger(__name__)
 
+PRIORITY = ["modal", "gemini", "groq", "local"]
+MIN_HEALTH_SAMPLES = 5  # outcomes needed before a provider can count as degraded
+
 # Lazy-loaded provider instances
 _providers: Dict[str, TranscriptionProvider] = {}
+_health: Dict[str, ProviderHealth] = {}
+_last_decision: Dict = {}
+_hedge_stats: Dict[str, int] = {
+    "requests": 0,
+    "hedged": 0,
+    "primary_wins": 0,
+    "hedge_wins": 0,
+}
 
 
 def _get_provider(name: str) -> TranscriptionProvider:
@@ -44,77 +73,242 @@ def _get_provider(name: str) -> TranscriptionProvider:
     return _providers[name]
 
 
-def _select_provider() -> str:
-    """
-    Select the best available transcription provider.
-
-    Priority:
-    1. TRANSCRIPTION_BACKEND env var (explicit override)
-    2. modal (if endpoint configured — best quality + diarization)
-    3. gemini (default — cheap and always available)
-    4. groq (if API key set)
-    5. local (if faster-whisper installed)
-    """
-    # Check explicit config
+def _get_health(name: str) -> ProviderHealth:
+    if name not in _health:
+        settings = get_settings()
+        _health[name] = ProviderHealth(
+            failure_threshold=settings.transcription_breaker_failures,
+            cooldown_seconds=settings.transcription_breaker_cooldown_seconds,
+            max_age_seconds=settings.transcription_health_max_age_seconds,
+        )
+    return _health[name]
+
+
+def _explicit_backend() -> str:
     try:
-        from app.config import get_settings
         settings = get_settings()
         explicit = settings.transcription_backend or os.environ.get("TRANSCRIPTION_BACKEND", "")
     except Exception:
         explicit = os.environ.get("TRANSCRIPTION_BACKEND", "")
-    explicit = explicit.lower()
+    return explicit.lower()
+
+
+def _is_degraded(name: str) -> bool:
+    """Mostly failing or slower than the p95 budget over recent requests."""
+    health = _get_health(name)
+    if health.samples < MIN_HEALTH_SAMPLES:
+        return False
+    settings = get_settings()
+    p95 = health.p95_latency
+    return (
+        health.success_rate < settings.transcription_min_success_rate
+        or (p95 is not None and p95 > settings.transcription_slow_p95_seconds)
+    )
+
 
-    if explicit:
-        provider = _get_provider(explicit)
-        if provider.is_available():
-            return explicit
+def _provider_order() -> List[str]:
+    """
+    Available providers, best first.
+
+    Static priority (explicit override first), with degraded providers
+    moved behind healthy ones.
+    """
+    explicit = _explicit_backend()
+    names = list(PRIORITY)
+    if explicit in PRIORITY:
+        names.remove(explicit)
+        names.insert(0, explicit)
+    elif explicit:
+        logger.warning("Unknown transcription provider '%s', ignoring", explicit)
+
+    available = [n for n in names if _get_provider(n).is_available()]
+    if explicit and explicit not in available:
         logger.warning(
             "Requested provider '%s' is not available, falling back",
             explicit,
         )
+    healthy = [n for n in available if not _is_degraded(n)]
+    return healthy + [n for n in available if n not in healthy]
+
 
-    # Auto-select by priority
-    modal = _get_provider("modal")
-    if modal.is_available():
-        return "modal"
+def _select_provider() -> str:
+    """
+    Provider the next request would go to: the first in
+    :func:`_provider_order` whose circuit breaker is not open.
+    """
+    order = _provider_order()
+    for name in order:
+        if not _get_health(name).is_open():
+            return name
+    # Nothing available — return gemini anyway, it will fail with a clear error
+    return order[0] if order else "gemini"
 
-    # Default: Gemini via OpenRouter
-    gemini = _get_provider("gemini")
-    if gemini.is_available():
-        return "gemini"
 
-    # Fallback: Groq
-    if os.environ.get("GROQ_API_KEY"):
-        return "groq"
+async def _attempt(name: str, buffer_data: bytes, language: str):
+    """One provider request whose breaker slot is already claimed."""
+    health = _get_health(name)
+    start = time.monotonic()
+    try:
+        segments = await _get_provider(name).transcribe(buffer_data, language)
+    except asyncio.CancelledError:
+        health.release()
+        raise
+    except Exception:
+        health.record_failure(time.monotonic() - start)
+        raise
+    health.record_success(time.monotonic() - start)
+    return segments
 
-    # Last resort: local
-    local = _get_provider("local")
-    if local.is_available():
-        return "local"
 
-    # Nothing available — return gemini anyway, it will fail with a clear error
-    return "gemini"
+def _hedge_delay(name: str) -> float:
+    """How long the primary gets before a hedge is sent."""
+    settings = get_settings()
+    health = _get_health(name)
+    deadline = None
+    if health.samples >= MIN_HEALTH_SAMPLES:
+        deadline = health.latency_percentile(settings.transcription_hedge_percentile)
+    if deadline is None:
+        deadline = settings.transcription_hedge_default_delay_seconds
+    return max(deadline, settings.transcription_hedge_min_delay_seconds)
+
+
+async def _hedged(
+    primary: str,
+    secondary: str,
+    buffer_data: bytes,
+    language: str,
+    budget: HedgeBudget,
+    attempts: list,
+):
+    """
+    Run ``primary``; past its deadline also run ``secondary`` and keep
+    the first good result. Returns ``(provider, segments)``.
+    """
+    first = asyncio.create_task(_attempt(primary, buffer_data, language))
+    tasks = {first: primary}
+    try:
+        done, _ = await asyncio.wait({first}, timeout=_hedge_delay(primary))
+        if done or not _get_health(secondary).allow():
+            return primary, await first
+        # Budget is only spent on hedges actually sent
+        if not budget.try_spend():
+            _get_health(secondary).release()  # hand back a claimed probe
+            return primary, await first
+
+        _hedge_stats["hedged"] += 1
+        logger.info("Hedging slow %s request with %s", primary, secondary)
+        tasks[asyncio.create_task(_attempt(secondary, buffer_data, language))] = secondary
+
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    winner = tasks[task]
+                    _hedge_stats["primary_wins" if winner == primary else "hedge_wins"] += 1
+                    if winner != primary:
+                        attempts.append({"provider": primary, "result": "cancelled"})
+                    return winner, task.result()
+                error = task.exception()
+                if tasks[task] == secondary:
+                    attempts.append({"provider": secondary, "result": "failed", "error": str(error)[:200]})
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
 
 
 async def transcribe_audio_buffer(
     buffer_data: bytes,
     language: str = "id",
+    hedge_budget: Optional[HedgeBudget] = None,
+    cache: bool = False,
 ) -> List[Dict]:
     """
     Unified transcription entry point.
 
-    Auto-selects the best available provider and transcribes.
-    Returns segments as plain dicts for backward compatibility.
+    Tries providers in health-aware order, failing over when one
+    raises. With ``transcription_hedging`` enabled and a per-call
+    ``hedge_budget`` (live ingest), a slow primary is hedged with the
+    next available provider. With ``cache`` (uploads), identical audio
+    already transcribed by the preferred provider and model is served
+    from the transcript cache. Returns segments as plain dicts for
+    backward compatibility (``[]`` if every provider failed).
     """
-    provider_name = _select_provider()
-    provider = _get_provider(provider_name)
+    transcript_cache = get_transcript_cache() if cache else None
+    digest = None
+    if transcript_cache:
+        digest = await asyncio.to_thread(audio_digest, buffer_data)
+        preferred = _select_provider()
+        key = transcript_cache.make_key(
+            digest, language, preferred, _get_provider(preferred).model_id(),
+        )
+        cached = await asyncio.to_thread(transcript_cache.get, key)
+        if cached is not None:
+            _last_decision.clear()
+            _last_decision.update(
+                provider=preferred,
+                attempts=[{"provider": preferred, "result": "cache_hit"}],
+                at=time.time(),
+            )
+            logger.info("Transcription cache hit (%s, %d segments)", preferred, len(cached))
+            return cached
+
+    attempts = []
+    segments = None
+    chosen = None
+    hedging = hedge_budget is not None and get_settings().transcription_hedging
+    if hedging:
+        hedge_budget.record_request()
+        _hedge_stats["requests"] += 1
 
-    logger.info("Transcription backend: %s", provider_name)
+    order = _provider_order() or ["gemini"]
+    tried = set()
+    for i, name in enumerate(order):
+        if name in tried:
+            continue
+        if not _get_health(name).allow():
+            attempts.append({"provider": name, "result": "circuit_open"})
+            continue
+        tried.add(name)
 
-    segments = await provider.transcribe(buffer_data, language)
+        secondary = None
+        if hedging:
+            secondary = next(
+                (n for n in order[i + 1:] if not _get_health(n).is_open()),
+                None,
+            )
+
+        try:
+            if secondary:
+                chosen, segments = await _hedged(
+                    name, secondary, buffer_data, language, hedge_budget, attempts,
+                )
+                tried.add(secondary)
+            else:
+                segments = await _attempt(name, buffer_data, language)
+                chosen = name
+        except Exception as e:
+            attempts.append({"provider": name, "result": "failed", "error": str(e)[:200]})
+            tried.update(a["provider"] for a in attempts if a["result"] == "failed")
+            logger.warning("Transcription via %s failed (%s), trying next provider", name, e)
+            continue
+
+        attempts.append({"provider": chosen, "result": "ok"})
+        break
+
+    _last_decision.clear()
+    _last_decision.update(provider=chosen, attempts=attempts, at=time.time())
+
+    if segments is None:
+        logger.error("All transcription providers failed: %s", attempts)
+        return []
+
+    logger.info("Transcription backend: %s", chosen)
 
     # Return as plain dicts for backward compat with existing code
-    return [
+    result = [
         {
             "start": s["start"],
             "end": s["end"],
@@ -124,14 +318,44 @@ async def transcribe_audio_buffer(
         for s in segments
     ]
 
+    # Empty results are not cached so a retry gets a fresh attempt
+    if transcript_cache and result:
+        key = transcript_cache.make_key(
+            digest, language, chosen, _get_provider(chosen).model_id(),
+        )
+        await asyncio.to_thread(transcript_cache.put, key, result)
+    return result
+
+
+async def warm_up_providers():
+    """Pre-open a pooled connection to the provider live calls will use."""
+    await _get_provider(_select_provider()).warm_up()
+
+
+async def close_providers():
+    """Close provider HTTP pools (app shutdown)."""
+    for provider in list(_providers.values()):
+        await provider.aclose()
+
 
 def get_provider_info() -> dict:
     """Get info about the currently selected provider."""
     provider_name = _select_provider()
     provider = _get_provider(provider_name)
+    transcript_cache = get_transcript_cache()
     return {
         "selected": provider_name,
         **provider.get_info(),
+        "order": _provider_order(),
+        "last_decision": dict(_last_decision),
+        "health": {name: _get_health(name).stats() for name in PRIORITY},
+        "hedging": {
+            "enabled": get_settings().transcription_hedging,
+            **_hedge_stats,
+            "hedge_rate": round(_hedge_stats["hedged"] / _hedge_stats["requests"], 3)
+            if _hedge_stats["requests"] else 0.0,
+        },
+        "cache": transcript_cache.info() if transcript_cache else None,
         "all_providers": {
             name: _get_provider(name).get_info()
             for name in ["gemini", "groq", "modal", "local"]
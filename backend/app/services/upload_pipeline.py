@@ -9,6 +9,7 @@ Flow:
   5. status → completed
 """
 
+import asyncio
 import logging
 import os
 import tempfile
@@ -141,7 +142,7 @@ async def _transcribe_file(file_path: str, language: str) -> str:
     with open(file_path, "rb") as f:
         audio_bytes = f.read()
 
-    segments = await transcribe_audio_buffer(audio_bytes, language)
+    segments = await transcribe_audio_buffer(audio_bytes, language, cache=True)
     return "\n".join(s["text"] for s in segments)
 
 
@@ -182,14 +183,14 @@ async def process_uploaded_call(
 ):
     """Process an uploaded audio/video file through the full pipeline."""
     try:
-        _update_call(call_id, status="processing")
+        await asyncio.to_thread(_update_call, call_id, status="processing")
 
         # Step 1: Transcribe
-        _set_step(call_id, "transcribing")
+        await asyncio.to_thread(_set_step, call_id, "transcribing")
         transcript_text = await _transcribe_file(file_path, language)
 
         if not transcript_text.strip():
-            _update_call(call_id, status="failed", processing_step="failed:no_transcript")
+            await asyncio.to_thread(_update_call, call_id, status="failed", processing_step="failed:no_transcript")
             return
 
         # Store transcript segments
@@ -207,30 +208,30 @@ async def process_uploaded_call(
                 }).execute()
 
         # Step 2: Analyze
-        _set_step(call_id, "analyzing")
-        guidelines, scoring, analysis_docs = _get_playbook_context(call_id)
+        await asyncio.to_thread(_set_step, call_id, "analyzing")
+        guidelines, scoring, analysis_docs = await asyncio.to_thread(_get_playbook_context, call_id)
 
         # Build enhanced prompt with analysis documents
         enhanced_guidelines = guidelines or ""
         if analysis_docs:
             enhanced_guidelines += f"\n\n--- Analysis Documents ---\n{analysis_docs}"
 
-        analysis = analyze_call(
+        analysis = await analyze_call(
             transcript=transcript_text,
             scoring_criteria=scoring,
             playbook_guidelines=enhanced_guidelines if enhanced_guidelines else None,
         )
 
         # Step 3: Store results
-        _set_step(call_id, "storing")
-        _store_results(call_id, user_id, analysis)
+        await asyncio.to_thread(_set_step, call_id, "storing")
+        await asyncio.to_thread(_store_results, call_id, user_id, analysis)
 
         # Done
-        _update_call(call_id, status="completed", processing_step="done")
+        await asyncio.to_thread(_update_call, call_id, status="completed", processing_step="done")
 
     except Exception:
         logger.exception("Upload pipeline failed for call %s", call_id)
-        _update_call(call_id, status="failed", processing_step="failed:error")
+        await asyncio.to_thread(_update_call, call_id, status="failed", processing_step="failed:error")
     finally:
         # Clean up temp file
         if os.path.exists(file_path):
@@ -246,19 +247,19 @@ async def process_youtube_call(
     """Process a YouTube URL through download → transcribe → analyze pipeline."""
     tmp_dir = None
     try:
-        _update_call(call_id, status="processing")
+        await asyncio.to_thread(_update_call, call_id, status="processing")
 
         # Step 1: Download
-        _set_step(call_id, "downloading")
+        await asyncio.to_thread(_set_step, call_id, "downloading")
         tmp_dir = tempfile.mkdtemp(prefix="sbf_yt_")
-        audio_path = _download_youtube(youtube_url, tmp_dir)
+        audio_path = await asyncio.to_thread(_download_youtube, youtube_url, tmp_dir)
 
         # Step 2: Transcribe
-        _set_step(call_id, "transcribing")
+        await asyncio.to_thread(_set_step, call_id, "transcribing")
         transcript_text = await _transcribe_file(audio_path, language)
 
         if not transcript_text.strip():
-            _update_call(call_id, status="failed", processing_step="failed:no_transcript")
+            await asyncio.to_thread(_update_call, call_id, status="failed", processing_step="failed:no_transcript")
             return
 
         # Store transcript
@@ -276,29 +277,29 @@ async def process_youtube_call(
                 }).execute()
 
         # Step 3: Analyze
-        _set_step(call_id, "analyzing")
-        guidelines, scoring, analysis_docs = _get_playbook_context(call_id)
+        await asyncio.to_thread(_set_step, call_id, "analyzing")
+        guidelines, scoring, analysis_docs = await asyncio.to_thread(_get_playbook_context, call_id)
 
         enhanced_guidelines = guidelines or ""
         if analysis_docs:
             enhanced_guidelines += f"\n\n--- Analysis Documents ---\n{analysis_docs}"
 
-        analysis = analyze_call(
+        analysis = await analyze_call(
             transcript=transcript_text,
             scoring_criteria=scoring,
             playbook_guidelines=enhanced_guidelines if enhanced_guidelines else None,
         )
 
         # Step 4: Store results
-        _set_step(call_id, "storing")
-        _store_results(call_id, user_id, analysis)
+        await asyncio.to_thread(_set_step, call_id, "storing")
+        await asyncio.to_thread(_store_results, call_id, user_id, analysis)
 
         # Done
-        _update_call(call_id, status="completed", processing_step="done")
+        await asyncio.to_thread(_update_call, call_id, status="completed", processing_step="done")
 
     except Exception:
         logger.exception("YouTube pipeline failed for call %s", call_id)
-        _update_call(call_id, status="failed", processing_step="failed:error")
+        await asyncio.to_thread(_update_call, call_id, status="failed", processing_step="failed:error")
     finally:
         if tmp_dir and os.path.exists(tmp_dir):
             import shutil
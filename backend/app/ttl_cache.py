@@ -0,0 +1,61 @@
+"""
+Small in-process cache with per-entry expiry and a size bound.
+
+Used for hot per-request lookups (auth profiles, call config) where a
+few seconds of staleness is acceptable and writes invalidate
+explicitly. Entries past ``ttl`` are treated as misses; when full, the
+least recently used entry is dropped. Thread-safe, since sync endpoints
+run in the threadpool.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Bounded LRU mapping whose entries expire ``ttl`` seconds after set."""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl  # None = never expires (LRU bound only)
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (entry[0] and entry[0] < time.monotonic()):
+                if entry is not None:
+                    del self._data[key]
+                self.stats["misses"] += 1
+                return default
+            self._data.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.monotonic() + ttl if ttl else 0.0
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def pop(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def info(self) -> Dict[str, int]:
+        return {"size": len(self._data), "maxsize": self.maxsize, **self.stats}
@@ -2,32 +2,44 @@
 Audio ingestion WebSocket handler.
 Receives audio chunks, transcribes, runs analysis, broadcasts updates.
 
+Receiving and analysis are decoupled: the socket loop only buffers
+audio, a per-call worker transcribes and analyses queued windows.
+
 Ported from main_trial_class.py /ingest endpoint — now per-call.
 """
 
 import asyncio
-import json
 import time
 import logging
-from typing import Dict
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
 
 from fastapi import WebSocket, WebSocketDisconnect
 
+from app.config import get_settings
+from app.serialization import loads
 from app.websocket.manager import manager, CallSession
-from app.services.audio.buffer import AudioBuffer
+from app.websocket.state import build_state
+from app.services.audio.buffer import AudioBuffer, merge_windows
 from app.services.transcription import transcribe_audio_buffer
-from app.services.llm.checklist_analyzer import check_checklist_item
+from app.services.transcription.hedging import HedgeBudget
+from app.services.llm.checklist_analyzer import check_checklist_items
 from app.services.llm.client_extractor import extract_client_card_fields
-from app.services.llm.stage_detector import detect_stage, get_stage_timing_status
+from app.services.llm.stage_detector import detect_stage
 from app.services.llm.coaching_engine import generate_coaching_tip
+from app.services.checklist_scheduler import ChecklistScheduler
+from app.services.keyword_automaton import KeywordTracker
+from app.services.playbook_service import CompiledPlaybook
 
 logger = logging.getLogger(__name__)
 
+CHECKLIST_WINDOW = 1500  # transcript characters the checklist check sees
+
 
 async def handle_ingest(
     websocket: WebSocket,
     call_id: str,
-    call_structure: list,
+    playbook: CompiledPlaybook,
     client_card_fields: list,
     extraction_hints: Dict[str, str],
     pre_call_data: Dict | None = None,
@@ -35,31 +47,65 @@ async def handle_ingest(
     """
     Main ingest loop for a single call.
 
-    ``call_structure`` and ``client_card_fields`` come from the
-    playbook associated with the call.
+    ``playbook`` (compiled call structure) and ``client_card_fields``
+    come from the playbook version associated with the call.
+
+    The loop only receives audio and fills the buffer. Ready windows
+    go to a bounded :class:`WindowQueue` drained by a per-call analysis
+    worker, so a slow transcription or LLM request never stalls
+    ``websocket.receive()``.
     """
     session = await manager.get_or_create_session(call_id)
+    session.playbook = playbook
     session.call_start_time = time.time()
     session.stage_start_time = time.time()
-    session.current_stage_id = (
-        call_structure[0]["id"] if call_structure else ""
-    )
+    session.current_stage_id = playbook.first_stage_id
     session.is_recording = True
     session.language = "id"
 
     await websocket.accept()
     logger.info("Ingest connected for call %s", call_id)
 
-    audio_buffer = AudioBuffer(interval_seconds=10.0)
+    settings = get_settings()
+    audio_buffer = AudioBuffer(
+        interval_seconds=10.0,
+        mode=settings.audio_window_mode,
+        min_window_seconds=settings.vad_min_window_seconds,
+        max_window_seconds=settings.vad_max_window_seconds,
+        pause_ms=settings.vad_pause_ms,
+        decoder=settings.live_decoder,
+    )
+    windows = WindowQueue(maxsize=settings.ingest_queue_size)
+    session.ingest_stats = windows.stats
+    session.hedge_budget = HedgeBudget(settings.transcription_hedge_budget)
+    session.keyword_tracker = KeywordTracker(playbook.keywords)
+    session.checklist_scheduler = ChecklistScheduler(
+        playbook,
+        base_interval=settings.checklist_recheck_seconds,
+        max_interval=settings.checklist_recheck_max_seconds,
+        min_interval=settings.checklist_recheck_min_seconds,
+    )
+    worker = asyncio.create_task(
+        _analysis_worker(
+            windows,
+            session,
+            playbook,
+            client_card_fields,
+            extraction_hints,
+            pre_call_data,
+        )
+    )
 
     try:
         while True:
             message = await websocket.receive()
+            if message.get("type") == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
 
             # Text messages (settings / commands)
             if "text" in message:
                 try:
-                    data = json.loads(message["text"])
+                    data = loads(message["text"])
                     if data.get("type") == "set_language":
                         session.language = data.get("language", "id")
                     elif data.get("type") == "manual_toggle_item":
@@ -73,114 +119,15 @@ async def handle_ingest(
             # Binary audio data
             if "bytes" in message:
                 chunk = message["bytes"]
-                if not audio_buffer.add_chunk(chunk):
+                ready = audio_buffer.add_chunk(chunk)
+                windows.stats["windows_skipped_silent"] = audio_buffer.windows_skipped
+                if not ready:
                     continue
 
-                # --- Buffer ready: transcribe + analyse ---
-                buffer_data = audio_buffer.get_audio_data()
-
-                segments = await transcribe_audio_buffer(
-                    buffer_data,
-                    session.language,
+                windows.put(
+                    audio_buffer.get_audio_data(),
+                    started_at=audio_buffer.last_transcription_time,
                 )
-
-                if segments:
-                    transcript = " ".join(s["text"] for s in segments)
-                    session.accumulated_transcript += " " + transcript
-
-                # Trim transcript to last 1000 words
-                words = session.accumulated_transcript.split()
-                if len(words) > 1000:
-                    session.accumulated_transcript = " ".join(words[-1000:])
-
-                if session.call_start_time is None:
-                    audio_buffer.clear()
-                    continue
-
-                elapsed = time.time() - session.call_start_time
-
-                # Stage detection
-                detected = detect_stage(
-                    conversation_text=session.accumulated_transcript[-2000:],
-                    stages=call_structure,
-                    elapsed_seconds=int(elapsed),
-                    previous_stage_id=session.current_stage_id or None,
-                )
-                if detected != session.current_stage_id:
-                    session.stage_start_time = time.time()
-                session.current_stage_id = detected
-
-                # Checklist analysis
-                for stage in call_structure:
-                    for item in stage["items"]:
-                        iid = item["id"]
-                        if session.checklist_progress.get(iid, False):
-                            continue
-                        last = session.checklist_last_check.get(iid, 0)
-                        if time.time() - last < 30:
-                            continue
-                        session.checklist_last_check[iid] = time.time()
-
-                        completed, _conf, evidence, _dbg = check_checklist_item(
-                            item,
-                            session.accumulated_transcript[-1500:],
-                        )
-                        if completed:
-                            # Duplicate evidence check
-                            if evidence and evidence in session.checklist_evidence.values():
-                                continue
-                            session.checklist_progress[iid] = True
-                            session.checklist_evidence[iid] = evidence
-
-                # Client card extraction
-                current_vals = {
-                    k: (v.get("value", "") if isinstance(v, dict) else str(v))
-                    for k, v in session.client_card_data.items()
-                }
-                new_fields = extract_client_card_fields(
-                    session.accumulated_transcript[-1000:],
-                    current_vals,
-                    client_card_fields,
-                    extraction_hints,
-                )
-                for fid, fdata in new_fields.items():
-                    session.client_card_data[fid] = fdata
-
-                # Coaching tip
-                current_stage_def = next(
-                    (s for s in call_structure if s["id"] == session.current_stage_id),
-                    None,
-                )
-                tip = generate_coaching_tip(
-                    conversation_text=session.accumulated_transcript[-500:],
-                    current_stage=current_stage_def,
-                    pre_call_data=pre_call_data,
-                    checklist_progress=session.checklist_progress,
-                    client_card_data=session.client_card_data,
-                )
-
-                # Build update payload
-                stages_payload = _build_stages_payload(
-                    call_structure, session, int(elapsed),
-                )
-                stage_elapsed = (
-                    int(time.time() - session.stage_start_time)
-                    if session.stage_start_time else 0
-                )
-
-                update = {
-                    "type": "update",
-                    "callElapsedSeconds": int(elapsed),
-                    "stageElapsedSeconds": stage_elapsed,
-                    "currentStageId": session.current_stage_id,
-                    "stages": stages_payload,
-                    "clientCard": session.client_card_data,
-                    "transcriptPreview": session.accumulated_transcript[-300:],
-                }
-                if tip:
-                    update["coachingTip"] = tip
-
-                await session.broadcast(update)
                 audio_buffer.clear()
 
     except WebSocketDisconnect:
@@ -188,38 +135,211 @@ async def handle_ingest(
     except Exception:
         logger.exception("Ingest error for call %s", call_id)
     finally:
+        # Let the worker finish windows already received, then stop.
+        audio_buffer.close()
+        windows.close()
+        try:
+            await worker
+        except Exception:
+            logger.exception("Analysis worker failed for call %s", call_id)
         session.is_recording = False
 
 
-def _build_stages_payload(
-    call_structure: list,
+class WindowQueue:
+    """
+    Bounded FIFO of audio windows waiting for analysis.
+
+    When the queue is full, a new window is appended to the newest
+    pending one instead of blocking the receiver. Windows are
+    consecutive slices of the same stream, so the merged audio is
+    still valid and the next tick simply covers a longer span.
+    """
+
+    def __init__(self, maxsize: int = 2):
+        self.maxsize = max(1, maxsize)
+        self._windows: Deque[list] = deque()  # [started_at, bytes]
+        self._ready = asyncio.Event()
+        self._closed = False
+        self.stats: Dict[str, float] = {
+            "queue_depth": 0,
+            "max_queue_depth": 0,
+            "windows_enqueued": 0,
+            "windows_coalesced": 0,
+            "windows_skipped_silent": 0,
+            "windows_processed": 0,
+            "last_tick_seconds": 0.0,
+            "max_tick_seconds": 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def put(self, window: bytes, started_at: float = 0.0):
+        if len(self._windows) >= self.maxsize:
+            self._windows[-1][1] = merge_windows(self._windows[-1][1], window)
+            self.stats["windows_coalesced"] += 1
+            logger.warning(
+                "Analysis lagging: coalesced window (%d pending)",
+                len(self._windows),
+            )
+        else:
+            self._windows.append([started_at, window])
+        self.stats["windows_enqueued"] += 1
+        self._update_depth()
+        self._ready.set()
+
+    async def get(self) -> Optional[Tuple[float, bytes]]:
+        """Next ``(started_at, audio)`` window, or ``None`` once closed and drained."""
+        while not self._windows:
+            if self._closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        started_at, window = self._windows.popleft()
+        self._update_depth()
+        return started_at, window
+
+    def close(self):
+        self._closed = True
+        self._ready.set()
+
+    def record_tick(self, seconds: float):
+        self.stats["windows_processed"] += 1
+        self.stats["last_tick_seconds"] = round(seconds, 3)
+        self.stats["max_tick_seconds"] = max(
+            self.stats["max_tick_seconds"], round(seconds, 3),
+        )
+
+    def _update_depth(self):
+        depth = len(self._windows)
+        self.stats["queue_depth"] = depth
+        self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], depth)
+
+
+async def _analysis_worker(
+    windows: WindowQueue,
     session: CallSession,
-    elapsed: int,
-) -> list:
-    result = []
-    for stage in call_structure:
-        items = []
-        for item in stage["items"]:
-            items.append({
-                "id": item["id"],
-                "type": item.get("type", "discuss"),
-                "content": item["content"],
-                "completed": session.checklist_progress.get(item["id"], False),
-                "evidence": session.checklist_evidence.get(item["id"], ""),
-            })
-
-        timing = get_stage_timing_status(
-            stage["id"], elapsed, call_structure,
+    playbook: CompiledPlaybook,
+    client_card_fields: list,
+    extraction_hints: Dict[str, str],
+    pre_call_data: Dict | None,
+):
+    """Drain ``windows`` one tick at a time until the queue is closed."""
+    while True:
+        window = await windows.get()
+        if window is None:
+            return
+        started_at, buffer_data = window
+
+        started = time.time()
+        try:
+            await _run_tick(
+                buffer_data,
+                started_at,
+                session,
+                playbook,
+                client_card_fields,
+                extraction_hints,
+                pre_call_data,
+            )
+        except Exception:
+            logger.exception("Analysis tick failed for call %s", session.call_id)
+        windows.record_tick(time.time() - started)
+        logger.info(
+            "Tick for call %s took %.1fs (queue depth %d)",
+            session.call_id, time.time() - started, len(windows),
         )
 
-        result.append({
-            "id": stage["id"],
-            "name": stage["name"],
-            "startOffsetSeconds": stage["startOffsetSeconds"],
-            "durationSeconds": stage["durationSeconds"],
-            "items": items,
-            "isCurrent": stage["id"] == session.current_stage_id,
-            "timingStatus": timing["status"],
-            "timingMessage": timing["message"],
-        })
-    return result
+
+async def _run_tick(
+    buffer_data: bytes,
+    started_at: float,
+    session: CallSession,
+    playbook: CompiledPlaybook,
+    client_card_fields: list,
+    extraction_hints: Dict[str, str],
+    pre_call_data: Dict | None,
+):
+    """Transcribe one audio window, run analysis and broadcast the update."""
+    segments = await transcribe_audio_buffer(
+        buffer_data,
+        session.language,
+        hedge_budget=session.hedge_budget,
+    )
+
+    # Segment timing becomes call-relative; the store trims to 1000 words
+    offset = started_at - session.call_start_time if session.call_start_time else 0.0
+    session.transcript.extend(segments, offset_seconds=max(0.0, offset))
+    transcript = session.transcript
+    # Only the new text goes through the keyword automaton; its hits
+    # schedule re-checks of their items, at most one per item per
+    # checklist_recheck_min_seconds
+    session.keyword_tracker.feed(transcript)
+    scheduler = session.checklist_scheduler
+    scheduler.signal_keywords(session.keyword_tracker.new_hits)
+
+    if session.call_start_time is None:
+        return
+
+    elapsed = time.time() - session.call_start_time
+
+    # Stage detection
+    detected = await detect_stage(
+        conversation_text=transcript.tail(2000),
+        playbook=playbook,
+        elapsed_seconds=int(elapsed),
+        previous_stage_id=session.current_stage_id or None,
+    )
+    if detected != session.current_stage_id:
+        session.stage_start_time = time.time()
+        scheduler.signal_stage(detected)
+    session.current_stage_id = detected
+
+    # Checklist analysis — items with new evidence (or whose backoff
+    # expired) are checked concurrently
+    pending = scheduler.due(session.checklist_progress, time.time())
+    results = await check_checklist_items(
+        pending,
+        transcript.tail(CHECKLIST_WINDOW),
+        keywords=session.keyword_tracker,
+    )
+
+    # Merge in playbook order so the duplicate guard stays deterministic
+    for item, (completed, _conf, evidence, _dbg) in zip(pending, results):
+        if not completed:
+            continue
+        # Duplicate evidence check
+        if evidence and evidence in session.checklist_evidence.values():
+            continue
+        session.checklist_progress[item.id] = True
+        session.checklist_evidence[item.id] = evidence
+
+    # Client card extraction
+    current_vals = {
+        k: (v.get("value", "") if isinstance(v, dict) else str(v))
+        for k, v in session.client_card_data.items()
+    }
+    new_fields = await extract_client_card_fields(
+        transcript.tail(1000),
+        current_vals,
+        client_card_fields,
+        extraction_hints,
+    )
+    for fid, fdata in new_fields.items():
+        session.client_card_data[fid] = fdata
+
+    # Coaching tip
+    tip = await generate_coaching_tip(
+        conversation_text=transcript.tail(500),
+        current_stage=playbook.stage_by_id.get(session.current_stage_id),
+        pre_call_data=pre_call_data,
+        checklist_progress=session.checklist_progress,
+        client_card_data=session.client_card_data,
+    )
+
+    # Publish only what changed since the previous tick
+    await session.publish(
+        build_state(playbook, session),
+        {"coachingTip": tip} if tip else None,
+    )
+
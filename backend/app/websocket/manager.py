@@ -5,47 +5,201 @@ with per-call isolation.
 """
 
 import asyncio
-import json
 import logging
-from typing import Dict, Set, Optional
+from collections import deque
+from typing import Deque, Dict, Optional
 
 from fastapi import WebSocket
 
+from app.config import get_settings
+from app.serialization import dumps
+from app.services.checklist_scheduler import ChecklistScheduler
+from app.services.keyword_automaton import KeywordTracker
+from app.services.playbook_service import CompiledPlaybook, compile_playbook
+from app.services.transcript_store import TranscriptStore
+from app.services.transcription.hedging import HedgeBudget
+from app.websocket.state import build_state, diff_state
+
 logger = logging.getLogger(__name__)
 
 
+class CoachConnection:
+    """
+    Outbound side of one coach socket.
+
+    Messages go into a bounded queue drained by a dedicated writer
+    task, so one slow browser never delays other observers or the
+    ingest loop. When the queue overflows, pending patches are dropped
+    and replaced by a single snapshot of the latest state. A send that
+    takes longer than ``max_lag`` seconds disconnects the client.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        session: "CallSession",
+        max_queue: int = 8,
+        max_lag: float = 10.0,
+    ):
+        self.websocket = websocket
+        self.session = session
+        self.max_queue = max(1, max_queue)
+        self.max_lag = max_lag
+        self._queue: Deque[str] = deque()
+        self._ready = asyncio.Event()
+        self._snapshot_due = False
+        self._task = asyncio.create_task(self._writer())
+
+    def send(self, message: str):
+        """Queue a pre-encoded message without waiting for the socket."""
+        if self._snapshot_due:
+            return  # the pending snapshot will include this update
+        if len(self._queue) >= self.max_queue:
+            self._queue.clear()
+            self._snapshot_due = True
+            self.session.broadcast_stats["coalesced"] += 1
+        else:
+            self._queue.append(message)
+        self._ready.set()
+
+    def request_snapshot(self):
+        """Send the full current state next, superseding queued patches."""
+        self._snapshot_due = True
+        self._ready.set()
+
+    async def _writer(self):
+        stats = self.session.broadcast_stats
+        try:
+            while True:
+                if self._snapshot_due:
+                    # Built at send time, so it already covers every
+                    # patch still sitting in the queue.
+                    self._snapshot_due = False
+                    self._queue.clear()
+                    message = self.session.snapshot_frame()
+                elif self._queue:
+                    message = self._queue.popleft()
+                else:
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+
+                await asyncio.wait_for(
+                    self.websocket.send_text(message), timeout=self.max_lag,
+                )
+                stats["sent"] += 1
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            stats["slow_disconnects"] += 1
+            logger.warning(
+                "Disconnecting coach lagging more than %.1fs on call %s",
+                self.max_lag, self.session.call_id,
+            )
+            self.session.coach_connections.pop(self.websocket, None)
+            try:
+                await asyncio.wait_for(self.websocket.close(code=1013), timeout=1.0)
+            except Exception:
+                pass
+        except Exception:
+            stats["failed"] += 1
+            self.session.coach_connections.pop(self.websocket, None)
+            logger.info("Removed dead coach connection for call %s", self.session.call_id)
+
+    def close(self):
+        self._task.cancel()
+
+
 class CallSession:
     """State for a single live call."""
 
     def __init__(self, call_id: str):
         self.call_id = call_id
-        self.coach_connections: Set[WebSocket] = set()
-        self.accumulated_transcript: str = ""
+        self.coach_connections: Dict[WebSocket, CoachConnection] = {}
+        self.playbook: CompiledPlaybook = compile_playbook([])
+        self.transcript = TranscriptStore(max_words=1000)
         self.checklist_progress: Dict[str, bool] = {}
         self.checklist_evidence: Dict[str, str] = {}
-        self.checklist_last_check: Dict[str, float] = {}
         self.client_card_data: Dict[str, Dict] = {}
         self.current_stage_id: str = ""
         self.stage_start_time: Optional[float] = None
         self.call_start_time: Optional[float] = None
         self.language: str = "id"
         self.is_recording: bool = False
+        # Queue-depth / tick-latency counters of the ingest pipeline
+        self.ingest_stats: Dict[str, float] = {}
+        # Running checklist keyword hits over the transcript (ingest)
+        self.keyword_tracker: Optional[KeywordTracker] = None
+        # Decides which open checklist items are re-checked each tick
+        self.checklist_scheduler: Optional[ChecklistScheduler] = None
+        # Caps duplicate (hedged) transcription requests for this call
+        self.hedge_budget: Optional[HedgeBudget] = None
+        # Outbound counters across this call's coach connections
+        self.broadcast_stats: Dict[str, int] = {
+            "sent": 0,
+            "coalesced": 0,
+            "slow_disconnects": 0,
+            "failed": 0,
+        }
+        # Last published coach state and its sequence number
+        self.seq: int = 0
+        self.state: Optional[Dict] = None
+        self._snapshot_cache: Optional[tuple] = None  # (seq, frame)
+
+    def subscribe(self, websocket: WebSocket) -> CoachConnection:
+        """Register a coach socket; it receives a snapshot first."""
+        settings = get_settings()
+        conn = CoachConnection(
+            websocket,
+            self,
+            max_queue=settings.coach_queue_size,
+            max_lag=settings.coach_max_lag_seconds,
+        )
+        self.coach_connections[websocket] = conn
+        conn.request_snapshot()
+        return conn
+
+    def unsubscribe(self, websocket: WebSocket):
+        conn = self.coach_connections.pop(websocket, None)
+        if conn:
+            conn.close()
+
+    def snapshot_frame(self) -> str:
+        """
+        Encoded full state tagged with the sequence number of the last patch.
+
+        Once something has been published this is exactly the state
+        at ``seq``, encoded once and shared by every connection that
+        needs a snapshot before the next patch.
+        """
+        if self.state is None:
+            return dumps({
+                "type": "initial",
+                "seq": self.seq,
+                **build_state(self.playbook, self),
+            })
+        if self._snapshot_cache is None or self._snapshot_cache[0] != self.seq:
+            frame = dumps({"type": "initial", "seq": self.seq, **self.state})
+            self._snapshot_cache = (self.seq, frame)
+        return self._snapshot_cache[1]
+
+    async def publish(self, state: Dict, extra: Optional[Dict] = None):
+        """Broadcast the changes since the last published state as a patch."""
+        patch = diff_state(self.state, state)
+        self.seq += 1
+        self.state = state
+        await self.broadcast({
+            "type": "patch",
+            "seq": self.seq,
+            **patch,
+            **(extra or {}),
+        })
 
     async def broadcast(self, data: dict):
-        """Send JSON message to all connected coach clients."""
-        msg = json.dumps(data)
-        disconnected: Set[WebSocket] = set()
-        for ws in self.coach_connections:
-            try:
-                await ws.send_text(msg)
-            except Exception:
-                disconnected.add(ws)
-        self.coach_connections -= disconnected
-        if disconnected:
-            logger.info(
-                "Removed %d dead coach connections for call %s",
-                len(disconnected), self.call_id,
-            )
+        """Encode ``data`` once and queue the frame for every coach client."""
+        msg = dumps(data)
+        for conn in list(self.coach_connections.values()):
+            conn.send(msg)
 
 
 class ConnectionManager:
@@ -70,7 +224,8 @@ class ConnectionManager:
             session = self._sessions.pop(call_id, None)
             if session:
                 # Close remaining coach connections
-                for ws in session.coach_connections:
+                for ws, conn in list(session.coach_connections.items()):
+                    conn.close()
                     try:
                         await ws.close()
                     except Exception:
@@ -80,6 +235,29 @@ class ConnectionManager:
     def active_sessions(self) -> int:
         return len(self._sessions)
 
+    def ingest_stats(self) -> Dict[str, float]:
+        """Aggregate ingest pipeline metrics across live calls."""
+        recording = [s for s in self._sessions.values() if s.is_recording]
+        stats = [s.ingest_stats for s in recording if s.ingest_stats]
+        return {
+            "recording_sessions": len(recording),
+            "queue_depth_total": sum(st.get("queue_depth", 0) for st in stats),
+            "queue_depth_max": max((st.get("queue_depth", 0) for st in stats), default=0),
+            "windows_coalesced": sum(st.get("windows_coalesced", 0) for st in stats),
+            "windows_skipped_silent": sum(st.get("windows_skipped_silent", 0) for st in stats),
+            "max_tick_seconds": max((st.get("max_tick_seconds", 0.0) for st in stats), default=0.0),
+            "coach_connections": sum(len(s.coach_connections) for s in recording),
+            "coach_coalesced": sum(s.broadcast_stats["coalesced"] for s in recording),
+            "coach_slow_disconnects": sum(s.broadcast_stats["slow_disconnects"] for s in recording),
+            "transcription_hedges": sum(s.hedge_budget.hedges for s in recording if s.hedge_budget),
+            "checklist_checks": sum(
+                s.checklist_scheduler.stats["checks"] for s in recording if s.checklist_scheduler
+            ),
+            "checklist_deferred": sum(
+                s.checklist_scheduler.stats["deferred"] for s in recording if s.checklist_scheduler
+            ),
+        }
+
 
 # Singleton
 manager = ConnectionManager()
@@ -0,0 +1,142 @@
+"""
+Versioned live-call state for coach WebSockets.
+
+Protocol (server → coach):
+
+- ``{"type": "initial", "seq": n, ...full state}`` on connect, and in
+  reply to ``{"type": "resync"}`` when a client detects a gap.
+- ``{"type": "patch", "seq": n, ...changes}`` after every analysis
+  tick. Only changed stages, items, client card fields, current stage
+  and transcript preview are included; elapsed counters and an
+  optional ``coachingTip`` are always sent.
+
+``seq`` increases by one per patch. A client that receives a patch
+whose ``seq`` is not ``last_seq + 1`` should send ``resync``.
+
+Patch shape::
+
+    {
+        "type": "patch",
+        "seq": 42,
+        "callElapsedSeconds": 310,
+        "stageElapsedSeconds": 95,
+        "currentStageId": "...",                 # only if changed
+        "stages": {stage_id: {changed fields}},  # isCurrent / timing*
+        "items": {item_id: {changed fields}},    # completed / evidence
+        "clientCard": {field_id: value | None},  # None = removed
+        "transcriptPreview": "...",              # only if changed
+        "coachingTip": {...},                    # only if generated
+    }
+"""
+
+import time
+from typing import Dict, Optional
+
+from app.services.llm.stage_detector import get_stage_timing_status
+from app.services.playbook_service import CompiledPlaybook
+
+STAGE_FIELDS = ("isCurrent", "timingStatus", "timingMessage")
+ITEM_FIELDS = ("completed", "evidence")
+
+
+def build_stages_payload(
+    playbook: CompiledPlaybook,
+    session,
+    elapsed: int,
+) -> list:
+    progress = session.checklist_progress
+    evidence = session.checklist_evidence
+    result = []
+    for stage in playbook.stages:
+        items = [
+            {
+                "id": item.id,
+                "type": item.type,
+                "content": item.content,
+                "completed": progress.get(item.id, False),
+                "evidence": evidence.get(item.id, ""),
+            }
+            for item in stage.items
+        ]
+
+        timing = get_stage_timing_status(stage, elapsed)
+
+        result.append({
+            "id": stage.id,
+            "name": stage.name,
+            "startOffsetSeconds": stage.start,
+            "durationSeconds": stage.duration,
+            "items": items,
+            "isCurrent": stage.id == session.current_stage_id,
+            "timingStatus": timing["status"],
+            "timingMessage": timing["message"],
+        })
+    return result
+
+
+def build_state(playbook: CompiledPlaybook, session) -> Dict:
+    """Full coach-facing state of ``session`` right now."""
+    now = time.time()
+    elapsed = int(now - session.call_start_time) if session.call_start_time else 0
+    stage_elapsed = int(now - session.stage_start_time) if session.stage_start_time else 0
+    current = session.current_stage_id or playbook.first_stage_id or None
+    return {
+        "callElapsedSeconds": elapsed,
+        "stageElapsedSeconds": stage_elapsed,
+        "currentStageId": current,
+        "stages": build_stages_payload(playbook, session, elapsed),
+        "clientCard": dict(session.client_card_data),
+        "transcriptPreview": session.transcript.tail(300),
+    }
+
+
+def diff_state(prev: Optional[Dict], curr: Dict) -> Dict:
+    """
+    Changes from ``prev`` to ``curr`` in patch form (without type/seq).
+
+    With no previous state every stage, item and field counts as changed.
+    """
+    prev = prev or {}
+    patch: Dict = {
+        "callElapsedSeconds": curr["callElapsedSeconds"],
+        "stageElapsedSeconds": curr["stageElapsedSeconds"],
+    }
+
+    if curr["currentStageId"] != prev.get("currentStageId"):
+        patch["currentStageId"] = curr["currentStageId"]
+
+    prev_stages = {s["id"]: s for s in prev.get("stages", [])}
+    stages: Dict[str, Dict] = {}
+    items: Dict[str, Dict] = {}
+    for stage in curr["stages"]:
+        old = prev_stages.get(stage["id"], {})
+        changed = {f: stage[f] for f in STAGE_FIELDS if old.get(f) != stage[f]}
+        if changed:
+            stages[stage["id"]] = changed
+
+        old_items = {it["id"]: it for it in old.get("items", [])}
+        for item in stage["items"]:
+            old_item = old_items.get(item["id"], {})
+            changed = {f: item[f] for f in ITEM_FIELDS if old_item.get(f) != item[f]}
+            if changed:
+                items[item["id"]] = changed
+    if stages:
+        patch["stages"] = stages
+    if items:
+        patch["items"] = items
+
+    prev_card = prev.get("clientCard", {})
+    card = {
+        fid: value
+        for fid, value in curr["clientCard"].items()
+        if prev_card.get(fid) != value
+    }
+    for fid in prev_card.keys() - curr["clientCard"].keys():
+        card[fid] = None
+    if card:
+        patch["clientCard"] = card
+
+    if curr["transcriptPreview"] != prev.get("transcriptPreview"):
+        patch["transcriptPreview"] = curr["transcriptPreview"]
+
+    return patch
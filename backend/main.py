@@ -14,6 +14,7 @@ import os
 from insights.client_insight import analyze_client_text, reset_analyzer
 from utils.youtube_processor import process_youtube_url
 from utils.audio_buffer import AudioBuffer
+from app.serialization import dumps
 from utils.realtime_transcriber import transcribe_audio_buffer
 from utils.llm_analyzer import get_llm_analyzer
 from utils.intent_detector import get_intent_detector
@@ -560,7 +561,7 @@ async def websocket_ingest(websocket: WebSocket):
                         "transcript_preview": accumulated_transcript[-500:] if accumulated_transcript else "",  # Последние 500 символов
                         "assist_trigger": assist_trigger  # Add in-call assist trigger
                     }
-                    message = json.dumps(message_data)
+                    message = dumps(message_data)
                     
                     disconnected = set()
                     for ws in coach_connections:
@@ -798,7 +799,7 @@ async def process_transcript(transcript: str = Form(...), language: str = Form("
             "transcript_preview": accumulated_transcript[-500:] if accumulated_transcript else "",
             "assist_trigger": assist_trigger  # Include trigger for frontend
         }
-        message = json.dumps(message_data)
+        message = dumps(message_data)
         
         print(f"📡 Sending to {len(coach_connections)} WebSocket clients...")
         disconnected = set()
@@ -1057,7 +1058,7 @@ async def process_youtube(url: str = Form(...), language: str = Form("id")):
             "client_insight": last_client_insight,
             "assist_trigger": assist_trigger  # Include trigger for frontend
         }
-        message = json.dumps(message_data)
+        message = dumps(message_data)
         
         disconnected = set()
         for ws in coach_connections:
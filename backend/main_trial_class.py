@@ -61,6 +61,7 @@ from trial_class_analyzer import get_trial_class_analyzer, reset_analyzer
 
 # Existing utilities
 from utils.audio_buffer import AudioBuffer
+from app.serialization import dumps
 from utils.realtime_transcriber import transcribe_audio_buffer
 
 load_dotenv()
@@ -465,7 +466,7 @@ async def websocket_ingest(websocket: WebSocket):
                         }
                         
                         print(f"📤 Sending update with {len(debug_log)} total log entries, last 50: {min(50, len(debug_log))} entries")
-                        message_json = json.dumps(message_data)
+                        message_json = dumps(message_data)
                         
                         disconnected = set()
                         for ws in coach_connections:
@@ -981,7 +982,7 @@ async def process_youtube(url: str = Form(...), language: str = Form("id"), real
         }
         
         print(f"📤 Sending YouTube update with {len(debug_log)} total log entries, last 50: {min(50, len(debug_log))} entries")
-        message_json = json.dumps(message_data)
+        message_json = dumps(message_data)
         
         disconnected = set()
         for ws in coach_connections:
@@ -0,0 +1,86 @@
+"""
+Benchmark: file-based vs in-memory audio conversion for transcription.
+
+For each input duration compares
+- file path: ensure_wav() temp files + read back + remove (old provider flow)
+- in memory: ensure_wav_bytes() via ffmpeg stdin/stdout
+
+Input is a synthetic tone encoded as WebM/Opus (like live ticks) or as
+16 kHz WAV (like decoded live windows). WebM needs ffmpeg on PATH.
+
+Run: cd backend && python -m scripts.bench_audio_conversion [--format webm] [--durations 10 60 3600]
+"""
+
+import argparse
+import math
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.audio.buffer import pcm_to_wav  # noqa: E402
+from app.services.transcription.base import ensure_wav, ensure_wav_bytes, safe_remove  # noqa: E402
+
+
+def _tone_wav(seconds: int) -> bytes:
+    period = [struct.pack("<h", int(8000 * math.sin(2 * math.pi * 440 * i / 16000))) for i in range(400)]
+    one_second = b"".join(period) * 40
+    return pcm_to_wav(one_second * seconds)
+
+
+def _to_webm(wav: bytes) -> bytes:
+    proc = subprocess.run(
+        ["ffmpeg", "-loglevel", "error", "-i", "pipe:0", "-c:a", "libopus", "-b:a", "32k", "-f", "webm", "pipe:1"],
+        input=wav, capture_output=True, check=True,
+    )
+    return proc.stdout
+
+
+def _file_path(audio: bytes) -> bytes:
+    wav_path = ensure_wav(audio)
+    try:
+        with open(wav_path, "rb") as f:
+            return f.read()
+    finally:
+        safe_remove(wav_path)
+
+
+def _timed(fn, audio: bytes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(audio)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--format", choices=["webm", "wav"], default="webm")
+    parser.add_argument("--durations", type=int, nargs="+", default=[10, 60, 3600])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.format == "webm" and not shutil.which("ffmpeg"):
+        sys.exit("ffmpeg not found; use --format wav")
+
+    print(f"input: {args.format}")
+    for seconds in args.durations:
+        audio = _tone_wav(seconds)
+        if args.format == "webm":
+            audio = _to_webm(audio)
+        file_s = _timed(_file_path, audio, args.repeat)
+        mem_s = _timed(ensure_wav_bytes, audio, args.repeat)
+        print(
+            f"  {seconds:5d}s ({len(audio) / 1024:8.0f} KB)  "
+            f"file {file_s * 1000:8.1f} ms   memory {mem_s * 1000:8.1f} ms   "
+            f"x{file_s / mem_s if mem_s else float('inf'):.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
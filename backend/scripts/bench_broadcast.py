@@ -0,0 +1,104 @@
+"""
+Micro-benchmark: coach update building + encoding for a 100-item playbook.
+
+Measures per tick:
+- build_stages_payload + json.dumps (old full "update" frame)
+- build_stages_payload + app.serialization.dumps
+- build_state + diff_state + dumps (current patch frame)
+
+Run: cd backend && python -m scripts.bench_broadcast [--stages 10] [--items 10]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.serialization import dumps, orjson  # noqa: E402
+from app.services.playbook_service import compile_playbook  # noqa: E402
+from app.services.transcript_store import TranscriptStore  # noqa: E402
+from app.websocket.state import build_stages_payload, build_state, diff_state  # noqa: E402
+
+
+class _Session:
+    """Just the attributes the state builders read."""
+
+    def __init__(self, playbook):
+        self.playbook = playbook
+        self.checklist_progress = {}
+        self.checklist_evidence = {}
+        self.client_card_data = {
+            f"field_{i}": {"value": f"value {i}", "evidence": "kata klien " * 5, "confidence": 0.9}
+            for i in range(10)
+        }
+        self.current_stage_id = playbook.first_stage_id
+        self.call_start_time = time.time() - 600
+        self.stage_start_time = time.time() - 120
+        self.transcript = TranscriptStore()
+        for i in range(200):
+            self.transcript.append(f"ini kalimat nomor {i} dari percakapan penjualan")
+
+
+def _playbook(stages: int, items: int) -> list:
+    return [
+        {
+            "id": f"stage_{s}",
+            "name": f"Stage {s}",
+            "startOffsetSeconds": s * 300,
+            "durationSeconds": 300,
+            "items": [
+                {
+                    "id": f"item_{s}_{i}",
+                    "type": "discuss" if i % 2 else "say",
+                    "content": f"Checklist item {i} of stage {s} — tanyakan tentang kebutuhan anak",
+                }
+                for i in range(items)
+            ],
+        }
+        for s in range(stages)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stages", type=int, default=10)
+    parser.add_argument("--items", type=int, default=10)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    playbook = compile_playbook(_playbook(args.stages, args.items))
+    session = _Session(playbook)
+    prev = build_state(playbook, session)
+    # One item completes per tick — the common case
+    session.checklist_progress["item_0_1"] = True
+    session.checklist_evidence["item_0_1"] = "Anaknya umur berapa sekarang?"
+
+    def full_update(encode):
+        return encode({
+            "type": "update",
+            "stages": build_stages_payload(playbook, session, 600),
+            "clientCard": session.client_card_data,
+            "transcriptPreview": session.transcript.tail(300),
+        })
+
+    def patch_update():
+        return dumps({"type": "patch", "seq": 1, **diff_state(prev, build_state(playbook, session))})
+
+    cases = [
+        ("full update, json.dumps", lambda: full_update(json.dumps)),
+        ("full update, serialization.dumps", lambda: full_update(dumps)),
+        ("patch, serialization.dumps", patch_update),
+    ]
+
+    print(f"{args.stages * args.items} items, encoder: {'orjson' if orjson else 'json'}")
+    for name, fn in cases:
+        seconds = min(timeit.repeat(fn, number=args.number, repeat=3)) / args.number
+        print(f"  {name:36s} {seconds * 1e6:8.1f} us/tick  {len(fn()):7d} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark: LLM checklist checks per call, fixed cooldown vs scheduler.
+
+Simulates a live call on the default playbook: one tick every
+``--tick-seconds`` (10 s fixed windows, 3 s is the shortest VAD window)
+adds words at ``--wpm``: mostly filler, everyday words that are also
+playbook keywords ("saya", "anak", "belajar", ... at ``--common-rate``)
+and the occasional other keyword (``--keyword-rate``). Every checked item that passes
+the keyword pre-filter costs an LLM check. A check completes the item
+with probability ``--complete`` if one of its keywords was said since
+its previous check; re-checking unchanged evidence gives the same
+answer as before. Compares
+- fixed: every open item re-checked every 30 s (the old cooldown)
+- scheduler: ChecklistScheduler (keyword / stage signals with a 15 s
+  floor, backoff for items without a signal)
+and prints total checks plus the most any single item received.
+
+Run: cd backend && python -m scripts.bench_checklist_scheduler [--minutes 45] [--tick-seconds 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from call_structure_config import get_default_call_structure  # noqa: E402
+
+from app.services.checklist_scheduler import ChecklistScheduler  # noqa: E402
+from app.services.keyword_automaton import KeywordTracker  # noqa: E402
+from app.services.playbook_service import compile_playbook  # noqa: E402
+from app.services.transcript_store import TranscriptStore  # noqa: E402
+
+WINDOW = 1500
+FILLER = "ini itu dan yang untuk dengan kami bisa sudah juga kalau jadi mau tanya apa".split()
+EVERYDAY = "saya anak belajar suka les main tahun".split()
+
+
+def simulate(playbook, ticks, tick_seconds: float, mode: str, complete: float, seed: int):
+    rng = random.Random(seed)
+    store = TranscriptStore(max_words=1000)
+    tracker = KeywordTracker(playbook.keywords)
+    scheduler = ChecklistScheduler(playbook)
+    progress = {}
+    last_check = {}
+    fresh = set()  # items with a keyword said since their last check
+    llm_checks = Counter()
+    for n, (text, stage_id) in enumerate(ticks):
+        now = n * tick_seconds
+        store.append(text)
+        tracker.feed(store)
+        for pid in tracker.new_hits:
+            fresh.update(item.id for item in playbook.items_by_keyword[pid])
+        if mode == "fixed":
+            pending = []
+            for item in playbook.items:
+                if progress.get(item.id) or now - last_check.get(item.id, -1e9) < 30:
+                    continue
+                last_check[item.id] = now
+                pending.append(item)
+        else:
+            scheduler.signal_keywords(tracker.new_hits)
+            if n and stage_id != ticks[n - 1][1]:
+                scheduler.signal_stage(stage_id)
+            pending = scheduler.due(progress, now)
+        for item in pending:
+            passed, _ = item.prefilter_tracked(tracker, WINDOW)
+            new_evidence = item.id in fresh
+            fresh.discard(item.id)
+            if not passed:
+                continue
+            llm_checks[item.id] += 1
+            if new_evidence and rng.random() < complete:
+                progress[item.id] = True
+    return llm_checks, sum(progress.values())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minutes", type=int, default=45)
+    parser.add_argument("--tick-seconds", type=float, default=10.0)
+    parser.add_argument("--wpm", type=float, default=150, help="words spoken per minute")
+    parser.add_argument("--common-rate", type=float, default=0.1, help="share of words that are everyday keywords")
+    parser.add_argument("--keyword-rate", type=float, default=0.02, help="share of words that are other keywords")
+    parser.add_argument("--complete", type=float, default=0.1, help="chance an LLM check completes the item")
+    args = parser.parse_args()
+
+    random.seed(0)
+    playbook = compile_playbook(get_default_call_structure())
+    everyday = [kw for kw in EVERYDAY if kw in playbook.keywords.ids]
+    keywords = [kw for kw in playbook.keywords.patterns if kw not in everyday]
+    words_per_tick = max(1, round(args.wpm * args.tick_seconds / 60))
+    ticks = []
+    for n in range(int(args.minutes * 60 / args.tick_seconds)):
+        elapsed = n * args.tick_seconds
+        stage_id = next(
+            (s.id for s in playbook.stages if s.start <= elapsed < s.end),
+            playbook.stages[-1].id,
+        )
+        words = []
+        for _ in range(words_per_tick):
+            roll = random.random()
+            if roll < args.common_rate and everyday:
+                words.append(random.choice(everyday))
+            elif roll < args.common_rate + args.keyword_rate:
+                words.append(random.choice(keywords))
+            else:
+                words.append(random.choice(FILLER))
+        ticks.append((" ".join(words), stage_id))
+
+    print(
+        f"{len(playbook.items)} items, {len(ticks)} ticks of {args.tick_seconds:g}s "
+        f"({args.minutes} min), everyday rate {args.common_rate}, "
+        f"keyword rate {args.keyword_rate}, completion {args.complete}"
+    )
+    for mode in ("fixed", "scheduler"):
+        checks, completed = simulate(
+            playbook, ticks, args.tick_seconds, mode, args.complete, seed=1,
+        )
+        busiest, most = checks.most_common(1)[0] if checks else ("-", 0)
+        print(
+            f"  {mode:10s} {sum(checks.values()):6d} LLM item checks "
+            f"(max {most} for {busiest}), {completed:3d} items completed"
+        )
+
+
+if __name__ == "__main__":
+    main()
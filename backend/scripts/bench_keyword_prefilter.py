@@ -0,0 +1,109 @@
+"""
+Benchmark: checklist keyword pre-filter per analysis tick.
+
+Simulates a live call on the default playbook (or a synthetic one with
+``--items``): each tick appends ``--words`` words of transcript and
+runs the pre-filter for every checklist item over the last 1500
+characters, comparing
+- substring scan: lowercase the window, ``kw in text`` per keyword per
+  item (the original ``_prefilter_keywords``)
+- per-item regex: one compiled alternation per item (CompiledItem.prefilter)
+- automaton: feed only the new text to the call's KeywordTracker, then
+  answer every item from its running hits (CompiledItem.prefilter_tracked)
+
+Run: cd backend && python -m scripts.bench_keyword_prefilter [--ticks 300] [--words 30] [--items 0]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from call_structure_config import get_default_call_structure  # noqa: E402
+
+from app.services.keyword_automaton import KeywordTracker  # noqa: E402
+from app.services.playbook_service import compile_playbook  # noqa: E402
+from app.services.transcript_store import TranscriptStore  # noqa: E402
+
+WINDOW = 1500
+FILLER = "ini itu dan yang untuk dengan kami bisa sudah juga kalau anaknya belajar".split()
+
+
+def _synthetic(items: int) -> list:
+    words = [f"kata{i}" for i in range(items * 4)]
+    return [{
+        "id": "stage_0",
+        "name": "Stage 0",
+        "startOffsetSeconds": 0,
+        "durationSeconds": 600,
+        "items": [
+            {
+                "id": f"item_{i}",
+                "type": "discuss",
+                "content": f"Item {i}",
+                "semantic_keywords": {
+                    "required": random.sample(words, 8),
+                    "forbidden": ["nanti", "akan", "mungkin"],
+                },
+            }
+            for i in range(items)
+        ],
+    }]
+
+
+def _substring_scan(playbook, text: str):
+    text_lower = text.lower()
+    for item in playbook.items:
+        if item.required and not [kw for kw in item.required if kw.lower() in text_lower]:
+            continue
+        [kw for kw in item.forbidden if kw.lower() in text_lower]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--words", type=int, default=30, help="transcript words added per tick")
+    parser.add_argument("--items", type=int, default=0, help="synthetic items (0 = default playbook)")
+    args = parser.parse_args()
+
+    random.seed(0)
+    playbook = compile_playbook(_synthetic(args.items) if args.items else get_default_call_structure())
+    vocabulary = FILLER * 4 + list(playbook.keywords.patterns)
+    ticks = [
+        " ".join(random.choice(vocabulary) for _ in range(args.words))
+        for _ in range(args.ticks)
+    ]
+    print(
+        f"{len(playbook.items)} items, {len(playbook.keywords)} distinct keywords, "
+        f"{args.ticks} ticks x {args.words} words"
+    )
+
+    def run(mode: str) -> float:
+        store = TranscriptStore()
+        tracker = KeywordTracker(playbook.keywords)
+        spent = 0.0
+        for text in ticks:
+            store.append(text)
+            window = store.tail(WINDOW)
+            start = time.perf_counter()
+            if mode == "substring scan":
+                _substring_scan(playbook, window)
+            elif mode == "per-item regex":
+                for item in playbook.items:
+                    item.prefilter(window)
+            else:
+                tracker.feed(store)
+                for item in playbook.items:
+                    item.prefilter_tracked(tracker, len(window))
+            spent += time.perf_counter() - start
+        return spent / len(ticks)
+
+    for mode in ("substring scan", "per-item regex", "automaton"):
+        print(f"  {mode:16s} {run(mode) * 1e6:8.1f} us/tick")
+
+
+if __name__ == "__main__":
+    main()
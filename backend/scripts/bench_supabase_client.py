@@ -0,0 +1,77 @@
+"""
+Benchmark: per-call create_client() vs the shared Supabase client.
+
+Offline (default) measures what each request used to pay before its
+first query: building a client (PostgREST + auth + HTTP session) and a
+query builder.
+
+With ``--live`` it also runs a one-row select against the configured
+project ``--requests`` times, once with a new client per request and
+once through ``get_supabase_client()``. A new client opens a new
+TCP+TLS connection every time; the shared one reuses keep-alive
+connections. Needs SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY.
+
+Run: cd backend && python -m scripts.bench_supabase_client [--live] [--requests 20] [--table calls]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from supabase import create_client  # noqa: E402
+
+from app.config import get_settings  # noqa: E402
+from app.models.database import close_supabase, get_supabase_client  # noqa: E402
+
+
+def _fresh_client():
+    settings = get_settings()
+    return create_client(settings.supabase_url, settings.supabase_service_role_key)
+
+
+def _query(client, table: str):
+    return client.table(table).select("id").limit(1).execute()
+
+
+def _timings(fn, n: int):
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _print(label: str, samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+    print(f"  {label:28s} median {statistics.median(samples):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--live", action="store_true", help="also time real queries")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--table", default="calls")
+    args = parser.parse_args()
+
+    print("client setup per request:")
+    _print("create_client() + table()", _timings(lambda: _fresh_client().table(args.table), args.requests))
+    get_supabase_client()
+    _print("shared client + table()", _timings(lambda: get_supabase_client().table(args.table), args.requests))
+
+    if args.live:
+        print(f"select 1 row from {args.table}:")
+        _print("new client per request", _timings(lambda: _query(_fresh_client(), args.table), args.requests))
+        _query(get_supabase_client(), args.table)  # open the pooled connection
+        _print("shared client", _timings(lambda: _query(get_supabase_client(), args.table), args.requests))
+
+    close_supabase()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark: upload size and encode cost per codec for cloud transcription.
+
+For each input duration and codec (wav / flac / ogg-opus) reports the
+encoded size, the base64 size (what the Gemini JSON payload carries),
+the encoder used (in-process PyAV / WAV, or an ffmpeg process), encode
+time, the upload time that size implies at ``--mbps``, and their sum.
+
+With ``--live`` the same audio is sent through a real provider with
+each codec and the end-to-end transcribe latency is printed (needs the
+provider's API key in the environment).
+
+Input is synthetic speech-like audio (tone bursts separated by short
+pauses). FLAC / Opus are encoded with PyAV when installed, else with
+ffmpeg; with neither encode_pcm falls back to WAV, which the report
+shows in the "codec" column. The codec "auto" would pick for each
+provider is printed first.
+
+Run: cd backend && python -m scripts.bench_upload_codecs [--durations 10 60] [--mbps 10]
+     cd backend && python -m scripts.bench_upload_codecs --live --provider gemini
+"""
+
+import argparse
+import asyncio
+import base64
+import math
+import os
+import shutil
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.audio.buffer import pcm_to_wav  # noqa: E402
+from app.services.transcription.base import (  # noqa: E402
+    UPLOAD_CODECS,
+    encode_pcm,
+    encodes_in_process,
+)
+
+
+def _speech_like_pcm(seconds: int) -> bytes:
+    # 0.7 s of a warbling tone, 0.3 s of near-silence, repeated
+    frames = []
+    for i in range(16000):
+        t = i / 16000
+        if t < 0.7:
+            freq = 180 + 60 * math.sin(2 * math.pi * 3 * t)
+            sample = 6000 * math.sin(2 * math.pi * freq * t) + 2000 * math.sin(2 * math.pi * 2.7 * freq * t)
+        else:
+            sample = 40 * math.sin(2 * math.pi * 50 * t)
+        frames.append(struct.pack("<h", int(sample)))
+    return b"".join(frames) * seconds
+
+
+def _encode(pcm: bytes, codec: str, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data, used = encode_pcm(pcm, codec)
+        best = min(best, time.perf_counter() - start)
+    return data, used, best
+
+
+def _report(seconds: int, pcm: bytes, mbps: float, repeat: int):
+    print(f"  {seconds}s of audio ({len(pcm) / 1024:.0f} KB PCM)")
+    for codec in UPLOAD_CODECS:
+        data, used, encode_s = _encode(pcm, codec, repeat)
+        b64 = len(base64.b64encode(data))
+        upload_ms = b64 * 8 / (mbps * 1_000_000) * 1000
+        encoder = "in-process" if encodes_in_process(used) else "ffmpeg"
+        print(
+            f"    {codec:5s} -> {used:5s} {encoder:10s} {len(data) / 1024:8.1f} KB  "
+            f"base64 {b64 / 1024:8.1f} KB  encode {encode_s * 1000:7.1f} ms  "
+            f"upload@{mbps:g}Mbps {upload_ms:7.1f} ms  "
+            f"total {encode_s * 1000 + upload_ms:7.1f} ms"
+        )
+
+
+async def _live(provider_name: str, pcm: bytes, language: str):
+    from app.services.transcription.router import _get_provider
+
+    provider = _get_provider(provider_name)
+    if not provider.is_available():
+        sys.exit(f"provider {provider_name} is not configured")
+    wav = pcm_to_wav(pcm)
+    try:
+        for codec in provider.upload_formats:
+            provider.upload_codec = codec
+            start = time.perf_counter()
+            segments = await provider.transcribe(wav, language)
+            elapsed = time.perf_counter() - start
+            print(f"    {codec:5s} {elapsed * 1000:8.0f} ms  {len(segments)} segments")
+    finally:
+        provider.upload_codec = None
+        await provider.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--durations", type=int, nargs="+", default=[10, 60])
+    parser.add_argument("--mbps", type=float, default=10.0, help="uplink bandwidth for the upload estimate")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--live", action="store_true", help="also time real provider requests")
+    parser.add_argument("--provider", choices=["gemini", "groq"], default="gemini")
+    parser.add_argument("--language", default="id")
+    args = parser.parse_args()
+
+    from app.services.transcription.groq_provider import GroqTranscriptionProvider
+    from app.services.transcription.gemini_provider import GeminiTranscriptionProvider
+
+    if not shutil.which("ffmpeg"):
+        print("ffmpeg not found: codecs PyAV cannot encode fall back to wav")
+    for cls in (GeminiTranscriptionProvider, GroqTranscriptionProvider):
+        print(f"auto codec for {cls.name}: {cls.__new__(cls).negotiate_codec()}")
+
+    for seconds in args.durations:
+        pcm = _speech_like_pcm(seconds)
+        _report(seconds, pcm, args.mbps, args.repeat)
+        if args.live:
+            asyncio.run(_live(args.provider, pcm, args.language))
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,7 @@ interface UseCallWebSocketOptions {
 export function useCallWebSocket({ callId, onMessage, onStatusChange }: UseCallWebSocketOptions) {
   const ingestRef = useRef<WebSocket | null>(null)
   const coachRef = useRef<WebSocket | null>(null)
+  const lastSeqRef = useRef<number | null>(null)
 
   const connect = useCallback(async () => {
     if (!callId) return
@@ -40,6 +41,19 @@ export function useCallWebSocket({ callId, onMessage, onStatusChange }: UseCallW
     coachWs.onmessage = (e) => {
       try {
         const msg = JSON.parse(e.data) as WSCoachMessage
+        if (msg.type === 'initial') {
+          lastSeqRef.current = msg.seq
+        } else if (msg.type === 'patch') {
+          // Waiting for a snapshot: patches are meaningless until it arrives
+          if (lastSeqRef.current === null) return
+          // Missed a patch: drop it and ask for a fresh snapshot
+          if (msg.seq !== lastSeqRef.current + 1) {
+            lastSeqRef.current = null
+            coachWs.send(JSON.stringify({ type: 'resync' }))
+            return
+          }
+          lastSeqRef.current = msg.seq
+        }
         onMessage(msg)
       } catch (err) {
         console.error('[ws] parse error:', err)
@@ -57,6 +57,12 @@ export function LiveCallPage() {
       case 'coaching_tip':
         store.addCoachingTip(msg)
         break
+      case 'initial':
+        store.applySnapshot(msg)
+        break
+      case 'patch':
+        store.applyPatch(msg)
+        break
     }
   }, [store])
 
@@ -369,7 +375,10 @@ export function LiveCallPage() {
                       </div>
                     </div>
                   ))}
-                  {store.transcript.length === 0 && (
+                  {store.transcript.length === 0 && store.transcriptPreview && (
+                    <p className="whitespace-pre-wrap text-sm">{store.transcriptPreview}</p>
+                  )}
+                  {store.transcript.length === 0 && !store.transcriptPreview && (
                     <p className="py-8 text-center text-xs text-muted-foreground">
                       {store.isRecording
                         ? 'Listening...'
@@ -4,8 +4,28 @@ import type {
   ChecklistProgress,
   ClientCardData,
   WSCoachingTip,
+  WSStateSnapshot,
+  WSStatePatch,
 } from '@/types'
 
+function toClientCardField(data: unknown): ClientCardData[string] {
+  if (data && typeof data === 'object') {
+    const field = data as { value?: unknown; confidence?: unknown; evidence?: unknown }
+    return {
+      value: String(field.value ?? ''),
+      confidence: typeof field.confidence === 'number' ? field.confidence : 0,
+      evidence: typeof field.evidence === 'string' ? field.evidence : null,
+      extracted_at: null,
+    }
+  }
+  return { value: String(data ?? ''), confidence: 0, evidence: null, extracted_at: null }
+}
+
+function stageName(progress: ChecklistProgress | null, stageId: string | null): string | null {
+  if (!progress || !stageId) return null
+  return progress.stages.find((s) => s.stage_id === stageId)?.stage_name ?? null
+}
+
 interface LiveCallState {
   callId: string | null
   isRecording: boolean
@@ -15,6 +35,7 @@ interface LiveCallState {
   checklistProgress: ChecklistProgress | null
   clientCardData: ClientCardData | null
   coachingTips: WSCoachingTip[]
+  transcriptPreview: string
   elapsedSeconds: number
 
   setCallId: (id: string | null) => void
@@ -38,6 +59,10 @@ interface LiveCallState {
   ) => void
   addCoachingTip: (tip: WSCoachingTip) => void
   setElapsedSeconds: (seconds: number) => void
+  /** Replace live state with a full `initial` snapshot. */
+  applySnapshot: (snapshot: WSStateSnapshot) => void
+  /** Apply a sequenced `patch` (already checked for gaps by the socket hook). */
+  applyPatch: (patch: WSStatePatch) => void
   reset: () => void
 }
 
@@ -50,6 +75,7 @@ const initialState = {
   checklistProgress: null,
   clientCardData: null,
   coachingTips: [],
+  transcriptPreview: '',
   elapsedSeconds: 0,
 }
 
@@ -107,5 +133,100 @@ export const useLiveCallStore = create<LiveCallState>((set) => ({
     set((state) => ({ coachingTips: [...state.coachingTips, tip] })),
 
   setElapsedSeconds: (elapsedSeconds) => set({ elapsedSeconds }),
+
+  applySnapshot: (snapshot) =>
+    set((state) => {
+      // Keep per-item confidence / completion time the server does not send
+      const previous = new Map(
+        (state.checklistProgress?.stages ?? []).flatMap((s) => s.items.map((i) => [i.item_id, i] as const))
+      )
+      const checklistProgress: ChecklistProgress = {
+        stages: snapshot.stages.map((stage) => ({
+          stage_id: stage.id,
+          stage_name: stage.name,
+          items: stage.items.map((item) => {
+            const old = previous.get(item.id)
+            return {
+              item_id: item.id,
+              label: item.content,
+              completed: item.completed,
+              confidence: old?.confidence ?? 0,
+              evidence: item.evidence || null,
+              completed_at: item.completed
+                ? old?.completed_at ?? new Date().toISOString()
+                : null,
+            }
+          }),
+        })),
+      }
+      const clientCardData: ClientCardData = {}
+      for (const [fieldId, data] of Object.entries(snapshot.clientCard)) {
+        clientCardData[fieldId] = toClientCardField(data)
+      }
+      return {
+        checklistProgress,
+        clientCardData,
+        currentStageId: snapshot.currentStageId,
+        currentStageName: stageName(checklistProgress, snapshot.currentStageId),
+        transcriptPreview: snapshot.transcriptPreview,
+        elapsedSeconds: snapshot.callElapsedSeconds,
+      }
+    }),
+
+  applyPatch: (patch) =>
+    set((state) => {
+      const next: Partial<LiveCallState> = { elapsedSeconds: patch.callElapsedSeconds }
+      let progress = state.checklistProgress
+
+      const itemChanges = patch.items
+      if (progress && itemChanges) {
+        progress = {
+          stages: progress.stages.map((stage) => ({
+            ...stage,
+            items: stage.items.map((item) => {
+              const change = itemChanges[item.item_id]
+              if (!change) return item
+              const completed = change.completed ?? item.completed
+              return {
+                ...item,
+                completed,
+                evidence: change.evidence !== undefined ? change.evidence || null : item.evidence,
+                completed_at: completed
+                  ? item.completed_at ?? new Date().toISOString()
+                  : null,
+              }
+            }),
+          })),
+        }
+        next.checklistProgress = progress
+      }
+
+      if (patch.currentStageId !== undefined) {
+        next.currentStageId = patch.currentStageId
+        next.currentStageName = stageName(progress, patch.currentStageId)
+      }
+
+      if (patch.clientCard) {
+        const clientCardData: ClientCardData = { ...state.clientCardData }
+        for (const [fieldId, data] of Object.entries(patch.clientCard)) {
+          if (data === null) delete clientCardData[fieldId]
+          else clientCardData[fieldId] = toClientCardField(data)
+        }
+        next.clientCardData = clientCardData
+      }
+
+      if (patch.transcriptPreview !== undefined) {
+        next.transcriptPreview = patch.transcriptPreview
+      }
+
+      if (patch.coachingTip) {
+        next.coachingTips = [
+          ...state.coachingTips,
+          { type: 'coaching_tip', ...patch.coachingTip },
+        ]
+      }
+      return next
+    }),
+
   reset: () => set(initialState),
 }))
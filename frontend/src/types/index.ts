@@ -328,12 +328,57 @@ export interface WSCoachingTip {
   category: string
 }
 
+export interface WSStageState {
+  id: string
+  name: string
+  startOffsetSeconds: number
+  durationSeconds: number
+  items: {
+    id: string
+    type: string
+    content: string
+    completed: boolean
+    evidence: string
+  }[]
+  isCurrent: boolean
+  timingStatus: string
+  timingMessage: string
+}
+
+/** Full live-call state; sent on connect and in reply to `resync`. */
+export interface WSStateSnapshot {
+  type: 'initial'
+  seq: number
+  callElapsedSeconds: number
+  stageElapsedSeconds: number
+  currentStageId: string | null
+  stages: WSStageState[]
+  clientCard: Record<string, unknown>
+  transcriptPreview: string
+}
+
+/** Changes since the previous `seq`; only changed keys are present. */
+export interface WSStatePatch {
+  type: 'patch'
+  seq: number
+  callElapsedSeconds: number
+  stageElapsedSeconds: number
+  currentStageId?: string
+  stages?: Record<string, Partial<Pick<WSStageState, 'isCurrent' | 'timingStatus' | 'timingMessage'>>>
+  items?: Record<string, { completed?: boolean; evidence?: string }>
+  clientCard?: Record<string, unknown | null>
+  transcriptPreview?: string
+  coachingTip?: { tip: string; category: string }
+}
+
 export type WSCoachMessage =
   | WSTranscriptUpdate
   | WSChecklistUpdate
   | WSClientCardUpdate
   | WSStageUpdate
   | WSCoachingTip
+  | WSStateSnapshot
+  | WSStatePatch
 
 // --- API Response wrappers ---
 